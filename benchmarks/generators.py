@@ -0,0 +1,127 @@
+# benchmarks/generators.py
+"""Seeded synthetic data in the shapes the Bybit v5 API and the private stream return."""
+import json
+import random
+from typing import Any, Dict, Iterator, List
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "DOGEUSDT", "BNBUSDT", "ADAUSDT", "AVAXUSDT",
+           "LINKUSDT", "DOTUSDT", "LTCUSDT", "TRXUSDT", "NEARUSDT", "APTUSDT", "ARBUSDT", "OPUSDT"]
+START_MS = 1767225600000  # 2026-01-01T00:00:00Z
+
+
+def _symbols(count: int) -> List[str]:
+    """`count` symbol names, padding the real list with synthetic ones."""
+    return [SYMBOLS[i] if i < len(SYMBOLS) else f"SYN{i}USDT" for i in range(count)]
+
+
+def transaction_rows(count: int, fills_per_order: int = 3, seed: int = 1) -> List[Dict[str, Any]]:
+    """Transaction-log rows: TRADE fills grouped into orders, with some funding rows mixed in."""
+    rng = random.Random(seed)
+    rows = []
+    order_index = 0
+    ts = START_MS
+    while len(rows) < count:
+        order_index += 1
+        symbol = rng.choice(SYMBOLS)
+        side = rng.choice(("Buy", "Sell"))
+        price = rng.uniform(0.5, 60000)
+        closing = rng.random() < 0.5
+        for _ in range(rng.randint(1, fills_per_order)):
+            ts += rng.randint(1, 5000)
+            qty = rng.uniform(0.001, 5)
+            fee = qty * price * 0.00055
+            pnl = rng.gauss(0, 30) if closing else 0.0
+            rows.append({
+                "id": f"txn-{len(rows)}", "symbol": symbol, "category": "linear", "side": side,
+                "type": "TRADE", "qty": f"{qty:.4f}", "tradePrice": f"{price:.4f}", "fee": f"{fee:.8f}",
+                "change": f"{pnl - fee:.8f}", "cashFlow": "0", "currency": "USDT",
+                "orderId": f"ord-{order_index}", "tradeId": f"trd-{len(rows)}", "transactionTime": str(ts),
+            })
+            if len(rows) >= count:
+                break
+        if rng.random() < 0.05 and len(rows) < count:
+            rows.append({"id": f"txn-{len(rows)}", "symbol": symbol, "type": "SETTLEMENT",
+                         "change": f"{rng.gauss(0, 0.1):.8f}", "fee": "0", "transactionTime": str(ts)})
+    return rows
+
+
+def closed_pnl_records(count: int, seed: int = 2) -> List[Dict[str, Any]]:
+    """Closed-PnL records (newest first, as the API returns them)."""
+    rng = random.Random(seed)
+    records = []
+    ts = START_MS
+    for index in range(count):
+        ts += rng.randint(1000, 600000)
+        entry = rng.uniform(0.5, 60000)
+        exit_price = entry * (1 + rng.gauss(0, 0.01))
+        qty = rng.uniform(0.001, 5)
+        records.append({
+            "symbol": rng.choice(SYMBOLS), "orderId": f"ord-{index}", "side": rng.choice(("Buy", "Sell")),
+            "qty": f"{qty:.4f}", "closedSize": f"{qty:.4f}", "avgEntryPrice": f"{entry:.4f}",
+            "avgExitPrice": f"{exit_price:.4f}", "closedPnl": f"{rng.gauss(0, 30):.8f}",
+            "orderType": "Market", "execType": "Trade", "leverage": "10",
+            "createdTime": str(ts), "updatedTime": str(ts),
+        })
+    records.reverse()
+    return records
+
+
+def notion_records(count: int, seed: int = 3) -> List[Dict[str, Any]]:
+    """Aggregated records as SyncService hands them to NotionClient."""
+    rng = random.Random(seed)
+    return [{
+        "symbol": rng.choice(SYMBOLS), "side": rng.choice(("Buy", "Sell")), "size": rng.uniform(0.001, 5),
+        "price": rng.uniform(0.5, 60000), "fee": rng.uniform(0, 5), "pnl": rng.gauss(0, 30),
+        "timestamp": START_MS + index * 60000, "subaccount": "Main Account", "id": f"ord-{index}",
+    } for index in range(count)]
+
+
+def positions_cache(count: int, seed: int = 4) -> Dict[str, Dict[str, Any]]:
+    """The monitor's symbol -> position map with `count` open positions."""
+    rng = random.Random(seed)
+    cache = {}
+    for symbol in _symbols(count):
+        entry = rng.uniform(0.5, 60000)
+        cache[symbol] = {
+            "symbol": symbol, "side": rng.choice(("Buy", "Sell")), "size": f"{rng.uniform(0.001, 5):.4f}",
+            "entryPrice": f"{entry:.4f}", "markPrice": f"{entry * 1.001:.4f}",
+            "takeProfit": rng.choice(("", f"{entry * 1.05:.4f}")), "stopLoss": rng.choice(("0", f"{entry * 0.95:.4f}")),
+            "unrealisedPnl": f"{rng.gauss(0, 20):.6f}", "positionIdx": 0, "category": "linear",
+        }
+    return cache
+
+
+def stream_frames(topic: str, count: int, symbols: int = 16, seed: int = 5) -> Iterator[str]:
+    """Raw private-stream frames for one topic, one record per frame."""
+    rng = random.Random(seed)
+    names = _symbols(symbols)
+    ts = START_MS
+    for index in range(count):
+        ts += rng.randint(1, 50)
+        symbol = names[index % symbols]
+        price = rng.uniform(0.5, 60000)
+        if topic == "position":
+            data = {
+                "symbol": symbol, "side": "Buy", "size": f"{rng.uniform(0.1, 5):.3f}", "entryPrice": f"{price:.4f}",
+                "markPrice": f"{price * 1.001:.4f}", "unrealisedPnl": f"{rng.gauss(0, 20):.6f}",
+                "takeProfit": f"{price * 1.05:.2f}" if index % 7 == 0 else "", "stopLoss": "",
+                "positionIdx": 0, "category": "linear", "seq": index + 1, "updatedTime": str(ts),
+            }
+        elif topic == "order":
+            data = {
+                "orderId": f"ord-{index // 2}", "symbol": symbol, "side": "Buy", "orderType": "Limit",
+                "price": f"{price:.4f}", "qty": "1", "orderStatus": "New" if index % 2 == 0 else "Cancelled",
+                "stopOrderType": "", "reduceOnly": False, "closeOnTrigger": False, "category": "linear",
+                "createdTime": str(ts), "updatedTime": str(ts),
+            }
+        elif topic == "execution":
+            data = {
+                "execId": f"exe-{index}", "orderId": f"ord-{index // 3}", "symbol": symbol,
+                "side": "Sell" if index % 2 else "Buy", "execType": "Trade", "execQty": "0.5",
+                "execPrice": f"{price:.4f}", "execFee": f"{price * 0.5 * 0.00055:.8f}", "feeRate": "0.00055",
+                "closedSize": "0.5" if index % 2 else "0", "stopOrderType": "", "category": "linear",
+                "execTime": str(ts), "seq": index + 1,
+            }
+        else:
+            raise ValueError(f"Unknown topic {topic}")
+        yield json.dumps({"id": f"msg-{index}", "topic": topic, "creationTime": ts, "data": [data]})
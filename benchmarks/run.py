@@ -0,0 +1,342 @@
+# benchmarks/run.py
+"""
+Benchmarks for the sync, notify and stats hot paths.
+
+Usage:
+    python -m benchmarks.run                       # default sizes, writes benchmarks/results/<label>.json
+    python -m benchmarks.run --full --label v1.2   # adds the 1M-row cases
+    python -m benchmarks.run --only sync_aggregate monitor_on_message
+    python -m benchmarks.run --only startup        # cold-start import time of the CLI entry points
+    python -m benchmarks.run --compare benchmarks/results/base.json benchmarks/results/new.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from . import generators
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+REGRESSION_THRESHOLD = 10.0  # percent
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Dict[str, Any]]] = {}
+
+
+def benchmark(name: str):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def measure(fn: Callable[[], Any], items: int, repeat: int = 3) -> Dict[str, Any]:
+    """Runs `fn` `repeat` times; reports best/median wall time and items per second at the best run."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "items": items,
+        "best_s": round(best, 6),
+        "median_s": round(statistics.median(timings), 6),
+        "items_per_s": round(items / best, 1) if best > 0 else None,
+    }
+
+
+@benchmark("sync_aggregate")
+def bench_sync_aggregate(args) -> Dict[str, Any]:
+    from src.adapters.models import Transaction
+    from src.services.sync import SyncService
+
+    results = {}
+    for size in args.row_sizes:
+        rows = generators.transaction_rows(size)
+        repeat = 1 if size >= 1_000_000 else args.repeat
+        # Parsing happens once at the adapter boundary; aggregation runs on typed records
+        results[f"parse_{size}"] = measure(lambda: Transaction.from_api_list(rows), size, repeat)
+        records = Transaction.from_api_list(rows)
+        del rows
+        results[f"rows_{size}"] = measure(lambda: SyncService.aggregate_transactions(records), size, repeat)
+        del records
+    return results
+
+
+@benchmark("notion_map_properties")
+def bench_notion_map_properties(args) -> Dict[str, Any]:
+    from src.clients.notion import NotionClient
+
+    records = generators.notion_records(args.notion_records)
+    mapper = NotionClient._map_to_notion_properties
+
+    def run():
+        for record in records:
+            mapper(record)
+    return {f"records_{len(records)}": measure(run, len(records), args.repeat)}
+
+
+@benchmark("monitor_on_message")
+def bench_monitor_on_message(args) -> Dict[str, Any]:
+    from src.monitor.replay import RecordingNotifier
+    from src.monitor.ws_manager import BybitMonitor
+    from src.utils.clock import VirtualClock
+
+    results = {}
+    for topic in ("order", "execution", "position"):
+        frames = list(generators.stream_frames(topic, args.frames))
+
+        def run():
+            clock = VirtualClock(generators.START_MS / 1000)
+            monitor = BybitMonitor(notifier=RecordingNotifier(clock), clock=clock, offline=True)
+            for index, raw in enumerate(frames):
+                clock.advance_to(clock.now + 0.001)
+                monitor.on_message(None, raw)
+                if index % 50 == 0:
+                    monitor.position_queue.drain()
+            monitor.position_queue.drain()
+            clock.run_pending()
+        results[topic] = measure(run, len(frames), args.repeat)
+    return results
+
+
+@benchmark("notifier_positions_footer")
+def bench_notifier_positions_footer(args) -> Dict[str, Any]:
+    from src.adapters.models import Position
+    from src.monitor.notifier import DiscordNotifier
+
+    notifier = DiscordNotifier()
+    results = {}
+    for count in (10, 100, 1000):
+        # The monitor's position book holds typed records
+        cache = {symbol: Position.from_api(pos) for symbol, pos in generators.positions_cache(count).items()}
+        calls = max(args.footer_calls // count, 10)
+
+        def run():
+            for _ in range(calls):
+                notifier._format_all_positions_footer(cache)
+        results[f"positions_{count}"] = measure(run, calls, args.repeat)
+    return results
+
+
+@benchmark("stats_pnl")
+def bench_stats_pnl(args) -> Dict[str, Any]:
+    from src.adapters.models import ClosedPnl
+    from src.services.stats import StatsService
+
+    stats = StatsService(exchange_adapter=None)
+    results = {}
+    for size in args.row_sizes:
+        records = ClosedPnl.from_api_list(generators.closed_pnl_records(size))
+        results[f"records_{size}"] = measure(lambda: stats.calculate_pnl_stats(records), size,
+                                             repeat=1 if size >= 1_000_000 else args.repeat)
+        del records
+    return results
+
+
+@benchmark("pnl_analytics")
+def bench_pnl_analytics(args) -> Dict[str, Any]:
+    try:
+        import numpy  # noqa: F401  (installed with pandas)
+    except ImportError:
+        return {}
+    from src.adapters.models import ClosedPnl
+    from src.services.analytics import PnlAnalytics, compute_analytics
+    from src.services.pnl_store import ClosedPnlStore
+
+    results = {}
+    for size in args.row_sizes:
+        records = ClosedPnl.from_api_list(generators.closed_pnl_records(size))
+        repeat = 1 if size >= 1_000_000 else args.repeat
+        results[f"records_{size}"] = measure(lambda: compute_analytics(records), size, repeat)
+        store = ClosedPnlStore(adapter=None)
+        store.add(records)
+        analytics = PnlAnalytics(store)
+        analytics.analyze()
+        results[f"cached_{size}"] = measure(analytics.analyze, 1, args.repeat)
+        del records, store, analytics
+    return results
+
+
+@benchmark("json_codec")
+def bench_json_codec(args) -> Dict[str, Any]:
+    from src.utils import json_codec
+
+    frames = list(generators.stream_frames("execution", args.frames))
+    rest_body = json_codec.dumps_bytes({
+        "retCode": 0, "retMsg": "OK",
+        "result": {"list": generators.closed_pnl_records(100), "nextPageCursor": "abc"},
+    })
+    webhook = {"embeds": [{
+        "title": "📝 BTCUSDT", "color": 0xFFA500,
+        "fields": [{"name": f"field {i}", "value": f"`{i * 1.2345:.4f}`", "inline": True} for i in range(8)],
+        "footer": {"text": "Bybit 訊號群"},
+    }]}
+    rest_calls = max(args.frames // 20, 10)
+
+    def decode_frames():
+        for raw in frames:
+            json_codec.loads(raw)
+
+    def decode_rest():
+        for _ in range(rest_calls):
+            json_codec.loads(rest_body)
+
+    def encode_webhooks():
+        for _ in range(len(frames)):
+            json_codec.dumps_bytes(webhook)
+
+    results = {}
+    active = json_codec.BACKEND
+    try:
+        for backend in ("stdlib", "orjson"):
+            if json_codec.set_backend(backend) != backend:
+                continue  # orjson not installed
+            results[f"{backend}_decode_frames"] = measure(decode_frames, len(frames), args.repeat)
+            results[f"{backend}_decode_rest_page"] = measure(decode_rest, rest_calls, args.repeat)
+            results[f"{backend}_encode_webhook"] = measure(encode_webhooks, len(frames), args.repeat)
+    finally:
+        json_codec.set_backend(active)
+    return results
+
+
+# Import sets timed in fresh interpreters by the startup benchmark
+STARTUP_CASES = {
+    "config_import": "import src.config",
+    "config_access": "from src.config import settings; settings.get('bybit_base_url')",
+    "main_import": "import src.main",
+    "cli_import": "import src.cli",
+    "sync_path": "import src.main, src.services.sync, src.adapters.bybit, src.clients.notion",
+    "report_positions": "import report_positions",
+}
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "notion_client", "requests", "dotenv", "websocket", "http.server")
+
+
+@benchmark("startup")
+def bench_startup(args) -> Dict[str, Any]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for case, code in STARTUP_CASES.items():
+        # Print which heavy dependencies the import pulled in
+        script = f"{code}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        loaded = []
+
+        def run():
+            completed = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True)
+            if completed.returncode != 0:
+                raise RuntimeError(f"startup case {case} failed: {completed.stderr.strip()[-300:]}")
+            loaded[:] = [m for m in completed.stdout.strip().splitlines()[-1].split(",") if m] if completed.stdout.strip() else []
+        try:
+            results[case] = measure(run, 1, max(args.repeat, 5))
+            results[case]["heavy_modules"] = loaded
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def _json_backend() -> str:
+    from src.utils import json_codec
+    return json_codec.BACKEND
+
+
+def run_suite(args) -> Dict[str, Any]:
+    names = args.only or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+
+    report = {
+        "label": args.label,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_codec": _json_backend(),
+        "results": {},
+    }
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        report["results"][name] = BENCHMARKS[name](args)
+    return report
+
+
+def _flatten(report: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {f"{name}.{case}": metrics
+            for name, cases in report.get("results", {}).items()
+            for case, metrics in cases.items()}
+
+
+def compare(base_path: str, new_path: str, threshold: float = REGRESSION_THRESHOLD) -> int:
+    """Prints throughput changes per case; returns the number of regressions beyond `threshold` percent."""
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = _flatten(json.load(f))
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = _flatten(json.load(f))
+
+    regressions = 0
+    print(f"{'case':<50} {'base/s':>14} {'new/s':>14} {'change':>9}")
+    for case in sorted(set(base) | set(new)):
+        old_rate = (base.get(case) or {}).get("items_per_s")
+        new_rate = (new.get(case) or {}).get("items_per_s")
+        if not old_rate or not new_rate:
+            print(f"{case:<50} {old_rate or '-':>14} {new_rate or '-':>14} {'n/a':>9}")
+            continue
+        change = (new_rate - old_rate) / old_rate * 100
+        flag = ""
+        if change < -threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{case:<50} {old_rate:>14,.0f} {new_rate:>14,.0f} {change:>+8.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmarks.")
+    parser.add_argument("--only", nargs="+", help=f"Subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--full", action="store_true", help="Include the 1M-row cases")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best is reported)")
+    parser.add_argument("--frames", type=int, default=20000, help="Stream frames per topic")
+    parser.add_argument("--notion-records", type=int, default=50000)
+    parser.add_argument("--footer-calls", type=int, default=20000, help="Position lines formatted per footer case")
+    parser.add_argument("--label", default=None, help="Result name (default: git commit or timestamp)")
+    parser.add_argument("--output", default=RESULTS_DIR, help="Directory for the JSON result")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two result files and exit")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Regression threshold in percent")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, threshold=args.threshold) else 0)
+
+    args.row_sizes = [10_000, 100_000, 1_000_000] if args.full else [10_000, 100_000]
+    args.label = args.label or _git_commit() or datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    # The monitor logs every event at INFO; keep the measurement about the handlers
+    from src.utils.logger import log
+    log.setLevel(logging.WARNING)
+
+    report = run_suite(args)
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"{args.label}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+    print(f"Results written to {path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 @echo off
 cd %~dp0
 call venv\Scripts\activate
-python manual_report.py
+python -m src.cli dashboard
 timeout /t 5
@@ -19,7 +19,7 @@ else
         source venv/bin/activate
     fi
     
-    python manual_report.py
+    python -m src.cli dashboard
 fi
 
 echo "Report generation complete!"
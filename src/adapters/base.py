@@ -2,6 +2,8 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
+from .models import Transaction
+
 class BaseExchangeAdapter(ABC):
     """
     Abstract base class for exchange API adapters.
@@ -69,6 +71,12 @@ class BaseExchangeAdapter(ABC):
         """
         pass
 
+    def fetch_transaction_records(self, account_type: str, category: str, start_time: int, end_time: int) -> List[Transaction]:
+        """
+        Fetches the transaction log parsed into typed records (numbers parsed once, as Decimal).
+        """
+        return Transaction.from_api_list(self.fetch_transaction_log(account_type, category, start_time, end_time))
+
     @abstractmethod
     def fetch_subaccounts(self) -> List[Dict[str, Any]]:
         """
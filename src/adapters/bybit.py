@@ -2,21 +2,36 @@
 import time
 import hmac
 import hashlib
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 import requests
 from requests.exceptions import RequestException
 
 from .base import BaseExchangeAdapter
+from .models import ClosedPnl, Execution, Position
+from ..utils import json_codec, metrics
 from ..utils.exceptions import ApiException
 from ..utils.logger import log
+from ..utils.sync_profile import note_retry
 
 # Bybit API v5 configuration
 BYBIT_BASE_URL = "https://api.bybit.com"
 # Rate limit: 120 requests/minute per UID. We will use a conservative delay.
 # 60s / 120req = 0.5s/req
 REQUEST_SLEEP_INTERVAL = 0.55  # A bit over 500ms for safety
+# /v5/position/closed-pnl and /v5/execution/list only accept startTime..endTime ranges of up to 7 days
+HISTORY_WINDOW_MS = 7 * 24 * 60 * 60 * 1000
+# Concurrent windows of a history fetch. The rate limiter still spaces the requests;
+# the workers overlap their round-trips.
+HISTORY_MAX_WORKERS = 4
+
+REST_LATENCY = metrics.histogram("bybit_rest_request_seconds", "Bybit REST round-trip time", ("endpoint",))
+REST_RETRIES = metrics.counter("bybit_rest_retries_total", "Bybit REST requests retried after a rate-limit retCode",
+                               ("endpoint",))
+REST_ERRORS = metrics.counter("bybit_rest_errors_total", "Failed Bybit REST requests", ("endpoint", "kind"))
+LIMITER_WAIT = metrics.histogram("bybit_rate_limiter_wait_seconds", "Time spent waiting for a request slot")
 
 
 class BybitAdapter(BaseExchangeAdapter):
@@ -26,9 +41,17 @@ class BybitAdapter(BaseExchangeAdapter):
     including authentication, pagination, and error handling.
     """
 
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(self, api_key: str, api_secret: str, base_url: Optional[str] = None):
         super().__init__(api_key, api_secret)
+        # Overridable so the adapter can target testnet or the local fake exchange
+        self.base_url = (base_url or BYBIT_BASE_URL).rstrip("/")
         self.last_request_time = 0
+        # Thread-safe limiter: callers reserve the next slot, so concurrent requests
+        # stay within the budget while their HTTP round-trips overlap.
+        self._rate_limit_lock = threading.Lock()
+        self._next_request_slot = 0.0
+        # Keep-alive connection pool, reused by every request of this adapter
+        self._session = requests.Session()
 
     def _sign(self, params: str, timestamp: int) -> str:
         """
@@ -37,14 +60,24 @@ class BybitAdapter(BaseExchangeAdapter):
         to_sign = str(timestamp) + self._api_key + "5000" + params
         return hmac.new(self._api_secret.encode('utf-8'), to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
 
+    def _wait_for_rate_limit(self):
+        """
+        Blocks until this caller's reserved request slot (REQUEST_SLEEP_INTERVAL apart).
+        """
+        with self._rate_limit_lock:
+            now = time.time()
+            slot = max(now, self._next_request_slot)
+            self._next_request_slot = slot + REQUEST_SLEEP_INTERVAL
+        LIMITER_WAIT.observe(slot - now)
+        if slot > now:
+            time.sleep(slot - now)
+
     def _request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Sends a signed request to the Bybit API, handling rate limiting and errors.
         """
         # Rate limiting
-        time_since_last_request = time.time() - self.last_request_time
-        if time_since_last_request < REQUEST_SLEEP_INTERVAL:
-            time.sleep(REQUEST_SLEEP_INTERVAL - time_since_last_request)
+        self._wait_for_rate_limit()
         
         self.last_request_time = time.time()
         
@@ -65,28 +98,34 @@ class BybitAdapter(BaseExchangeAdapter):
             'Content-Type': 'application/json'
         }
         
-        url = f"{BYBIT_BASE_URL}{endpoint}?{query_string}"
+        url = f"{self.base_url}{endpoint}?{query_string}"
         
         try:
-            response = requests.request(method.upper(), url, headers=headers)
+            with REST_LATENCY.time(endpoint=endpoint):
+                response = self._session.request(method.upper(), url, headers=headers)
             response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
             
-            data = response.json()
+            data = json_codec.loads(response.content)
 
             # Bybit-specific error handling in the response body
             if data.get("retCode") != 0:
-                # Handle rate limit error (10002)
-                if data.get("retCode") == 10002:
+                # Handle rate limit errors (10002, 10006 "Too many visits")
+                if data.get("retCode") in (10002, 10006):
                     log.warning("Rate limit hit. Retrying after a short delay...")
+                    REST_RETRIES.inc(endpoint=endpoint)
+                    note_retry("bybit_rate_limit")
                     time.sleep(1) # Extra delay
                     return self._request(method, endpoint, params)
+                REST_ERRORS.inc(endpoint=endpoint, kind="retcode")
                 raise ApiException(f"Bybit API Error: {data.get('retMsg')} (Code: {data.get('retCode')})")
             
             return data
 
         except RequestException as e:
+            REST_ERRORS.inc(endpoint=endpoint, kind="http")
             raise ApiException(f"HTTP Request failed: {e}")
-        except json.JSONDecodeError:
+        except json_codec.JSONDecodeError:
+            REST_ERRORS.inc(endpoint=endpoint, kind="decode")
             raise ApiException(f"Failed to decode JSON response from {url}. Response text: {response.text}")
 
     def _paginated_fetch(self, endpoint: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -179,6 +218,77 @@ class BybitAdapter(BaseExchangeAdapter):
             
         return self._paginated_fetch(endpoint, params)
 
+    def _fetch_windows(self, fetch, category: str, start_time: int, end_time: Optional[int],
+                       max_workers: int, name: str) -> List[List[Dict[str, Any]]]:
+        """
+        Splits start_time..end_time into 7-day windows and calls `fetch(category, start_time=, end_time=)`
+        for each, concurrently. Raises if any window fails, so callers never mistake a partial
+        history for a complete one.
+        """
+        end_time = end_time or int(time.time() * 1000)
+        windows = []
+        window_start = start_time
+        while window_start <= end_time:
+            window_end = min(window_start + HISTORY_WINDOW_MS - 1, end_time)
+            windows.append((window_start, window_end))
+            window_start = window_end + 1
+        if not windows:  # start_time after end_time (e.g. a record stamped ahead of the local clock)
+            return []
+        if len(windows) == 1:
+            return [fetch(category, start_time=start_time, end_time=end_time, limit=100)]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(windows)), thread_name_prefix=name) as pool:
+            futures = [pool.submit(fetch, category, start_time=start, end_time=end, limit=100)
+                       for start, end in windows]
+            try:
+                return [future.result() for future in futures]
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def get_closed_pnl_history(self, category: str, start_time: int, end_time: int = None,
+                               max_workers: int = HISTORY_MAX_WORKERS) -> List[ClosedPnl]:
+        """
+        Closed PnL records for any lookback (newest first). The range is split into 7-day
+        windows fetched concurrently, then merged and de-duplicated. Raises if any window fails.
+        """
+        pages = self._fetch_windows(self.get_closed_pnl, category, start_time, end_time, max_workers, "closed-pnl")
+        records = {}
+        for page in pages:
+            for record in ClosedPnl.from_api_list(page):
+                records.setdefault(record.identity(), record)
+        merged = sorted(records.values(), key=lambda r: r.updated_time or 0, reverse=True)
+        log.info(f"Fetched {len(merged)} closed PnL records in {len(pages)} window(s)")
+        return merged
+
+    def get_execution_history(self, category: str, start_time: int, end_time: int = None,
+                              max_workers: int = HISTORY_MAX_WORKERS) -> List[Execution]:
+        """
+        Executions (fills) for any lookback (newest first), fetched like get_closed_pnl_history.
+        Funding entries are not fills and are dropped.
+        """
+        pages = self._fetch_windows(self.get_executions, category, start_time, end_time, max_workers, "executions")
+        records = {}
+        for page in pages:
+            for record in Execution.from_api_list(page):
+                if record.exec_type != "Funding":
+                    records.setdefault(record.identity(), record)
+        merged = sorted(records.values(), key=lambda r: r.exec_time or 0, reverse=True)
+        log.info(f"Fetched {len(merged)} executions in {len(pages)} window(s)")
+        return merged
+
+    def get_position_records(self, category: str, settleCoin: str = "USDT") -> List[Position]:
+        """
+        Fetches current positions as typed records.
+        """
+        return Position.from_api_list(self.get_positions(category, settleCoin=settleCoin))
+
+    def get_closed_pnl_records(self, category: str, start_time: int = None, end_time: int = None, limit: int = 50) -> List[ClosedPnl]:
+        """
+        Fetches closed PnL records as typed records (newest first).
+        """
+        return ClosedPnl.from_api_list(self.get_closed_pnl(category, start_time=start_time, end_time=end_time, limit=limit))
+
     def get_wallet_balance(self, account_type: str = "UNIFIED", coin: str = None) -> Dict[str, Any]:
         """
         Fetches the wallet balance.
@@ -205,3 +315,41 @@ class BybitAdapter(BaseExchangeAdapter):
             params["settleCoin"] = settleCoin
             
         return self._paginated_fetch(endpoint, params)
+
+    def get_order_history(self, category: str, start_time: int = None, settleCoin: str = "USDT", limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Fetches order history (final-state and recently updated orders).
+        """
+        endpoint = "/v5/order/history"
+        params = {
+            "category": category,
+            "limit": limit
+        }
+        if category == "linear":
+            params["settleCoin"] = settleCoin
+        if start_time:
+            params["startTime"] = start_time
+
+        return self._paginated_fetch(endpoint, params)
+
+    def get_executions(self, category: str, start_time: int = None, end_time: int = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Fetches executions since `start_time` (ms). Bybit serves at most 7 days per query.
+        """
+        endpoint = "/v5/execution/list"
+        params = {
+            "category": category,
+            "limit": limit
+        }
+        if start_time:
+            params["startTime"] = start_time
+        if end_time:
+            params["endTime"] = end_time
+
+        return self._paginated_fetch(endpoint, params)
+
+    def get_execution_records(self, category: str, start_time: int = None, limit: int = 100) -> List[Execution]:
+        """
+        Fetches executions since `start_time` (ms) as typed records.
+        """
+        return Execution.from_api_list(self.get_executions(category, start_time=start_time, limit=limit))
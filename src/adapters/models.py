@@ -0,0 +1,209 @@
+# src/adapters/models.py
+"""
+Typed Bybit records, parsed once where the data enters the system.
+
+Money, price and quantity fields are Decimal (exact; Bybit sends them as decimal
+strings), timestamps are int milliseconds. Records use __slots__ and only keep the
+fields the services read, so they are smaller than the raw response dicts.
+
+`get(api_key, default)` reads a field back in its API string form, so code written
+against the raw dicts keeps working while hot paths use the typed attributes.
+"""
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+ZERO = Decimal(0)
+
+R = TypeVar("R", bound="Record")
+
+
+def parse_decimal(value: Any) -> Optional[Decimal]:
+    """Decimal from an API number string ("" / None / malformed -> None)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, Decimal):
+        return value
+    try:
+        return Decimal(value) if isinstance(value, str) else Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def parse_ms(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_int(value: Any) -> Optional[int]:
+    """For fields the API sends as JSON integers (seq, positionIdx); read back as int."""
+    return parse_ms(value)
+
+
+def parse_str(value: Any) -> str:
+    return value if isinstance(value, str) else ("" if value is None else str(value))
+
+
+class Record:
+    """
+    Base for typed records. Subclasses declare FIELDS as (attribute, api keys, parser);
+    the first API key present in the source dict wins.
+    """
+
+    __slots__ = ()
+    FIELDS: Tuple[Tuple[str, Tuple[str, ...], Callable[[Any], Any]], ...] = ()
+    _BY_KEY: Dict[str, Tuple[str, bool]] = {}  # API key -> (attribute, read back as string)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._BY_KEY = {key: (attr, parse in (parse_decimal, parse_ms))
+                       for attr, keys, parse in cls.FIELDS for key in keys}
+
+    @classmethod
+    def from_api(cls: Type[R], data: Dict[str, Any], base: Optional[R] = None) -> R:
+        """
+        Parses an API dict. With `base`, fields missing from `data` keep the base
+        record's values (delta pushes on the private stream).
+        """
+        record = cls.__new__(cls)
+        for attr, keys, parse in cls.FIELDS:
+            for key in keys:
+                if key in data:
+                    setattr(record, attr, parse(data[key]))
+                    break
+            else:
+                setattr(record, attr, getattr(base, attr) if base is not None else parse(None))
+        return record
+
+    @classmethod
+    def from_api_list(cls: Type[R], rows: Iterable[Dict[str, Any]]) -> List[R]:
+        return [cls.from_api(row) for row in rows]
+
+    @classmethod
+    def coerce(cls: Type[R], value: Any) -> R:
+        """Returns `value` if it already is a record of this type, else parses it."""
+        return value if isinstance(value, cls) else cls.from_api(value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read by API key, returning the API representation (Decimals as strings)."""
+        field = self._BY_KEY.get(key)
+        if field is None:
+            return default
+        value = getattr(self, field[0])
+        if value is None:
+            return default
+        return str(value) if field[1] else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API-shaped dict (first API key per field), e.g. for JSON persistence."""
+        data = {}
+        for attr, keys, _ in self.FIELDS:
+            value = self.get(keys[0])
+            data[keys[0]] = "" if value is None else value
+        return data
+
+    def __repr__(self):
+        fields = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr, _, _ in self.FIELDS[:4])
+        return f"{type(self).__name__}({fields})"
+
+
+class Transaction(Record):
+    """One row of /v5/account/transaction-log."""
+
+    __slots__ = ("type", "symbol", "side", "order_id", "qty", "trade_price", "fee", "change", "transaction_time")
+    FIELDS = (
+        ("type", ("type",), parse_str),
+        ("symbol", ("symbol",), parse_str),
+        ("side", ("side",), parse_str),
+        ("order_id", ("orderId",), parse_str),
+        ("qty", ("qty",), parse_decimal),
+        ("trade_price", ("tradePrice",), parse_decimal),
+        ("fee", ("fee",), parse_decimal),
+        ("change", ("change",), parse_decimal),
+        ("transaction_time", ("transactionTime",), parse_ms),
+    )
+
+
+class Execution(Record):
+    """One fill from /v5/execution/list or the `execution` topic."""
+
+    __slots__ = ("exec_id", "order_id", "symbol", "side", "exec_type", "stop_order_type", "exec_qty",
+                 "exec_price", "exec_fee", "fee_rate", "closed_size", "exec_time", "category", "seq")
+    FIELDS = (
+        ("exec_id", ("execId",), parse_str),
+        ("order_id", ("orderId",), parse_str),
+        ("symbol", ("symbol",), parse_str),
+        ("side", ("side",), parse_str),
+        ("exec_type", ("execType",), parse_str),
+        ("stop_order_type", ("stopOrderType",), parse_str),
+        ("exec_qty", ("execQty",), parse_decimal),
+        ("exec_price", ("execPrice",), parse_decimal),
+        ("exec_fee", ("execFee",), parse_decimal),
+        ("fee_rate", ("feeRate",), parse_decimal),
+        ("closed_size", ("closedSize",), parse_decimal),
+        ("exec_time", ("execTime",), parse_ms),
+        ("category", ("category",), parse_str),
+        ("seq", ("seq",), parse_int),
+    )
+
+    def identity(self) -> Tuple:
+        """De-duplication key (overlapping fetches and the stream repeat fills)."""
+        return (self.exec_id,)
+
+
+class Position(Record):
+    """
+    One position from /v5/position/list or the `position` topic (REST avgPrice == stream entryPrice).
+    Records are not mutated once built; `_footer` caches the notifier's rendered line for this version.
+    """
+
+    __slots__ = ("symbol", "side", "size", "entry_price", "mark_price", "unrealised_pnl", "take_profit",
+                 "stop_loss", "position_value", "leverage", "category", "position_idx", "seq", "updated_time",
+                 "_footer")
+    FIELDS = (
+        ("symbol", ("symbol",), parse_str),
+        ("side", ("side",), parse_str),
+        ("size", ("size",), parse_decimal),
+        ("entry_price", ("entryPrice", "avgPrice"), parse_decimal),
+        ("mark_price", ("markPrice",), parse_decimal),
+        ("unrealised_pnl", ("unrealisedPnl",), parse_decimal),
+        ("take_profit", ("takeProfit",), parse_decimal),
+        ("stop_loss", ("stopLoss",), parse_decimal),
+        ("position_value", ("positionValue",), parse_decimal),
+        ("leverage", ("leverage",), parse_decimal),
+        ("category", ("category",), parse_str),
+        ("position_idx", ("positionIdx",), parse_int),
+        ("seq", ("seq",), parse_int),
+        ("updated_time", ("updatedTime",), parse_ms),
+    )
+
+    @property
+    def is_open(self) -> bool:
+        return self.size is not None and self.size > 0
+
+
+class ClosedPnl(Record):
+    """One record from /v5/position/closed-pnl."""
+
+    __slots__ = ("symbol", "side", "order_id", "qty", "closed_size", "avg_entry_price", "avg_exit_price",
+                 "closed_pnl", "exec_type", "created_time", "updated_time")
+    FIELDS = (
+        ("symbol", ("symbol",), parse_str),
+        ("side", ("side",), parse_str),
+        ("order_id", ("orderId",), parse_str),
+        ("qty", ("qty",), parse_decimal),
+        ("closed_size", ("closedSize",), parse_decimal),
+        ("avg_entry_price", ("avgEntryPrice",), parse_decimal),
+        ("avg_exit_price", ("avgExitPrice",), parse_decimal),
+        ("closed_pnl", ("closedPnl",), parse_decimal),
+        ("exec_type", ("execType",), parse_str),
+        ("created_time", ("createdTime",), parse_ms),
+        ("updated_time", ("updatedTime",), parse_ms),
+    )
+
+    def identity(self) -> Tuple:
+        """De-duplication key (an order can close in several records, overlapping fetches repeat them)."""
+        return (self.order_id, self.updated_time, self.closed_size, self.closed_pnl)
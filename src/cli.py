@@ -0,0 +1,276 @@
+# src/cli.py
+"""
+Single entry point for every task, as subcommands:
+
+    python -m src.cli sync [--silent]          Bybit -> Notion sync
+    python -m src.cli report [--format excel]  monthly PnL report from Notion (CSV / Excel)
+    python -m src.cli dashboard                PnL dashboard (realized + open positions) to Discord
+    python -m src.cli daily-report             daily PnL report to Discord
+    python -m src.cli positions                open position snapshot to Discord
+    python -m src.cli scan [--minutes 150]     recent transaction log to scan_2hours.txt
+    python -m src.cli analytics [--days 90]    drawdown, profit factor, Sharpe/Sortino, streaks, per symbol
+    python -m src.cli cycles [--days 7]        position cycles (entries, scale-ins, partial closes) from fills
+    python -m src.cli monitor                  real-time WebSocket monitor
+    python -m src.cli run [--monitor]          resident scheduler (optionally with the monitor)
+
+`run` keeps one warm process: the jobs configured with SYNC_INTERVAL_MINUTES,
+DAILY_REPORT_AT, PNL_DASHBOARD_AT, POSITION_SNAPSHOT_MINUTES and REPORT_EXPORT_AT share
+one ServiceContext (and, with --monitor, the monitor's clients) instead of cold-starting
+a script and opening new connections for each run.
+"""
+import argparse
+import signal
+import sys
+import threading
+import time
+from typing import Callable, List, Optional
+
+from .config import settings
+from .services import jobs
+from .services.context import ServiceContext
+from .utils.exceptions import ApiException, NotionApiException
+from .utils.logger import log
+
+
+def _alert_on_failure(ctx: ServiceContext, what: str, task: Callable[[], object]):
+    """Runs `task`; API and unexpected errors are logged and posted to the alert webhook, then re-raised."""
+    from .utils.alerter import send_discord_alert
+
+    try:
+        task()
+    except (ApiException, NotionApiException) as e:
+        message = f"An API error occurred during {what}: {e}"
+        log.error(message)
+        send_discord_alert(ctx.config.get("discord_webhook_url"), message)
+        raise
+    except Exception as e:
+        message = f"An unexpected error occurred during {what}: {e}"
+        log.critical(message, exc_info=True)
+        send_discord_alert(ctx.config.get("discord_webhook_url"), message)
+        raise
+
+
+def cmd_sync(ctx: ServiceContext, args) -> int:
+    log.info("--- Bybit to Notion Sync Service ---")
+    try:
+        _alert_on_failure(ctx, "synchronization", lambda: jobs.run_sync(ctx, silent=args.silent))
+    except Exception:
+        return 1  # Already logged and alerted
+    return 0
+
+
+def cmd_report(ctx: ServiceContext, args) -> int:
+    log.info("--- Notion PnL Report Generator ---")
+    jobs.export_pnl_report(ctx, output_format=args.format)
+    return 0
+
+
+def cmd_dashboard(ctx: ServiceContext, args) -> int:
+    log.info("--- Generating Manual PnL Report ---")
+    jobs.send_pnl_dashboard(ctx)
+    return 0
+
+
+def cmd_daily_report(ctx: ServiceContext, args) -> int:
+    jobs.send_daily_report(ctx)
+    return 0
+
+
+def cmd_positions(ctx: ServiceContext, args) -> int:
+    jobs.send_position_snapshot(ctx)
+    return 0
+
+
+def cmd_scan(ctx: ServiceContext, args) -> int:
+    jobs.scan_transactions(ctx, minutes=args.minutes, sub_uid=args.sub_uid, output_path=args.output)
+    return 0
+
+
+def cmd_analytics(ctx: ServiceContext, args) -> int:
+    from .services.analytics import format_summary
+    from .utils import json_codec
+
+    result = ctx.stats.get_performance_analytics(days=args.days, capital=args.capital)
+    if args.json:
+        if not args.equity_curve:
+            result = {key: value for key, value in result.items() if key != "equity_curve"}
+        print(json_codec.dumps(result))
+    else:
+        print("\n".join(format_summary(result)))
+    return 0
+
+
+def cmd_cycles(ctx: ServiceContext, args) -> int:
+    from datetime import datetime
+    from .utils import json_codec
+
+    result = ctx.stats.get_position_cycles(days=args.days, symbol=args.symbol)
+    if args.json:
+        print(json_codec.dumps(result))
+        return 0
+
+    def when(ms):
+        return datetime.fromtimestamp(ms / 1000).strftime("%m-%d %H:%M") if ms else "(before history)"
+
+    print(f"{'symbol':<14} {'side':<5} {'#':>3} {'opened':>16} {'closed':>11} {'max size':>12} "
+          f"{'entry':>12} {'exit':>12} {'adds':>4} {'parts':>5} {'pnl':>11}")
+    for cycle in result["closed"] + result["open"]:
+        closed = when(cycle["closedAt"]) if cycle["closedAt"] else "open"
+        print(f"{cycle['symbol']:<14} {cycle['side']:<5} {cycle['cycle']:>3} {when(cycle['openedAt']):>16} {closed:>11} "
+              f"{cycle['maxSize']:>12g} {cycle['avgEntryPrice']:>12g} {cycle['avgExitPrice']:>12g} "
+              f"{cycle['scaleIns']:>4} {cycle['partialCloses']:>5} {cycle['closedPnl']:>11,.2f}")
+    if not result["closed"] and not result["open"]:
+        print("No position cycles in range.")
+    return 0
+
+
+def cmd_monitor(ctx: ServiceContext, args) -> int:
+    start_monitor(ctx)
+    return 0
+
+
+def cmd_run(ctx: ServiceContext, args) -> int:
+    scheduler = build_scheduler(ctx, run_now=args.run_now)
+    if args.monitor:
+        # The WebSocket loop owns the main thread (signals, profiling); jobs run beside it
+        threading.Thread(target=scheduler.run_forever, name="scheduler", daemon=True).start()
+        start_monitor(ctx)
+        scheduler.stop()
+        return 0
+    if ctx.config.get("metrics_port"):
+        from .utils import metrics
+        try:
+            metrics.start_metrics_server(int(ctx.config["metrics_port"]))
+        except (OSError, ValueError) as e:
+            log.error(f"Could not start the metrics endpoint: {e}")
+    signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        log.info("Scheduler stopped by user.")
+    return 0
+
+
+def build_scheduler(ctx: ServiceContext, run_now: bool = False):
+    """Scheduler with the jobs enabled in the configuration (empty value disables a job)."""
+    from .services.pnl_aggregates import load_timezone
+    from .services.scheduler import Scheduler
+
+    config = ctx.config
+    # Daily times are in the reporting timezone, like the PnL days they report on
+    scheduler = Scheduler(tz=load_timezone(config.get("report_timezone")))
+    if config.get("sync_interval_minutes"):
+        scheduler.every("sync", float(config["sync_interval_minutes"]) * 60,
+                        lambda: _alert_on_failure(ctx, "synchronization", lambda: jobs.run_sync(ctx)),
+                        run_at_start=run_now)
+    if config.get("position_snapshot_minutes"):
+        scheduler.every("position_snapshot", float(config["position_snapshot_minutes"]) * 60,
+                        lambda: jobs.send_position_snapshot(ctx), run_at_start=run_now)
+    if config.get("daily_report_at"):
+        scheduler.daily("daily_report", config["daily_report_at"], lambda: jobs.send_daily_report(ctx))
+    if config.get("pnl_dashboard_at"):
+        scheduler.daily("pnl_dashboard", config["pnl_dashboard_at"], lambda: jobs.send_pnl_dashboard(ctx))
+    if config.get("report_export_at"):
+        output_format = config.get("report_export_format") or "csv"
+        scheduler.daily("report_export", config["report_export_at"],
+                        lambda: jobs.export_pnl_report(ctx, output_format=output_format))
+    return scheduler
+
+
+def start_monitor(services: Optional[ServiceContext] = None):
+    """Runs the real-time monitor on this thread until stopped (SIGTERM / Ctrl+C)."""
+    from .monitor.ws_manager import BybitMonitor
+    from .utils.profiling import ProfilerControl, start_control_server
+
+    log.info("--- Starting Bybit Real-time Monitor ---")
+
+    # Initialize Monitor (WebSocket + Sync + Webhook); `services` shares clients with the scheduler
+    monitor = BybitMonitor(services=services)
+
+    # Persist state on `docker stop` (SIGTERM) as well as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: monitor.stop())
+
+    # On-demand profiling (SIGUSR1 / SIGUSR2, optional local control endpoint); idle until triggered
+    profiler = ProfilerControl(settings.get("profile_dir", "data/profiles"),
+                               default_seconds=float(settings.get("profile_seconds") or 30))
+    profiler.install_signal_handlers()
+    if settings.get("profile_control_port"):
+        try:
+            start_control_server(profiler, int(settings["profile_control_port"]))
+        except (OSError, ValueError) as e:
+            log.error(f"Could not start the profiling control endpoint: {e}")
+
+    try:
+        monitor.start()
+    except KeyboardInterrupt:
+        log.info("Monitor stopped by user.")
+        monitor.stop()
+    except Exception as e:
+        log.error(f"Monitor crashed: {e}")
+        time.sleep(5) # Prevent tight loop on crash
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Bybit monitor, Notion sync and PnL reports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser("sync", help="Sync Bybit transactions to Notion")
+    sync.add_argument("--silent", action="store_true", help="Suppress notifications from the sync")
+    sync.set_defaults(handler=cmd_sync)
+
+    report = commands.add_parser("report", help="Monthly PnL report from Notion")
+    report.add_argument("--format", choices=("csv", "excel"), default="csv")
+    report.set_defaults(handler=cmd_report)
+
+    commands.add_parser("dashboard", help="PnL dashboard (realized + open positions) to Discord") \
+        .set_defaults(handler=cmd_dashboard)
+    commands.add_parser("daily-report", help="Daily PnL report to Discord").set_defaults(handler=cmd_daily_report)
+    commands.add_parser("positions", help="Open position snapshot to Discord").set_defaults(handler=cmd_positions)
+
+    scan = commands.add_parser("scan", help="Recent transaction log (master and one subaccount) to a file")
+    scan.add_argument("--minutes", type=int, default=150)
+    scan.add_argument("--sub-uid", default=None, help="Subaccount UID to include")
+    scan.add_argument("--output", default="scan_2hours.txt")
+    scan.set_defaults(handler=cmd_scan)
+
+    analytics = commands.add_parser("analytics", help="Performance analytics over the closed-PnL history")
+    analytics.add_argument("--days", type=int, default=30, help="Calendar days to analyze, including today")
+    analytics.add_argument("--capital", type=float, default=None,
+                           help="Starting equity; reports drawdown in %% and Sharpe/Sortino on returns")
+    analytics.add_argument("--json", action="store_true", help="Print the result as JSON")
+    analytics.add_argument("--equity-curve", action="store_true", help="Include the equity curve in the JSON")
+    analytics.set_defaults(handler=cmd_analytics)
+
+    cycles = commands.add_parser("cycles", help="Position cycles rebuilt from fills and closed PnL")
+    cycles.add_argument("--days", type=int, default=7, help="Calendar days of closed cycles, including today")
+    cycles.add_argument("--symbol", default=None)
+    cycles.add_argument("--json", action="store_true", help="Print the result as JSON")
+    cycles.set_defaults(handler=cmd_cycles)
+
+    commands.add_parser("monitor", help="Real-time WebSocket monitor").set_defaults(handler=cmd_monitor)
+
+    run = commands.add_parser("run", help="Resident scheduler for the configured periodic jobs")
+    run.add_argument("--monitor", action="store_true", help="Also run the real-time monitor in this process")
+    run.add_argument("--run-now", action="store_true", help="Run the interval jobs once at startup")
+    run.set_defaults(handler=cmd_run)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not settings:
+        log.critical("Critical: Configuration could not be loaded. Exiting.")
+        return 1
+    ctx = ServiceContext()
+    try:
+        return args.handler(ctx, args)
+    except (ApiException, NotionApiException) as e:
+        log.error(f"{args.command} failed: {e}")
+        return 1
+    except Exception as e:
+        log.critical(f"{args.command} failed: {e}", exc_info=True)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
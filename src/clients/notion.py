@@ -6,11 +6,18 @@ from typing import Any, Dict, List, Optional
 from notion_client import Client
 from notion_client.errors import APIResponseError
 
+from ..utils import json_codec, metrics
 from ..utils.exceptions import NotionApiException
 from ..utils.logger import log
+from ..utils.sync_profile import note_count, note_retry, run_phase
 
 # Notion API has a rate limit of an average of 3 requests per second.
 NOTION_REQUEST_DELAY = 0.4  # seconds, slightly more than 1/3
+NOTION_BASE_URL = "https://api.notion.com"
+
+WRITE_LATENCY = metrics.histogram("notion_write_seconds", "Notion page create round-trip time")
+WRITE_QUEUE_DEPTH = metrics.gauge("notion_write_queue_depth", "Records of the current batch not yet written to Notion")
+RATE_LIMITED = metrics.counter("notion_rate_limited_total", "Notion rate_limited responses")
 
 import requests
 
@@ -20,24 +27,28 @@ class NotionClient:
     Handles querying the database for the last sync time and creating new records.
     """
 
-    def __init__(self, token: str, database_id: str):
+    def __init__(self, token: str, database_id: str, base_url: Optional[str] = None):
         """
         Initializes the Notion client.
 
         Args:
             token: The Notion integration token.
             database_id: The ID of the Notion database to sync with.
+            base_url: API origin; defaults to NOTION_BASE_URL (override for the local fake in src/sandbox).
         """
-        self.client = Client(auth=token)
+        self.base_url = (base_url or NOTION_BASE_URL).rstrip("/")
+        self.client = Client(auth=token, base_url=self.base_url)
         self.token = token
         self.database_id = database_id
+        # Keep-alive connections for the direct database queries
+        self._session = requests.Session()
 
     def _query_database(self, **kwargs):
         """
         Helper method to query the database using direct requests to bypass
         client library issues on Windows.
         """
-        url = f"https://api.notion.com/v1/databases/{self.database_id}/query"
+        url = f"{self.base_url}/v1/databases/{self.database_id}/query"
         headers = {
             "Authorization": f"Bearer {self.token}",
             "Notion-Version": "2022-06-28",
@@ -45,12 +56,14 @@ class NotionClient:
         }
         
         try:
-            response = requests.post(url, headers=headers, json=kwargs)
+            response = self._session.post(url, headers=headers, data=json_codec.dumps_bytes(kwargs))
             response.raise_for_status()
-            return response.json()
+            return json_codec.loads(response.content)
         except requests.exceptions.RequestException as e:
             # Wrap as APIResponseError or NotionApiException so callers handle it
             raise NotionApiException(f"Direct query failed: {e}")
+        except json_codec.JSONDecodeError as e:
+            raise NotionApiException(f"Direct query returned invalid JSON: {e}")
 
     def get_last_sync_timestamp(self, timestamp_col_name: str = "Timestamp") -> Optional[int]:
         """
@@ -137,50 +150,53 @@ class NotionClient:
             for i in range(0, len(lst), n):
                 yield lst[i:i + n]
                 
-        # Query matching IDs from Notion
-        for id_chunk in chunk_list(candidate_ids, 50):
-            if not id_chunk:
-                continue
+        with run_phase("dedup"):
+            # Query matching IDs from Notion
+            for id_chunk in chunk_list(candidate_ids, 50):
+                if not id_chunk:
+                    continue
                 
-            try:
-                # Construct OR filter for this chunk
-                or_filters = []
-                for tid in id_chunk:
-                    or_filters.append({
-                        "property": "Transaction ID",
-                        "rich_text": {
-                            "equals": tid
-                        }
-                    })
+                try:
+                    # Construct OR filter for this chunk
+                    or_filters = []
+                    for tid in id_chunk:
+                        or_filters.append({
+                            "property": "Transaction ID",
+                            "rich_text": {
+                                "equals": tid
+                            }
+                        })
                 
-                # Query Notion
-                response = self._query_database(
-                    filter={"or": or_filters},
-                    page_size=100  # Should be enough for the chunk size
-                )
+                    # Query Notion
+                    note_count("dedup_queries")
+                    response = self._query_database(
+                        filter={"or": or_filters},
+                        page_size=100  # Should be enough for the chunk size
+                    )
                 
-                # Collect found IDs
-                for page in response.get("results", []):
-                    try:
-                        # Extract Transaction ID
-                        id_prop = page["properties"].get("Transaction ID", {}).get("rich_text", [])
-                        if id_prop:
-                            found_id = id_prop[0]["plain_text"]
-                            existing_ids.add(found_id)
-                    except (KeyError, IndexError):
-                        continue
+                    # Collect found IDs
+                    for page in response.get("results", []):
+                        try:
+                            # Extract Transaction ID
+                            id_prop = page["properties"].get("Transaction ID", {}).get("rich_text", [])
+                            if id_prop:
+                                found_id = id_prop[0]["plain_text"]
+                                existing_ids.add(found_id)
+                        except (KeyError, IndexError):
+                            continue
                         
-                # Rate limit respect
-                time.sleep(NOTION_REQUEST_DELAY)
+                    # Rate limit respect
+                    time.sleep(NOTION_REQUEST_DELAY)
                 
-            except APIResponseError as e:
-                log.warning(f"Failed to query existing IDs matching chunk: {e}. Duplicates may occur.")
+                except APIResponseError as e:
+                    log.warning(f"Failed to query existing IDs matching chunk: {e}. Duplicates may occur.")
 
         
         # Deduplication Step 2: Filter input records
         unique_records = [r for r in records if r.get("id") and r.get("id") not in existing_ids]
         
         duplicates_count = len(records) - len(unique_records)
+        note_count("duplicates", duplicates_count)
         if duplicates_count > 0:
             log.info(f"Skipped {duplicates_count} duplicate records found in Notion.")
         
@@ -188,29 +204,39 @@ class NotionClient:
             log.info("No new unique records to create.")
             return
 
-        for record in unique_records:
-            properties = self._map_to_notion_properties(record)
-            try:
-                self.client.pages.create(
-                    parent={"database_id": self.database_id},
-                    properties=properties,
-                )
-                log.info(f"Successfully created record in Notion for symbol: {record.get('symbol')}")
-                # Adhere to rate limits
-                time.sleep(NOTION_REQUEST_DELAY)
+        with run_phase("write"):
+            for index, record in enumerate(unique_records):
+                WRITE_QUEUE_DEPTH.set(len(unique_records) - index)
+                properties = self._map_to_notion_properties(record)
+                try:
+                    with WRITE_LATENCY.time():
+                        self.client.pages.create(
+                            parent={"database_id": self.database_id},
+                            properties=properties,
+                        )
+                    note_count("written")
+                    log.info(f"Successfully created record in Notion for symbol: {record.get('symbol')}")
+                    # Adhere to rate limits
+                    time.sleep(NOTION_REQUEST_DELAY)
 
-            except APIResponseError as e:
-                # Handle rate limit error
-                if e.code == "rate_limited":
-                    log.warning("Notion rate limit hit. Sleeping for 60 seconds...")
-                    time.sleep(60)
-                    # Retry the same record
-                    self.client.pages.create(
-                        parent={"database_id": self.database_id},
-                        properties=properties,
-                    )
-                else:
-                    raise NotionApiException(f"Failed to create Notion page for record {record}: {e}")
+                except APIResponseError as e:
+                    # Handle rate limit error
+                    if e.code == "rate_limited":
+                        RATE_LIMITED.inc()
+                        note_retry("notion_rate_limit")
+                        log.warning("Notion rate limit hit. Sleeping for 60 seconds...")
+                        time.sleep(60)
+                        # Retry the same record
+                        with WRITE_LATENCY.time():
+                            self.client.pages.create(
+                                parent={"database_id": self.database_id},
+                                properties=properties,
+                            )
+                        note_count("written")
+                    else:
+                        WRITE_QUEUE_DEPTH.set(0)
+                        raise NotionApiException(f"Failed to create Notion page for record {record}: {e}")
+        WRITE_QUEUE_DEPTH.set(0)
 
     @staticmethod
     def _map_to_notion_properties(record: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,28 +1,74 @@
 # src/config.py
 import os
+import sys
 from dotenv import load_dotenv
 # We can't use the logger here easily because it might not be configured yet
 # and can cause circular dependencies. For config errors, printing to stderr is standard.
 
+DOTENV_PATH = os.path.join(os.path.dirname(__file__), '..', '.env')
+
+# Category:SettleCoin pairs the monitor snapshots on startup and after a reconnect
+DEFAULT_MONITOR_SETTLE_COINS = "linear:USDT,linear:USDC,inverse:BTC,inverse:ETH"
+
+
+def load_env():
+    """
+    Loads environment variables from the .env file if it exists (variables already set win).
+    Useful for local development.
+    """
+    if os.path.exists(DOTENV_PATH):
+        load_dotenv(dotenv_path=DOTENV_PATH)
+
+
 def load_config():
     """
     Loads configuration from environment variables or a .env file.
     It validates that all necessary variables are present.
     """
-    # Load environment variables from .env file if it exists
-    # Useful for local development
-    dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
-    if os.path.exists(dotenv_path):
-        load_dotenv(dotenv_path=dotenv_path)
+    load_env()
 
     config = {
         "bybit_api_key": os.getenv("BYBIT_API_KEY"),
         "bybit_api_secret": os.getenv("BYBIT_API_SECRET"),
         "notion_token": os.getenv("NOTION_TOKEN"),
         "notion_db_id": os.getenv("NOTION_DB_ID"),
+        "notion_base_url": os.getenv("NOTION_BASE_URL", "https://api.notion.com"),
         "discord_webhook_url": os.getenv("DISCORD_WEBHOOK_URL"),
         "discord_pnl_webhook_url": os.getenv("DISCORD_PNL_WEBHOOK_URL"),
         "discord_bot_token": os.getenv("DISCORD_BOT_TOKEN"),
+        # Endpoints (override to target testnet or the local fake exchange in src/sandbox)
+        "bybit_base_url": os.getenv("BYBIT_BASE_URL", "https://api.bybit.com"),
+        "bybit_ws_url": os.getenv("BYBIT_WS_URL", "wss://stream.bybit.com/v5/private"),
+        # Monitor state snapshot for warm restarts (set to empty to disable)
+        "monitor_state_path": os.getenv("MONITOR_STATE_PATH", "data/monitor_state.json"),
+        # Category:SettleCoin pairs the monitor snapshots on startup
+        "monitor_settle_coins": os.getenv("MONITOR_SETTLE_COINS", DEFAULT_MONITOR_SETTLE_COINS),
+        # Opt-in journal of raw private-stream frames for replays (empty disables)
+        "ws_journal_path": os.getenv("WS_JOURNAL_PATH"),
+        "ws_journal_max_bytes": os.getenv("WS_JOURNAL_MAX_BYTES"),
+        # Exchange-event -> Discord-post latency traces (empty disables)
+        "trace_path": os.getenv("TRACE_PATH", "data/event_traces.log"),
+        # Per-run sync profiles (JSON lines; empty disables)
+        "sync_history_path": os.getenv("SYNC_HISTORY_PATH", "data/sync_runs.jsonl"),
+        # Local closed-PnL history the statistics are computed from (JSON lines; empty keeps it in memory)
+        "closed_pnl_store_path": os.getenv("CLOSED_PNL_STORE_PATH", "data/closed_pnl.jsonl"),
+        # Local fill history position cycles are rebuilt from (JSON lines; empty keeps it in memory)
+        "execution_store_path": os.getenv("EXECUTION_STORE_PATH", "data/executions.jsonl"),
+        # IANA timezone the daily / monthly PnL buckets use, e.g. Asia/Taipei (empty: system local time)
+        "report_timezone": os.getenv("REPORT_TIMEZONE"),
+        # Port for the /metrics endpoint of the monitor (empty disables)
+        "metrics_port": os.getenv("METRICS_PORT"),
+        # On-demand profiling output and local control endpoint (empty port disables the endpoint)
+        "profile_dir": os.getenv("PROFILE_DIR", "data/profiles"),
+        "profile_seconds": os.getenv("PROFILE_SECONDS", "30"),
+        "profile_control_port": os.getenv("PROFILE_CONTROL_PORT"),
+        # Resident scheduler (`python -m src.cli run`): minutes between runs / HH:MM in REPORT_TIMEZONE (empty disables)
+        "sync_interval_minutes": os.getenv("SYNC_INTERVAL_MINUTES", "60"),
+        "position_snapshot_minutes": os.getenv("POSITION_SNAPSHOT_MINUTES"),
+        "daily_report_at": os.getenv("DAILY_REPORT_AT", "23:55"),
+        "pnl_dashboard_at": os.getenv("PNL_DASHBOARD_AT"),
+        "report_export_at": os.getenv("REPORT_EXPORT_AT"),
+        "report_export_format": os.getenv("REPORT_EXPORT_FORMAT", "csv"),
     }
 
     # Validate that essential variables are set
@@ -36,11 +82,63 @@ def load_config():
     
     return config
 
-# Load configuration once when the module is imported
-try:
-    settings = load_config()
-except ValueError as e:
-    # Using print here is intentional as logger might not be set up
-    # and this is a critical startup failure.
-    print(f"Configuration Error: {e}", file=os.sys.stderr)
-    settings = {}
+class LazySettings:
+    """
+    Read-only view of load_config(), resolved on first access and cached. The .env file
+    itself is parsed at import (below), so settings read straight from the environment
+    at import time (LOG_FORMAT, LOG_QUEUE, JSON_CODEC, ...) see it too.
+    Behaves like the config dict (empty if configuration failed to load).
+    """
+
+    def __init__(self):
+        self._config = None
+
+    def _load(self):
+        # Loading twice from racing threads is harmless: both read the same environment
+        if self._config is None:
+            try:
+                self._config = load_config()
+            except ValueError as e:
+                # Using print here is intentional as logger might not be set up
+                # and this is a critical startup failure.
+                print(f"Configuration Error: {e}", file=sys.stderr)
+                self._config = {}
+        return self._config
+
+    def reload(self):
+        """Drops the cached configuration; the next access reads the environment again."""
+        self._config = None
+
+    def get(self, key, default=None):
+        return self._load().get(key, default)
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __contains__(self, key):
+        return key in self._load()
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def keys(self):
+        return self._load().keys()
+
+    def items(self):
+        return self._load().items()
+
+    def values(self):
+        return self._load().values()
+
+    def __repr__(self):
+        return f"LazySettings({'unloaded' if self._config is None else len(self._config)} keys)"
+
+
+# .env is cheap to parse; the logger and JSON codec read the environment when imported
+load_env()
+
+# Resolved on first use (see LazySettings)
+settings = LazySettings()
@@ -0,0 +1,112 @@
+# src/monitor/conflation.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from ..utils.logger import log
+
+
+class ConflatingQueue:
+    """
+    Latest-wins ingestion queue keyed by symbol.
+
+    Producers (the WebSocket thread) `put` partial records; while a key is still
+    pending, new records are merged into it instead of queued behind it, so the
+    consumer sees one merged state per key per drain. Consumer cost therefore
+    scales with the number of distinct keys, not with the push rate.
+    """
+
+    def __init__(self, handler: Callable[[Hashable, Dict[str, Any], bool], None], name: str = "conflation",
+                 stats_interval: float = 60.0):
+        """
+        Args:
+            handler: Called as handler(key, merged_record, is_snapshot) on the worker thread.
+            name: Used for the worker thread name and log lines.
+            stats_interval: Minimum seconds between conflation stats log lines.
+        """
+        self.handler = handler
+        self.name = name
+        self.stats_interval = stats_interval
+        self._pending: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._running = False
+
+        self.received = 0
+        self.conflated = 0
+        self.processed = 0
+        self._last_stats_log = time.time()
+        self._last_logged_conflated = 0
+
+    def put(self, key: Hashable, record: Dict[str, Any], is_snapshot: bool = False):
+        """Queues a record, merging it into the pending one for the same key if present."""
+        with self._cond:
+            self.received += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = [dict(record), is_snapshot]
+                self._cond.notify()
+            else:
+                self.conflated += 1
+                if is_snapshot:
+                    pending[0] = dict(record)
+                    pending[1] = True
+                else:
+                    pending[0].update(record)
+
+    def drain(self) -> int:
+        """Processes everything currently pending on the calling thread. Returns the number handled."""
+        with self._cond:
+            batch = self._pending
+            self._pending = OrderedDict()
+
+        for key, (record, is_snapshot) in batch.items():
+            try:
+                self.handler(key, record, is_snapshot)
+            except Exception as e:
+                log.error(f"[{self.name}] Error processing {key}: {e}")
+        self.processed += len(batch)
+        self._maybe_log_stats()
+        return len(batch)
+
+    def _maybe_log_stats(self):
+        now = time.time()
+        if now - self._last_stats_log < self.stats_interval:
+            return
+        dropped = self.conflated - self._last_logged_conflated
+        if dropped:
+            log.info(f"[{self.name}] Conflated {dropped} updates in the last {now - self._last_stats_log:.0f}s "
+                     f"(received {self.received}, processed {self.processed} total)")
+        self._last_stats_log = now
+        self._last_logged_conflated = self.conflated
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "received": self.received,
+                "conflated": self.conflated,
+                "processed": self.processed,
+                "pending": len(self._pending),
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running and not self._pending:
+                    return
+            self.drain()
+
+    def start(self):
+        if self._worker and self._worker.is_alive():
+            return
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
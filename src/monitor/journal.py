@@ -0,0 +1,99 @@
+# src/monitor/journal.py
+import os
+import threading
+import time
+from typing import Iterator, List, Tuple
+
+# Flush buffered journal lines at least this often (seconds)
+JOURNAL_FLUSH_INTERVAL = 1.0
+
+
+class MessageJournal:
+    """
+    Append-only journal of raw private-stream frames for later replay.
+
+    One line per frame: "<receive time in ms> <raw frame>". Files rotate by size
+    like RotatingFileHandler (journal.log -> journal.log.1 -> ...). Writes are
+    buffered and flushed at most once per JOURNAL_FLUSH_INTERVAL.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backup_count: int = 5):
+        """
+        Args:
+            path: Journal file (e.g. data/ws_journal.log).
+            max_bytes: Size at which the file is rotated.
+            backup_count: Number of rotated files to keep.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._last_flush = time.time()
+
+    def append(self, message: str, received_at: float = None):
+        """Records one raw frame with its receive time."""
+        received_ms = int((received_at or time.time()) * 1000)
+        # Frames are single-line JSON; guard against embedded newlines anyway
+        line = f"{received_ms} {message.replace(chr(10), ' ')}\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._size += len(line)
+            now = time.time()
+            if now - self._last_flush >= JOURNAL_FLUSH_INTERVAL:
+                self._file.flush()
+                self._last_flush = now
+            if self._size >= self.max_bytes:
+                self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def journal_files(path: str) -> List[str]:
+    """The journal and its rotated backups, oldest first."""
+    files = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        files.append(f"{path}.{index}")
+        index += 1
+    files.reverse()
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def read_journal(paths: List[str]) -> Iterator[Tuple[float, str]]:
+    """Yields (receive time in seconds, raw frame) from journal files in order."""
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                received_ms, _, message = line.rstrip("\n").partition(" ")
+                if not message:
+                    continue
+                try:
+                    yield int(received_ms) / 1000, message
+                except ValueError:
+                    continue
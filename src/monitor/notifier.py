@@ -1,33 +1,53 @@
 import requests
-import json
 from datetime import datetime
+from ..adapters.models import ZERO, Position
 from ..config import settings
+from ..utils import json_codec, metrics
 from ..utils.logger import log
+from .tracing import current_trace
+
+SEND_LATENCY = metrics.histogram("discord_send_seconds", "Discord webhook POST round-trip time")
+SEND_RESPONSES = metrics.counter("discord_responses_total", "Discord webhook responses by HTTP status", ("status",))
+SEND_RATE_LIMITED = metrics.counter("discord_rate_limited_total", "Discord webhook 429 responses")
 
 class DiscordNotifier:
     def __init__(self):
-        self.webhook_url = settings["discord_webhook_url"]
+        self.webhook_url = settings.get("discord_webhook_url")
         self.pnl_webhook_url = settings.get("discord_pnl_webhook_url") or self.webhook_url
+        # Keep-alive connections to the webhook host across alerts
+        self._session = requests.Session()
 
     def _send(self, payload, webhook_url=None):
         """
         Internal send method.
         """
         url = webhook_url or self.webhook_url
+        trace = current_trace()
+        if trace is not None:
+            trace.end("format")
+            trace.begin("webhook_post")
         
         try:
-            response = requests.post(
-                url, 
-                data=json.dumps(payload),
-                headers={'Content-Type': 'application/json'}
-            )
+            with SEND_LATENCY.time():
+                response = self._session.post(
+                    url, 
+                    data=json_codec.dumps_bytes(payload),
+                    headers={'Content-Type': 'application/json'}
+                )
+            SEND_RESPONSES.inc(status=response.status_code)
+            if response.status_code == 429:
+                SEND_RATE_LIMITED.inc()
             if response.status_code not in [200, 201, 204]:
                 log.error(f"Failed to send notification: {response.status_code} {response.text}")
                 return False
             return True
         except Exception as e:
+            SEND_RESPONSES.inc(status="error")
             log.error(f"Error sending notification: {e}")
             return False
+        finally:
+            if trace is not None:
+                trace.end("webhook_post")
 
     def _format_all_positions_footer(self, positions_cache: dict):
         """
@@ -39,10 +59,11 @@ class DiscordNotifier:
         if not positions_cache:
             return f"{header}\n無 (Empty)"
             
+        # Positions are typed records (parsed once in the position book); raw dicts are parsed here
         active_positions = []
-        for symbol, pos in positions_cache.items():
-            size = float(pos.get("size", 0))
-            if size > 0:
+        for pos in positions_cache.values():
+            pos = Position.coerce(pos)
+            if pos.is_open:
                 active_positions.append(pos)
         
         if not active_positions:
@@ -50,28 +71,33 @@ class DiscordNotifier:
             
         lines = [header]
         for pos in active_positions:
-            symbol = pos.get("symbol", "UNKNOWN")
-            side = pos.get("side", "None")
-            entry_price = pos.get("avgPrice") or pos.get("entryPrice") or "0"
-            size = pos.get("size")
-            
-            tp = pos.get("takeProfit") or "無"
-            sl = pos.get("stopLoss") or "無"
-            if str(tp) == "0" or str(tp) == "": tp = "無"
-            if str(sl) == "0" or str(sl) == "": sl = "無"
-                
-            unrealized_pnl = float(pos.get("unrealisedPnl", 0))
-            pnl_str = f"{unrealized_pnl:+.2f} U"
-            
-            side_emoji = "🟢" if side == "Buy" else "🔴"
-            
-            p_line = f"\n**{symbol} {side} {side_emoji}** (Size: {size})\n"
-            p_line += f"Price: `{entry_price}`  TP: `{tp}`  SL: `{sl}`\n"
-            p_line += f"PnL: `{pnl_str}`"
-            lines.append(p_line)
+            # Rendered once per position version; unchanged positions reuse their line
+            line = getattr(pos, "_footer", None)
+            if line is None:
+                line = pos._footer = self._format_position_line(pos)
+            lines.append(line)
             
         return "".join(lines)
 
+    @staticmethod
+    def _format_position_line(pos: Position) -> str:
+        symbol = pos.symbol or "UNKNOWN"
+        side = pos.side or "None"
+        entry_price = pos.entry_price or "0"
+        
+        # Unset TP/SL come as "" or "0"
+        tp = pos.take_profit or "無"
+        sl = pos.stop_loss or "無"
+            
+        pnl_str = f"{pos.unrealised_pnl or ZERO:+.2f} U"
+        
+        side_emoji = "🟢" if side == "Buy" else "🔴"
+        
+        p_line = f"\n**{symbol} {side} {side_emoji}** (Size: {pos.size})\n"
+        p_line += f"Price: `{entry_price}`  TP: `{tp}`  SL: `{sl}`\n"
+        p_line += f"PnL: `{pnl_str}`"
+        return p_line
+
     def send_order_modified(self, order_data: dict, positions: dict = None):
         symbol = order_data.get("symbol")
         side = order_data.get("side")
@@ -275,20 +301,19 @@ class DiscordNotifier:
         daily_wins = realized_data.get("daily_wins", 0)
         daily_losses = realized_data.get("daily_losses", 0)
         
-        total_unrealized = 0
+        unrealized_sum = ZERO
         pos_lines = []
         
         for pos in open_positions:
-            symbol = pos.get("symbol")
-            u_pnl = float(pos.get("unrealisedPnl", 0))
-            size = float(pos.get("size", 0))
-            side = pos.get("side")
+            pos = Position.coerce(pos)
             
-            if size > 0:
-                total_unrealized += u_pnl
+            if pos.is_open:
+                u_pnl = pos.unrealised_pnl or ZERO
+                unrealized_sum += u_pnl
                 icon = "🟢" if u_pnl >= 0 else "🔴"
-                pos_lines.append(f"{icon} **{symbol}** ({side}): `{u_pnl:+.2f} U`")
+                pos_lines.append(f"{icon} **{pos.symbol}** ({pos.side}): `{u_pnl:+.2f} U`")
         
+        total_unrealized = float(unrealized_sum)
         total_equity_change = daily_pnl + total_unrealized
         color = 0xFFD700 if total_equity_change >= 0 else 0xFF0000
         
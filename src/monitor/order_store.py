@@ -0,0 +1,193 @@
+# src/monitor/order_store.py
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional
+
+FINAL_STATUSES = ("Cancelled", "Deactivated", "Filled", "Rejected")
+CLOSE_TYPES = {
+    "TakeProfit": "TakeProfit",
+    "PartialTakeProfit": "TakeProfit",
+    "StopLoss": "StopLoss",
+    "PartialStopLoss": "StopLoss",
+    "TrailingStop": "TrailingStop",
+}
+
+
+def _ms(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class OrderRecord:
+    """Lifecycle of one order as seen by the monitor."""
+
+    __slots__ = ("order_id", "symbol", "status", "stop_type", "reduce_only", "close_on_trigger",
+                 "known", "created_ms", "first_fill_ms", "updated_at")
+
+    def __init__(self, order_id: str):
+        self.order_id = order_id
+        self.symbol = None
+        self.status = None
+        self.stop_type = ""
+        self.reduce_only = False
+        self.close_on_trigger = False
+        self.known = False  # Announced / pre-existing opening order -> later updates are modifications
+        self.created_ms = None
+        self.first_fill_ms = None
+        self.updated_at = time.time()
+
+
+class OrderLifecycleStore:
+    """
+    Bounded order store keyed by orderId.
+
+    Open and finished orders live in two LRU maps with their own TTL and size cap,
+    so stop types of cancelled orders and other one-off entries age out instead of
+    accumulating over weeks of uptime. Finished orders are kept briefly so a late
+    execution flush can still resolve its close type.
+    """
+
+    def __init__(self, max_open: int = 10000, open_ttl: float = 30 * 86400,
+                 max_finished: int = 5000, finished_ttl: float = 3600, latency_window: int = 500):
+        self.max_open = max_open
+        self.open_ttl = open_ttl
+        self.max_finished = max_finished
+        self.finished_ttl = finished_ttl
+        self._open: "OrderedDict[str, OrderRecord]" = OrderedDict()
+        self._finished: "OrderedDict[str, OrderRecord]" = OrderedDict()
+        self._fill_latencies_ms = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def _evict(self, now: float):
+        for records, ttl, cap in ((self._open, self.open_ttl, self.max_open),
+                                  (self._finished, self.finished_ttl, self.max_finished)):
+            while records:
+                oldest = next(iter(records.values()))
+                if len(records) > cap or now - oldest.updated_at > ttl:
+                    records.popitem(last=False)
+                    self.evicted += 1
+                else:
+                    break
+
+    def _get(self, order_id: str) -> Optional[OrderRecord]:
+        return self._open.get(order_id) or self._finished.get(order_id)
+
+    def _touch_open(self, order_id: str, now: float) -> OrderRecord:
+        record = self._open.get(order_id)
+        if record is None:
+            record = self._finished.pop(order_id, None) or OrderRecord(order_id)
+            self._open[order_id] = record
+        else:
+            self._open.move_to_end(order_id)
+        record.updated_at = now
+        return record
+
+    def observe(self, order: Dict[str, Any]) -> OrderRecord:
+        """Upserts an order-stream record (full or delta). Final statuses move it to the finished map."""
+        order_id = order.get("orderId")
+        now = time.time()
+        with self._lock:
+            status = order.get("orderStatus")
+            if status in FINAL_STATUSES:
+                record = self._open.pop(order_id, None) or self._finished.pop(order_id, None) or OrderRecord(order_id)
+                self._finished[order_id] = record
+                record.updated_at = now
+            else:
+                record = self._touch_open(order_id, now)
+
+            if status:
+                record.status = status
+            if order.get("symbol"):
+                record.symbol = order.get("symbol")
+            if order.get("stopOrderType"):
+                record.stop_type = order.get("stopOrderType")
+            if "reduceOnly" in order:
+                record.reduce_only = bool(order.get("reduceOnly"))
+            if "closeOnTrigger" in order:
+                record.close_on_trigger = bool(order.get("closeOnTrigger"))
+            if record.created_ms is None:
+                record.created_ms = _ms(order.get("createdTime"))
+
+            self._evict(now)
+            return record
+
+    def is_known(self, order_id: str) -> bool:
+        """True if the order is open and already announced/pre-existing (i.e. an update is a modification)."""
+        record = self._open.get(order_id)
+        return record is not None and record.known
+
+    def mark_known(self, order_id: str):
+        with self._lock:
+            self._touch_open(order_id, time.time()).known = True
+
+    def known_ids(self) -> List[str]:
+        with self._lock:
+            return [order_id for order_id, record in self._open.items() if record.known]
+
+    def add_known(self, order_ids: Iterable[str]):
+        """Marks orders as pre-existing (startup / restored snapshot) so they are not announced as new."""
+        now = time.time()
+        with self._lock:
+            for order_id in order_ids:
+                if order_id:
+                    self._touch_open(order_id, now).known = True
+            self._evict(now)
+
+    def set_known(self, order_ids: Iterable[str]):
+        """Makes `order_ids` exactly the set of known open orders (REST snapshot)."""
+        order_ids = {order_id for order_id in order_ids if order_id}
+        now = time.time()
+        with self._lock:
+            for order_id in [oid for oid, record in self._open.items() if record.known and oid not in order_ids]:
+                record = self._open.pop(order_id)
+                record.updated_at = now
+                self._finished[order_id] = record
+            for order_id in order_ids:
+                self._touch_open(order_id, now).known = True
+            self._evict(now)
+
+    def stop_type(self, order_id: str) -> str:
+        record = self._get(order_id)
+        return record.stop_type if record else ""
+
+    def close_type(self, order_id: str, stop_type_hint: str = "", exec_type: str = "") -> Optional[str]:
+        """Close reason for a fill: TakeProfit / StopLoss / TrailingStop / Liquidation, or None."""
+        stop_type = stop_type_hint or self.stop_type(order_id)
+        if stop_type in CLOSE_TYPES:
+            return CLOSE_TYPES[stop_type]
+        if exec_type == "BustTrade":
+            return "Liquidation"
+        return None
+
+    def record_fill(self, order_id: str, exec_time: Any) -> Optional[int]:
+        """Records the first fill of an order; returns order-to-fill latency in ms when the creation time is known."""
+        exec_ms = _ms(exec_time)
+        with self._lock:
+            record = self._get(order_id)
+            if record is None or record.first_fill_ms is not None or exec_ms is None:
+                return None
+            record.first_fill_ms = exec_ms
+            if record.created_ms is None:
+                return None
+            latency = max(exec_ms - record.created_ms, 0)
+            self._fill_latencies_ms.append(latency)
+            return latency
+
+    def fill_latency_stats(self) -> Dict[str, float]:
+        """p50/p95/max order-to-fill latency (ms) over the recent window."""
+        latencies = sorted(self._fill_latencies_ms)
+        if not latencies:
+            return {}
+        return {
+            "count": len(latencies),
+            "p50": latencies[len(latencies) // 2],
+            "p95": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+            "max": latencies[-1],
+        }
+
+    def __len__(self):
+        return len(self._open) + len(self._finished)
@@ -0,0 +1,168 @@
+# src/monitor/pnl_engine.py
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value) if value not in (None, "") else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value) if value not in (None, "") else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+class _PositionLeg:
+    """Running state of one side of a symbol (avg entry, size, entry fee rate)."""
+
+    __slots__ = ("size", "avg_entry", "open_fee_rate", "seq")
+
+    def __init__(self):
+        self.size = 0.0
+        self.avg_entry = 0.0
+        self.open_fee_rate = None
+        self.seq = 0
+
+
+class RealizedPnlEngine:
+    """
+    Computes realized PnL for closing fills locally from the private streams.
+
+    Average entry per (symbol, side) is seeded from position snapshots / pushes
+    and advanced by opening executions. When a closing fill arrives its PnL is
+    priced against the tracked entry, net of the closing fee and the pro-rata
+    opening fee, which mirrors how Bybit reports `closedPnl`.
+
+    Position pushes and executions both carry Bybit's `seq`; an opening fill
+    whose seq is not newer than the last applied position push is already
+    reflected in that push's entry price and is not re-applied.
+    """
+
+    def __init__(self):
+        self._legs: Dict[Tuple[str, str], _PositionLeg] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_inverse(category: Optional[str]) -> bool:
+        return category == "inverse"
+
+    @staticmethod
+    def _opposite(side: str) -> str:
+        return "Sell" if side == "Buy" else "Buy"
+
+    def _leg(self, symbol: str, side: str) -> _PositionLeg:
+        key = (symbol, side)
+        leg = self._legs.get(key)
+        if leg is None:
+            leg = _PositionLeg()
+            self._legs[key] = leg
+        return leg
+
+    def apply_position(self, pos: Dict[str, Any]):
+        """
+        Applies a (merged) position record from REST or the `position` topic.
+        A flat position keeps its last entry so a late closing fill can still be priced.
+        """
+        symbol = pos.get("symbol")
+        if not symbol:
+            return
+        side = pos.get("side") or ""
+        size = _to_float(pos.get("size"))
+        entry = _to_float(pos.get("entryPrice") or pos.get("avgPrice"))
+        seq = _to_int(pos.get("seq"))
+
+        with self._lock:
+            if side not in ("Buy", "Sell"):
+                # Flat one-way position: side is reported empty
+                for (leg_symbol, _), leg in self._legs.items():
+                    if leg_symbol == symbol:
+                        leg.size = 0.0
+                        leg.seq = max(leg.seq, seq)
+                return
+
+            leg = self._leg(symbol, side)
+            leg.size = size
+            if size > 0 and entry > 0:
+                leg.avg_entry = entry
+            leg.seq = max(leg.seq, seq)
+
+    def apply_execution(self, trade: Dict[str, Any]) -> Optional[float]:
+        """
+        Applies a single execution and returns the realized PnL of its closing part,
+        or None if the fill only opened/increased a position (or the entry is unknown).
+        """
+        if trade.get("execType") not in (None, "", "Trade", "BustTrade", "Settle", "AdlTrade", "Delivery"):
+            return None
+
+        symbol = trade.get("symbol")
+        side = trade.get("side")
+        if not symbol or side not in ("Buy", "Sell"):
+            return None
+
+        exec_qty = _to_float(trade.get("execQty"))
+        exec_price = _to_float(trade.get("execPrice"))
+        exec_fee = _to_float(trade.get("execFee"))
+        closed_size = min(_to_float(trade.get("closedSize")), exec_qty)
+        fee_rate = _to_float(trade.get("feeRate"))
+        if not fee_rate and exec_qty > 0 and exec_price > 0:
+            fee_rate = exec_fee / (exec_qty * exec_price)
+        seq = _to_int(trade.get("seq"))
+        inverse = self._is_inverse(trade.get("category"))
+
+        with self._lock:
+            realized = None
+
+            if closed_size > 0:
+                # A Sell fill closes the Buy leg and vice versa
+                leg = self._leg(symbol, self._opposite(side))
+                if leg.avg_entry > 0 and exec_price > 0:
+                    if inverse:
+                        gross = closed_size * (1 / leg.avg_entry - 1 / exec_price)
+                    else:
+                        gross = closed_size * (exec_price - leg.avg_entry)
+                    if side == "Buy":
+                        # Buying back closes a short
+                        gross = -gross
+
+                    close_fee = exec_fee * (closed_size / exec_qty) if exec_qty > 0 else 0.0
+                    open_rate = leg.open_fee_rate if leg.open_fee_rate is not None else fee_rate
+                    if inverse:
+                        open_fee = closed_size / leg.avg_entry * open_rate
+                    else:
+                        open_fee = closed_size * leg.avg_entry * open_rate
+                    realized = gross - close_fee - open_fee
+
+                if seq == 0 or seq > leg.seq:
+                    leg.size = max(leg.size - closed_size, 0.0)
+
+            open_qty = exec_qty - closed_size
+            if open_qty > 0:
+                leg = self._leg(symbol, side)
+                if seq == 0 or seq > leg.seq:
+                    if leg.size <= 0:
+                        leg.avg_entry = exec_price
+                        leg.open_fee_rate = fee_rate
+                    else:
+                        total = leg.size + open_qty
+                        if inverse:
+                            # Inverse contracts average on the reciprocal of price
+                            leg.avg_entry = total / (leg.size / leg.avg_entry + open_qty / exec_price)
+                        else:
+                            leg.avg_entry = (leg.size * leg.avg_entry + open_qty * exec_price) / total
+                        if leg.open_fee_rate is not None:
+                            leg.open_fee_rate = (leg.size * leg.open_fee_rate + open_qty * fee_rate) / total
+                    leg.size += open_qty
+                    leg.seq = max(leg.seq, seq)
+
+            return realized
+
+    def get_avg_entry(self, symbol: str, side: str) -> Optional[float]:
+        """Returns the tracked average entry for a leg, or None if unknown."""
+        with self._lock:
+            leg = self._legs.get((symbol, side))
+            return leg.avg_entry if leg and leg.avg_entry > 0 else None
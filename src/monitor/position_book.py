@@ -0,0 +1,132 @@
+# src/monitor/position_book.py
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Union
+
+from ..adapters.models import Position
+
+
+class PositionBook:
+    """
+    Position cache kept authoritative from the private `position` topic.
+
+    Writers copy-on-write: every update builds a new dict and publishes it by
+    swapping a single reference, so `snapshot()` is lock-free and readers
+    (notifier footers, timers) never see a half-applied update. The published
+    dict must be treated as read-only. Entries are typed Position records,
+    parsed once when a push or snapshot is applied.
+
+    Each record carries Bybit's `seq`; pushes older than what the book holds are
+    dropped. The book reports itself stale when the stream cannot be trusted:
+    before the first REST snapshot, after a disconnect, or when an execution for
+    a symbol has been seen with a newer seq than the latest position push and the
+    push has not arrived within the grace window.
+    """
+
+    def __init__(self, lag_grace: float = 2.0):
+        self._lock = threading.Lock()
+        self._positions: Dict[str, Position] = {}
+        self._pending_exec_seq: Dict[str, tuple] = {}  # Symbol -> (seq, seen_at)
+        self._needs_resync = True
+        self.lag_grace = lag_grace
+        self.last_stream_update = 0.0
+        self.last_snapshot_time = 0.0
+        self.dropped_stale = 0
+
+    def snapshot(self) -> Dict[str, Position]:
+        """Returns the current published view (Symbol -> Position). Do not mutate."""
+        return self._positions
+
+    def get(self, symbol: str) -> Optional[Position]:
+        return self._positions.get(symbol)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def apply_snapshot(self, positions: Iterable[Union[Dict[str, Any], Position]], category: Optional[str] = None):
+        """
+        Replaces the book with a full snapshot (REST or a `snapshot` push).
+        If `category` is given only symbols of that category are replaced.
+        """
+        records = []
+        for pos in positions:
+            record = Position.coerce(pos)
+            if not record.symbol:
+                continue
+            if category and not record.category:
+                record = Position.from_api({"category": category}, base=record)
+            records.append(record)
+
+        with self._lock:
+            fresh = {
+                symbol: pos for symbol, pos in self._positions.items()
+                if category is not None and (pos.category or category) != category
+            }
+            for record in records:
+                symbol = record.symbol
+                fresh[symbol] = record
+                pending = self._pending_exec_seq.get(symbol)
+                if pending and (record.seq or 0) >= pending[0]:
+                    del self._pending_exec_seq[symbol]
+            if category is None:
+                self._pending_exec_seq.clear()
+            self._positions = fresh
+            self._needs_resync = False
+            self.last_snapshot_time = time.time()
+
+    def apply_update(self, pos: Dict[str, Any], is_snapshot: bool = False) -> Optional[Position]:
+        """
+        Applies one record from the `position` topic and returns the merged state,
+        or None if the push is older than what the book already holds.
+        Deltas are merged into the existing record; snapshots replace it.
+        """
+        symbol = pos.get("symbol")
+        if not symbol:
+            return None
+
+        with self._lock:
+            current = self._positions.get(symbol)
+            merged = Position.from_api(pos, base=None if is_snapshot else current)
+            seq = (merged.seq or 0) if "seq" in pos else 0
+            if current is not None and seq and seq < (current.seq or 0):
+                self.dropped_stale += 1
+                return None
+
+            fresh = dict(self._positions)
+            fresh[symbol] = merged
+            self._positions = fresh
+
+            pending = self._pending_exec_seq.get(symbol)
+            if pending and (not seq or seq >= pending[0]):
+                del self._pending_exec_seq[symbol]
+            self.last_stream_update = time.time()
+            return merged
+
+    def note_execution(self, symbol: str, seq: Any):
+        """Records that a fill happened; the matching position push is expected shortly."""
+        try:
+            seq = int(seq or 0)
+        except (TypeError, ValueError):
+            seq = 0
+        if not symbol or not seq:
+            return
+        with self._lock:
+            current = self._positions.get(symbol)
+            if current is not None and (current.seq or 0) >= seq:
+                return
+            pending = self._pending_exec_seq.get(symbol)
+            if pending is None or seq > pending[0]:
+                self._pending_exec_seq[symbol] = (seq, pending[1] if pending else time.time())
+
+    def mark_disconnected(self):
+        """The stream dropped; pushes may have been missed until the next REST snapshot."""
+        with self._lock:
+            self._needs_resync = True
+
+    def is_stale(self) -> bool:
+        """True if the book is known or suspected to be behind the exchange."""
+        with self._lock:
+            if self._needs_resync:
+                return True
+            now = time.time()
+            return any(now - seen_at > self.lag_grace for _, seen_at in self._pending_exec_seq.values())
@@ -0,0 +1,116 @@
+# src/monitor/reconnect.py
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class ExponentialBackoff:
+    """
+    Reconnect delays with "equal jitter": half of min(cap, base * 2^n) plus a random share of the other half.
+    The attempt counter is reset once a connection has stayed up for `stable_after` seconds,
+    so a flapping connection keeps backing off instead of hammering the endpoint.
+    """
+
+    def __init__(self, base: float = 1.0, cap: float = 60.0, stable_after: float = 60.0):
+        self.base = base
+        self.cap = cap
+        self.stable_after = stable_after
+        self.attempt = 0
+
+    def next_delay(self) -> float:
+        ceiling = min(self.cap, self.base * (2 ** self.attempt))
+        self.attempt += 1
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def on_connection_closed(self, uptime: float):
+        if uptime >= self.stable_after:
+            self.attempt = 0
+
+
+class ConnectionHealth:
+    """
+    Ping/pong bookkeeping for one connection: round-trip time and stale detection.
+    A connection is stale when a ping has gone unanswered for `pong_timeout` seconds
+    or nothing at all has been received for `idle_timeout` seconds.
+    """
+
+    def __init__(self, pong_timeout: float = 10.0, idle_timeout: float = 60.0):
+        self.pong_timeout = pong_timeout
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._outstanding: Dict[str, float] = {}
+        self._rtts = deque(maxlen=20)
+        self._seq = 0
+        self.connected_at = time.time()
+        self.last_message_at = self.connected_at
+
+    def next_ping(self) -> Dict[str, Any]:
+        """Builds a ping frame and starts its RTT clock."""
+        with self._lock:
+            self._seq += 1
+            req_id = f"hb-{self._seq}"
+            self._outstanding[req_id] = time.time()
+        return {"req_id": req_id, "op": "ping"}
+
+    def on_message(self):
+        self.last_message_at = time.time()
+
+    def on_pong(self, message: Dict[str, Any]) -> Optional[float]:
+        """Records a pong and returns its RTT in seconds (None if the ping is unknown)."""
+        with self._lock:
+            sent_at = self._outstanding.pop(message.get("req_id"), None)
+            if sent_at is None:
+                # Bybit echoes req_id, but fall back to the oldest outstanding ping
+                if not self._outstanding:
+                    return None
+                oldest = min(self._outstanding, key=self._outstanding.get)
+                sent_at = self._outstanding.pop(oldest)
+            rtt = time.time() - sent_at
+            self._rtts.append(rtt)
+            return rtt
+
+    @property
+    def last_rtt(self) -> Optional[float]:
+        return self._rtts[-1] if self._rtts else None
+
+    @property
+    def avg_rtt(self) -> Optional[float]:
+        rtts = list(self._rtts)
+        return sum(rtts) / len(rtts) if rtts else None
+
+    def stale_reason(self) -> Optional[str]:
+        """Returns why the connection looks dead, or None if it is healthy."""
+        now = time.time()
+        with self._lock:
+            overdue = [sent for sent in self._outstanding.values() if now - sent > self.pong_timeout]
+        if overdue:
+            return f"no pong for {now - min(overdue):.1f}s"
+        if now - self.last_message_at > self.idle_timeout:
+            return f"no frames for {now - self.last_message_at:.1f}s"
+        return None
+
+
+class RecentIds:
+    """Bounded set of recently seen ids (e.g. execIds) used to de-duplicate replayed events."""
+
+    def __init__(self, maxlen: int = 5000):
+        self._order = deque()
+        self._ids = set()
+        self.maxlen = maxlen
+        self._lock = threading.Lock()
+
+    def add(self, item_id: str) -> bool:
+        """Adds an id; returns False if it was already present."""
+        with self._lock:
+            if item_id in self._ids:
+                return False
+            self._ids.add(item_id)
+            self._order.append(item_id)
+            if len(self._order) > self.maxlen:
+                self._ids.discard(self._order.popleft())
+            return True
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._ids
@@ -0,0 +1,159 @@
+# src/monitor/replay.py
+"""
+Replays a recorded WebSocket journal through BybitMonitor.on_message on a virtual clock.
+
+Usage:
+    python -m src.monitor.replay data/ws_journal.log --speed max
+    python -m src.monitor.replay data/ws_journal.log --speed 10 --exec-window 1.5 --tpsl-window 3
+"""
+import argparse
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+from .journal import journal_files, read_journal
+from .ws_manager import BybitMonitor
+from ..utils import json_codec
+from ..utils.clock import VirtualClock
+from ..utils.logger import log
+
+
+class RecordingNotifier:
+    """Stands in for DiscordNotifier during replays; records which alerts would have been sent."""
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.sent = []  # (virtual time, method, symbol)
+
+    def __getattr__(self, name):
+        if not name.startswith("send_"):
+            raise AttributeError(name)
+
+        def record(payload=None, *args, **kwargs):
+            symbol = payload.get("symbol") if isinstance(payload, dict) else None
+            self.sent.append((self.clock.time(), name, symbol))
+            return True
+        return record
+
+    def counts(self) -> Dict[str, int]:
+        return dict(Counter(method for _, method, _ in self.sent))
+
+
+def replay(paths: List[str], speed: Optional[float] = None, exec_window: Optional[float] = None,
+           tpsl_window: Optional[float] = None, drain_interval: float = 0.05) -> Dict[str, Any]:
+    """
+    Feeds journal frames into a fresh offline monitor.
+
+    Args:
+        paths: Journal files, oldest first.
+        speed: Replay speed relative to recording (1.0 = real time, 10.0 = 10x); None = as fast as possible.
+        exec_window: Override for the fill aggregation window (seconds).
+        tpsl_window: Override for the TP/SL debounce window (seconds).
+        drain_interval: Virtual seconds between drains of the position conflation queue.
+
+    Returns:
+        A summary dict (throughput, handler time per topic, alerts that would have been sent).
+    """
+    clock = VirtualClock()
+    notifier = RecordingNotifier(clock)
+    monitor = BybitMonitor(notifier=notifier, clock=clock, offline=True)
+    if exec_window is not None:
+        monitor.EXECUTION_AGGREGATION_WINDOW = exec_window
+    if tpsl_window is not None:
+        monitor.TPSL_DEBOUNCE_WINDOW = tpsl_window
+
+    per_topic = defaultdict(lambda: {"frames": 0, "handler_seconds": 0.0})
+    frames = 0
+    first_ts = None
+    next_drain = None
+    wall_start = time.perf_counter()
+
+    for received_at, raw in read_journal(paths):
+        try:
+            topic = json_codec.loads(raw).get("topic")
+        except ValueError:
+            continue
+        if not topic:
+            # auth / subscribe / pong frames are connection chatter, not events
+            continue
+
+        if first_ts is None:
+            first_ts = received_at
+            clock.now = received_at
+            next_drain = received_at + drain_interval
+
+        if speed:
+            delay = wall_start + (received_at - first_ts) / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        # Move virtual time to this frame, draining the conflation queue on the way
+        while next_drain <= received_at:
+            clock.advance_to(next_drain)
+            monitor.position_queue.drain()
+            next_drain += drain_interval
+            if not monitor.position_queue.stats()["pending"]:
+                next_drain = max(next_drain, received_at)
+        clock.advance_to(received_at)
+
+        started = time.perf_counter()
+        monitor.on_message(None, raw)
+        stats = per_topic[topic]
+        stats["handler_seconds"] += time.perf_counter() - started
+        stats["frames"] += 1
+        frames += 1
+
+    # Let pending debounce timers and queued position updates play out
+    monitor.position_queue.drain()
+    clock.run_pending()
+    monitor.position_queue.drain()
+
+    wall_seconds = time.perf_counter() - wall_start
+    topics = {}
+    for topic, stats in per_topic.items():
+        topics[topic] = {
+            "frames": stats["frames"],
+            "handler_seconds": round(stats["handler_seconds"], 6),
+            "avg_handler_us": round(stats["handler_seconds"] / stats["frames"] * 1e6, 2),
+        }
+
+    return {
+        "frames": frames,
+        "wall_seconds": round(wall_seconds, 4),
+        "recorded_seconds": round(clock.now - first_ts, 3) if first_ts is not None else 0.0,
+        "frames_per_second": round(frames / wall_seconds, 1) if wall_seconds > 0 else None,
+        "topics": topics,
+        "notifications": notifier.counts(),
+        "position_conflation": monitor.position_queue.stats(),
+        "execution_aggregation_window": monitor.EXECUTION_AGGREGATION_WINDOW,
+        "tpsl_debounce_window": monitor.TPSL_DEBOUNCE_WINDOW,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a WebSocket journal through BybitMonitor.")
+    parser.add_argument("journal", help="Journal path (rotated backups are included automatically)")
+    parser.add_argument("--speed", default="max", help="'max' or a multiplier such as 1 or 10")
+    parser.add_argument("--exec-window", type=float, help="Fill aggregation window override (seconds)")
+    parser.add_argument("--tpsl-window", type=float, help="TP/SL debounce window override (seconds)")
+    parser.add_argument("--drain-interval", type=float, default=0.05, help="Conflation drain interval (virtual seconds)")
+    parser.add_argument("--verbose", action="store_true", help="Keep the monitor's INFO logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        log.setLevel(logging.WARNING)
+
+    paths = journal_files(args.journal)
+    if not paths:
+        parser.error(f"No journal found at {args.journal}")
+
+    speed = None if args.speed == "max" else float(args.speed)
+    summary = replay(paths, speed=speed, exec_window=args.exec_window,
+                     tpsl_window=args.tpsl_window, drain_interval=args.drain_interval)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# src/monitor/state_store.py
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ..utils import json_codec
+from ..utils.logger import log
+
+STATE_VERSION = 1
+
+
+class MonitorStateStore:
+    """
+    Persists the monitor's in-memory state (positions, TP/SL baselines, active
+    orders, PnL cooldowns) to a JSON file so a restart can resume immediately.
+
+    Saves are coalesced: `schedule_save` marks the state dirty and a single timer
+    writes it after `save_delay` seconds, collecting the state at write time.
+    Writes go to a temp file and are swapped in atomically.
+    """
+
+    def __init__(self, path: str, save_delay: float = 2.0):
+        """
+        Args:
+            path: Location of the snapshot file (e.g. data/monitor_state.json).
+            save_delay: Seconds to coalesce changes before writing.
+        """
+        self.path = path
+        self.save_delay = save_delay
+        self._collect: Optional[Callable[[], Dict[str, Any]]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Returns the saved state, or None if there is no usable snapshot."""
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                state = json_codec.loads(f.read())
+        except (OSError, ValueError) as e:
+            log.warning(f"Could not read monitor state snapshot {self.path}: {e}")
+            return None
+
+        if state.get("version") != STATE_VERSION:
+            log.warning(f"Ignoring monitor state snapshot with version {state.get('version')}")
+            return None
+        return state
+
+    def save(self, state: Dict[str, Any]):
+        """Writes the state immediately."""
+        if not self.path:
+            return
+        payload = dict(state)
+        payload["version"] = STATE_VERSION
+        payload["saved_at"] = time.time()
+
+        directory = os.path.dirname(self.path)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(json_codec.dumps_bytes(payload))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.error(f"Failed to persist monitor state to {self.path}: {e}")
+
+    def schedule_save(self, collect: Callable[[], Dict[str, Any]]):
+        """Marks the state as changed; it is collected and written after the coalescing delay."""
+        if not self.path:
+            return
+        with self._lock:
+            self._collect = collect
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Writes any pending change now (also used at shutdown)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            collect = self._collect
+            self._collect = None
+        if collect is not None:
+            try:
+                self.save(collect())
+            except Exception as e:
+                log.error(f"Failed to collect monitor state: {e}")
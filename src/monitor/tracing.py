@@ -0,0 +1,213 @@
+# src/monitor/tracing.py
+"""
+Per-event latency traces from the exchange timestamp to the Discord post.
+
+Each alert the monitor sends gets an EventTrace with stage durations in ms:
+
+    exchange_to_receive  exchange timestamp (execTime / updatedTime) -> handled by the monitor
+    aggregation_wait     fill aggregation window (executions)
+    debounce_wait        TP/SL debounce window (position TP/SL alerts)
+    pnl                  PnL lookup via REST when it is not known locally
+    rest_refresh         REST position refresh when the stream is behind
+    format               building the embed and positions footer
+    webhook_post         Discord webhook POST
+    total                exchange timestamp -> webhook POST finished
+
+Traces are appended to a rotating file (one "<ms> <json>" line per event, same format
+as the frame journal). Summarize with:
+
+    python -m src.monitor.tracing data/event_traces.log --hours 24
+"""
+import argparse
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+from .journal import MessageJournal, journal_files, read_journal
+from ..utils import json_codec
+from ..utils.clock import SystemClock
+
+STAGES = ("exchange_to_receive", "aggregation_wait", "debounce_wait", "pnl", "rest_refresh",
+          "format", "webhook_post", "total")
+
+_local = threading.local()
+
+
+class EventTrace:
+    """Stage timings for one alert. Times come from the monitor's clock (virtual during replays)."""
+
+    __slots__ = ("clock", "kind", "symbol", "ref", "origin", "received", "stages", "_open")
+
+    def __init__(self, clock, kind: str, symbol: Optional[str], ref: Optional[str], origin_ms: Optional[int]):
+        self.clock = clock
+        self.kind = kind
+        self.symbol = symbol
+        self.ref = ref
+        self.origin = origin_ms / 1000 if origin_ms else None
+        self.received = clock.time()
+        self.stages: Dict[str, float] = {}
+        self._open: Dict[str, float] = {}
+        if self.origin is not None:
+            self.stages["exchange_to_receive"] = (self.received - self.origin) * 1000
+
+    def begin(self, stage: str, at: Optional[float] = None):
+        self._open[stage] = self.clock.time() if at is None else at
+
+    def end(self, stage: str):
+        started = self._open.pop(stage, None)
+        if started is not None:
+            self.stages[stage] = self.stages.get(stage, 0.0) + (self.clock.time() - started) * 1000
+
+    def span(self, stage: str) -> "_Span":
+        return _Span(self, stage)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "symbol": self.symbol,
+            "ref": self.ref,
+            "stages": {stage: round(ms, 3) for stage, ms in self.stages.items()},
+        }
+
+
+class _Span:
+    __slots__ = ("trace", "stage")
+
+    def __init__(self, trace: EventTrace, stage: str):
+        self.trace = trace
+        self.stage = stage
+
+    def __enter__(self):
+        self.trace.begin(self.stage)
+        return self.trace
+
+    def __exit__(self, *exc):
+        self.trace.end(self.stage)
+        return False
+
+
+def span(trace: Optional[EventTrace], stage: str):
+    """`with span(trace, "pnl"):` that is a no-op when tracing is off (trace is None)."""
+    return trace.span(stage) if trace is not None else nullcontext()
+
+
+def current_trace() -> Optional[EventTrace]:
+    """The trace being delivered on this thread (read by DiscordNotifier._send)."""
+    return getattr(_local, "trace", None)
+
+
+class EventTracer:
+    """
+    Creates traces and writes finished ones to `path`. With no path every call is a
+    cheap no-op: `start` returns None and `deliver` just calls the send function.
+    """
+
+    def __init__(self, path: Optional[str] = None, clock=None, max_bytes: int = 20 * 1024 * 1024):
+        self.clock = clock or SystemClock()
+        self._writer = MessageJournal(path, max_bytes=max_bytes) if path else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._writer is not None
+
+    def start(self, kind: str, symbol: Optional[str] = None, ref: Optional[str] = None,
+              origin_ms: Any = None) -> Optional[EventTrace]:
+        if self._writer is None:
+            return None
+        try:
+            origin = int(origin_ms) if origin_ms else None
+        except (TypeError, ValueError):
+            origin = None
+        return EventTrace(self.clock, kind, symbol, ref, origin)
+
+    def deliver(self, trace: Optional[EventTrace], send, *args, **kwargs):
+        """Calls a DiscordNotifier.send_* method under `trace` and records the trace when it returns."""
+        if trace is None:
+            return send(*args, **kwargs)
+        trace.begin("format")
+        _local.trace = trace
+        try:
+            return send(*args, **kwargs)
+        finally:
+            _local.trace = None
+            trace.end("format")  # Still open if the notifier returned without posting
+            self.finish(trace)
+
+    def finish(self, trace: EventTrace):
+        now = self.clock.time()
+        if trace.origin is not None:
+            trace.stages["total"] = (now - trace.origin) * 1000
+        if self._writer is not None:
+            self._writer.append(json_codec.dumps(trace.to_dict()), received_at=now)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(paths: List[str], since: Optional[float] = None, kind: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """kind -> stage -> {count, p50, p95, p99, max} in ms, from trace files (oldest first)."""
+    samples: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for written_at, line in read_journal(paths):
+        if since is not None and written_at < since:
+            continue
+        try:
+            entry = json_codec.loads(line)
+        except json_codec.JSONDecodeError:
+            continue
+        if kind and entry.get("kind") != kind:
+            continue
+        for stage, ms in entry.get("stages", {}).items():
+            samples[entry.get("kind", "?")][stage].append(ms)
+
+    summary = {}
+    for event_kind, stages in sorted(samples.items()):
+        summary[event_kind] = {}
+        for stage in sorted(stages, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)):
+            values = sorted(stages[stage])
+            summary[event_kind][stage] = {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": values[-1],
+            }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize event latency traces (ms per stage).")
+    parser.add_argument("path", help="Trace file (rotated backups are included)")
+    parser.add_argument("--hours", type=float, default=None, help="Only traces from the last N hours")
+    parser.add_argument("--kind", default=None, help="Only one event kind (execution, order, tpsl, position)")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    since = time.time() - args.hours * 3600 if args.hours else None
+    summary = summarize(journal_files(args.path), since=since, kind=args.kind)
+    if args.json:
+        print(json_codec.dumps(summary))
+        return
+    if not summary:
+        print("No traces found.")
+        return
+    print(f"{'kind':<10} {'stage':<20} {'count':>7} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}")
+    for event_kind, stages in summary.items():
+        for stage, row in stages.items():
+            print(f"{event_kind:<10} {stage:<20} {row['count']:>7} {row['p50']:>10.1f} {row['p95']:>10.1f} "
+                  f"{row['p99']:>10.1f} {row['max']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
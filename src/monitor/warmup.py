@@ -0,0 +1,94 @@
+# src/monitor/warmup.py
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from ..adapters.bybit import BybitAdapter
+from ..utils.logger import log
+
+# Concurrent REST calls during warm-up. The adapter's limiter still spaces them.
+WARMUP_MAX_WORKERS = 4
+
+
+def parse_settle_targets(spec: str) -> List[Tuple[str, str]]:
+    """
+    Parses "linear:USDT,linear:USDC,inverse:BTC" into [(category, settleCoin), ...].
+    """
+    targets = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        category, _, coin = item.partition(":")
+        target = (category.strip().lower(), coin.strip().upper())
+        if target[1] and target not in targets:
+            targets.append(target)
+    return targets
+
+
+class StartupWarmup:
+    """
+    Fans out position and active-order snapshots over every configured
+    category / settle coin concurrently.
+    """
+
+    def __init__(self, adapter: BybitAdapter, targets: List[Tuple[str, str]], max_workers: int = WARMUP_MAX_WORKERS):
+        self.adapter = adapter
+        self.targets = targets
+        self.max_workers = max_workers
+
+    def order_targets(self) -> List[Tuple[str, str]]:
+        """
+        The order endpoints only filter by settleCoin for linear; other categories are queried once.
+        """
+        seen_categories = set()
+        targets = []
+        for category, coin in self.targets:
+            if category == "linear":
+                targets.append((category, coin))
+            elif category not in seen_categories:
+                seen_categories.add(category)
+                targets.append((category, coin))
+        return targets
+
+    def fetch(self) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        Returns (positions by category, deduplicated active orders).
+        Raises the first error only if every request failed.
+        """
+        position_targets = list(self.targets)
+        order_targets = self.order_targets()
+        log.info(f"Warm-up: fetching positions for {position_targets} and orders for {order_targets}...")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="warmup") as pool:
+            position_futures = {
+                target: pool.submit(self.adapter.get_positions, category=target[0], settleCoin=target[1])
+                for target in position_targets
+            }
+            order_futures = {
+                target: pool.submit(self.adapter.get_active_orders, category=target[0], settleCoin=target[1])
+                for target in order_targets
+            }
+
+            errors = []
+            positions: Dict[str, List[Dict[str, Any]]] = {}
+            for (category, coin), future in position_futures.items():
+                positions.setdefault(category, [])
+                try:
+                    positions[category].extend(future.result())
+                except Exception as e:
+                    errors.append(e)
+                    log.warning(f"Could not fetch {category} positions ({coin}): {e}")
+
+            orders: Dict[str, Dict[str, Any]] = {}
+            for (category, coin), future in order_futures.items():
+                try:
+                    for order in future.result():
+                        orders[order.get("orderId")] = order
+                except Exception as e:
+                    errors.append(e)
+                    log.warning(f"Could not fetch {category} active orders ({coin}): {e}")
+
+        if errors and len(errors) == len(position_futures) + len(order_futures):
+            raise errors[0]
+
+        return positions, list(orders.values())
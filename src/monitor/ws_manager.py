@@ -1,24 +1,47 @@
 from datetime import datetime
-import json
 import time
 import hmac
 import hashlib
 import threading
 import websocket
 from .notifier import DiscordNotifier
-from ..config import settings
-from ..utils.logger import log
-from ..adapters.bybit import BybitAdapter
-from ..clients.notion import NotionClient
-from ..services.sync import SyncService
-from ..services.stats import StatsService
+from .pnl_engine import RealizedPnlEngine
+from .position_book import PositionBook
+from .conflation import ConflatingQueue
+from .state_store import MonitorStateStore
+from .warmup import StartupWarmup, parse_settle_targets
+from .reconnect import ExponentialBackoff, ConnectionHealth, RecentIds
+from .order_store import OrderLifecycleStore
+from .journal import MessageJournal
+from .tracing import EventTracer, span
+from ..config import DEFAULT_MONITOR_SETTLE_COINS, settings
+from ..utils.logger import log, log_context, sampled_log
+from ..utils.clock import SystemClock
+from ..utils import json_codec, metrics
+from ..adapters.models import ZERO, Position, parse_decimal
+from ..services.context import ServiceContext
+
+FRAME_LAG = metrics.histogram("ws_frame_lag_seconds", "Receive time minus the exchange creationTime of stream frames",
+                              ("topic",))
+HANDLER_TIME = metrics.histogram("ws_handler_seconds", "Stream frame handling time on the WebSocket thread", ("topic",))
+FRAMES = metrics.counter("ws_frames_total", "Stream frames received", ("topic",))
+POSITION_QUEUE_DEPTH = metrics.gauge("monitor_position_queue_depth", "Symbols pending in the position conflation queue")
 
 class BybitMonitor:
-    def __init__(self):
-        self.notifier = DiscordNotifier()
-        self.api_key = settings["bybit_api_key"]
-        self.api_secret = settings["bybit_api_secret"]
-        self.ws_url = "wss://stream.bybit.com/v5/private"
+    def __init__(self, notifier=None, clock=None, offline=False, services=None):
+        """
+        Args:
+            notifier: Notifier to use instead of the Discord webhook notifier.
+            clock: Time source for debounce timers and cooldowns (VirtualClock for replays).
+            offline: Skip REST services, state persistence and journaling (replays/benchmarks).
+            services: ServiceContext shared with other jobs in this process (e.g. the scheduler).
+        """
+        self.notifier = notifier or (services.notifier if services else DiscordNotifier())
+        self.clock = clock or SystemClock()
+        self.offline = offline
+        self.api_key = settings.get("bybit_api_key")
+        self.api_secret = settings.get("bybit_api_secret")
+        self.ws_url = settings.get("bybit_ws_url") or "wss://stream.bybit.com/v5/private"
         self.ws = None
         self.keep_running = True
         
@@ -28,42 +51,85 @@ class BybitMonitor:
         self.last_position_state = {} 
         # DEBOUNCE TIMERS for position updates (Symbol -> Timer)
         self.position_update_timers = {}
-        # CACHE for Order Stop Types (OrderId -> Type) to correlate Execution events
-        self.order_stop_types = {}
+        # ORDER LIFECYCLE STORE (OrderId -> status, stop type, flags, timestamps), LRU+TTL bounded.
+        # Answers New-vs-Modified and the close type of Execution events.
+        self.order_store = OrderLifecycleStore()
         self.UPDATE_COOLDOWN = 3600 # 60 minutes
         self.UPDATE_COOLDOWN = 3600 # 60 minutes 
         self.UPDATE_COOLDOWN = 3600 # 60 minutes
+        # DEBOUNCE WINDOWS (seconds): fill aggregation per order, TP/SL change alerts per symbol
+        self.EXECUTION_AGGREGATION_WINDOW = 3.0
+        self.TPSL_DEBOUNCE_WINDOW = 5.0
         
-        # POSITIONS CACHE (Symbol -> Position Data Dict)
-        self.positions = {}
+        # POSITIONS BOOK (Symbol -> Position Data Dict), authoritative from the position stream
+        self.position_book = PositionBook()
+        # Per-symbol latest-wins queue in front of the TP/SL and PnL-throttle logic
+        self.position_queue = ConflatingQueue(self._process_position_update, name="position-conflation")
         
         # Buffer for aggregation
         self.execution_buffer = {}
         
-        # Track active orders to distinguish New vs Modified
-        self.active_orders = set()
+        # Local realized PnL (avg entry per symbol/side from position + execution streams)
+        self.pnl_engine = RealizedPnlEngine()
+        # Delay before cross-checking a locally computed PnL against Bybit's closed-PnL record
+        self.PNL_RECONCILE_DELAY = 10.0
+        
+        # Snapshot of the above on disk for warm restarts
+        self.state_store = MonitorStateStore(None if offline else settings.get("monitor_state_path"))
+        
+        # Opt-in raw frame journal for replays
+        self.journal = None
+        if settings.get("ws_journal_path") and not offline:
+            self.journal = MessageJournal(
+                settings["ws_journal_path"],
+                max_bytes=int(settings.get("ws_journal_max_bytes") or 50 * 1024 * 1024)
+            )
+        
+        # Exchange-event -> Discord-post latency traces (empty path disables)
+        self.tracer = EventTracer(None if offline else settings.get("trace_path"), clock=self.clock)
+        
+        # Stream events received while a snapshot / gap reconciliation is loading (None = not buffering)
+        self._event_buffer = None
+        self._event_buffer_holds = 0
+        self._event_buffer_lock = threading.Lock()
+        
+        # RECONNECT STATE
+        self.backoff = ExponentialBackoff()
+        self.health = None  # ConnectionHealth of the current connection
+        self.HEARTBEAT_INTERVAL = 20
+        self._connected = False
+        self._disconnected_at = None  # ms, start of the current offline gap
+        self._gap_window = None  # (start_ms, end_ms) of a gap awaiting reconciliation
+        self._gap_held = False  # Whether stream events are held for that reconciliation
+        self._gap_running = False  # A _run_gap_reconciliation thread is active (one at a time)
+        self._gap_lock = threading.Lock()
+        self.GAP_MARGIN_MS = 2000  # Clock skew margin; replays are de-duplicated by id/state
+        # Recently processed execIds, to re-emit only executions actually missed during a gap
+        self.seen_exec_ids = RecentIds()
         
         # Initialize Services
+        self.bybit_adapter = None
+        self.sync_service = None
+        self.stats_service = None
+        if offline:
+            return
         try:
-            self.bybit_adapter = BybitAdapter(
-                api_key=self.api_key,
-                api_secret=self.api_secret
-            )
-            self.notion_client = NotionClient(
-                token=settings["notion_token"],
-                database_id=settings["notion_db_id"]
-            )
-            self.sync_service = SyncService(
-                exchange_adapter=self.bybit_adapter,
-                notion_client=self.notion_client
-            )
-            self.stats_service = StatsService(exchange_adapter=self.bybit_adapter)
+            services = services or ServiceContext()
+            self.bybit_adapter = services.bybit
+            self.notion_client = services.notion
+            self.sync_service = services.sync
+            self.stats_service = services.stats
             log.info("Services (Sync, Stats) initialized successfully.")
         except Exception as e:
             log.error(f"Failed to initialize Services: {e}")
             self.sync_service = None
             self.stats_service = None
 
+    @property
+    def positions(self):
+        """Read-only snapshot of the position book (Symbol -> Position Data Dict)."""
+        return self.position_book.snapshot()
+
     def generate_signature(self, expires):
         param_str = f"GET/realtime{expires}"
         return hmac.new(
@@ -74,6 +140,20 @@ class BybitMonitor:
 
     def on_open(self, ws):
         log.info("WebSocket Connected. Sending Auth...")
+        self.health = ConnectionHealth()
+        self._connected = True
+        
+        with self._gap_lock:
+            if self._disconnected_at is not None:
+                # Reconnect: hold stream events until what happened while offline is reconciled.
+                # A gap still pending (or being reconciled) is widened to cover this one too.
+                now_ms = int(time.time() * 1000)
+                gap_start = self._gap_window[0] if self._gap_window else self._disconnected_at
+                self._gap_window = (gap_start, now_ms)
+                self._disconnected_at = None
+                if not self._gap_held:
+                    self._gap_held = True
+                    self._hold_events()
         
         # Authentication
         expires = int(time.time() * 1000) + 10000
@@ -83,15 +163,12 @@ class BybitMonitor:
             "op": "auth",
             "args": [self.api_key, expires, signature]
         }
-        ws.send(json.dumps(auth_msg))
-        
-        # Clear Active Orders on reconnect
-        self.active_orders.clear()
+        ws.send(json_codec.dumps(auth_msg))
         
-        # DO NOT Clear Position State - We want to remember TP/SL across reconnects
+        # DO NOT Clear Active Orders / Position State - the gap reconciliation corrects them
 
         # Start Heartbeat Loop
-        threading.Thread(target=self.heartbeat, daemon=True).start()
+        threading.Thread(target=self.heartbeat, args=(ws, self.health), daemon=True).start()
 
     def send_daily_report(self):
         if self.stats_service:
@@ -103,11 +180,19 @@ class BybitMonitor:
                 log.error(f"Failed to send Daily Report: {e}")
 
     def on_message(self, ws, message):
+        if self.journal:
+            self.journal.append(message)
         try:
-            data = json.loads(message)
+            data = json_codec.loads(message)
             op = data.get("op")
+            if self.health:
+                self.health.on_message()
             
-            if op == "auth":
+            if op == "pong":
+                if self.health:
+                    self.health.on_pong(data)
+                    
+            elif op == "auth":
                 if data.get("success"):
                     log.info("WebSocket Authentication Successful!")
                     # Subscribe after auth
@@ -118,24 +203,86 @@ class BybitMonitor:
             elif op == "subscribe":
                 if data.get("success"):
                     log.info(f"Subscribed: {data.get('ret_msg')}")
+                    self._start_gap_reconciliation()
                     
             elif "topic" in data:
                 topic = data["topic"]
-                if topic == "order":
-                    self._on_order_update(data)
-                elif topic == "execution":
-                    self._on_execution_update(data)
-                elif topic == "position":
-                    self._on_position_update(data)
+                received = self.clock.time()
+                FRAMES.inc(topic=topic)
+                created = data.get("creationTime")
+                if isinstance(created, (int, float)):
+                    FRAME_LAG.observe(max(received - created / 1000, 0.0), topic=topic)
+                with self._event_buffer_lock:
+                    if self._event_buffer is not None:
+                        # Hold until the pending snapshot / reconciliation is applied
+                        self._event_buffer.append(data)
+                        return
+                started = time.perf_counter()
+                self._dispatch_topic(data)
+                HANDLER_TIME.observe(time.perf_counter() - started, topic=topic)
                     
         except Exception as e:
             log.error(f"Error processing message: {e}")
 
+    def _dispatch_topic(self, data):
+        topic = data["topic"]
+        with log_context(event_id=data.get("id"), topic=topic):
+            if topic == "order":
+                self._on_order_update(data)
+            elif topic == "execution":
+                self._on_execution_update(data)
+            elif topic == "position":
+                self._on_position_update(data)
+
+    def _hold_events(self):
+        """Starts (or joins) buffering of stream events until the matching _release_events()."""
+        with self._event_buffer_lock:
+            self._event_buffer_holds += 1
+            if self._event_buffer is None:
+                self._event_buffer = []
+
+    def _release_events(self):
+        """
+        Drops one hold; the last one replays buffered events in arrival order and stops buffering.
+        Events are dispatched outside the buffer lock (handlers post to Discord), so on_message keeps
+        reading frames and pongs; frames arriving meanwhile are buffered and replayed after them.
+        """
+        with self._event_buffer_lock:
+            self._event_buffer_holds = max(self._event_buffer_holds - 1, 0)
+            if self._event_buffer_holds:
+                return
+        replayed = 0
+        while True:
+            with self._event_buffer_lock:
+                if self._event_buffer_holds:
+                    return  # A new hold started; its release replays the rest
+                buffered = self._event_buffer
+                if not buffered:
+                    self._event_buffer = None
+                    break
+                self._event_buffer = []
+            for data in buffered:
+                try:
+                    self._dispatch_topic(data)
+                except Exception as e:
+                    log.error(f"Error processing buffered message: {e}")
+            replayed += len(buffered)
+        if replayed:
+            log.info(f"Replayed {replayed} stream events buffered during reconciliation.")
+
     def on_error(self, ws, error):
         log.error(f"WebSocket Error: {error}")
 
     def on_close(self, ws, close_status_code, close_msg):
         log.warning("WebSocket Connection Closed.")
+        self.position_book.mark_disconnected()
+        if self._connected:
+            self._connected = False
+            with self._gap_lock:
+                if self._disconnected_at is None:
+                    self._disconnected_at = int(time.time() * 1000)
+            if self.health:
+                self.backoff.on_connection_closed(time.time() - self.health.connected_at)
 
     def subscribe(self):
         topics = ["order", "execution", "position"]
@@ -143,16 +290,25 @@ class BybitMonitor:
             "op": "subscribe",
             "args": topics
         }
-        self.ws.send(json.dumps(sub_msg))
+        self.ws.send(json_codec.dumps(sub_msg))
         log.info(f"Subscribing to topics: {topics}")
 
-    def heartbeat(self):
-        while self.keep_running and self.ws and self.ws.sock and self.ws.sock.connected:
+    def heartbeat(self, ws, health):
+        """Pings every HEARTBEAT_INTERVAL and forces a reconnect when pongs/frames stop arriving."""
+        while self.keep_running and health is self.health and ws.sock and ws.sock.connected:
             try:
-                self.ws.send(json.dumps({"op": "ping"}))
-                time.sleep(20)
+                ws.send(json_codec.dumps(health.next_ping()))
             except Exception:
                 break
+            
+            deadline = time.time() + self.HEARTBEAT_INTERVAL
+            while time.time() < deadline and health is self.health:
+                time.sleep(1)
+                reason = health.stale_reason()
+                if reason:
+                    log.warning(f"WebSocket connection stale ({reason}). Forcing reconnect...")
+                    ws.close()
+                    return
 
     def _on_order_update(self, message):
         """Callback for order stream."""
@@ -162,9 +318,8 @@ class BybitMonitor:
             order_id = order.get("orderId")
             symbol = order.get("symbol")
             stop_order_type = order.get("stopOrderType", "")
+            self.order_store.observe(order)
             if stop_order_type:
-                self.order_stop_types[order_id] = stop_order_type
-                
                 # SUPPRESSION LOGIC:
                 # If this is a TP/SL order update, IGNORE it. 
                 # We rely on _on_position_update (debounced) to report TP/SL changes.
@@ -174,6 +329,7 @@ class BybitMonitor:
             
             # Retrieve cached position for footer
             current_position = self.positions.get(symbol)
+            trace = self.tracer.start("order", symbol, order_id, order.get("updatedTime"))
 
             # Check for Closing Order Indicators
             is_reduce_only = order.get("reduceOnly", False)
@@ -182,34 +338,33 @@ class BybitMonitor:
             
             # 1. Handle Final States First (Strict Check)
             if status in ["Cancelled", "Deactivated", "Filled"]:
-                if order_id in self.active_orders:
-                    self.active_orders.remove(order_id)
-                
                 if status in ["Cancelled", "Deactivated"]:
-                    self.notifier.send_order_cancel(order, positions=self.positions)
+                    self.tracer.deliver(trace, self.notifier.send_order_cancel, order, positions=self.positions)
                 
                 # Stop processing. Do NOT fall through to 'Modified' check.
                 continue
 
             # 2. Identify Modification (Status=None means update to existing order)
             if status is None:
-                self.notifier.send_order_modified(order, positions=self.positions)
+                self.tracer.deliver(trace, self.notifier.send_order_modified, order, positions=self.positions)
                 continue
             
             # 3. New Orders
             if status in ["New", "Untriggered"]:
                 # Check for Closing/Conditional Orders (e.g., TP/SL set on position)
                 if is_reduce_only or is_close_on_trigger or is_conditional:
-                     self.notifier.send_order_modified(order, positions=self.positions)
+                     self.tracer.deliver(trace, self.notifier.send_order_modified, order, positions=self.positions)
                 
-                elif order_id not in self.active_orders:
+                elif not self.order_store.is_known(order_id):
                     # Truly New Opening Order
-                    self.active_orders.add(order_id)
-                    self.notifier.send_order_new(order, positions=self.positions)
+                    self.order_store.mark_known(order_id)
+                    self.tracer.deliver(trace, self.notifier.send_order_new, order, positions=self.positions)
                 
                 else:
                     # Existing Order Update -> Modification
-                    self.notifier.send_order_modified(order, positions=self.positions)
+                    self.tracer.deliver(trace, self.notifier.send_order_modified, order, positions=self.positions)
+        
+        self._state_changed()
 
     def _on_execution_update(self, message):
         """Callback for execution stream (trades)."""
@@ -219,12 +374,25 @@ class BybitMonitor:
         for trade in data:
             if trade.get("execType") == "Funding":
                 continue
+            exec_id = trade.get("execId")
+            if exec_id and not self.seen_exec_ids.add(exec_id):
+                # Already processed (live stream vs gap reconciliation overlap)
+                continue
             has_valid_trade = True
             
+            fill_latency = self.order_store.record_fill(trade.get("orderId"), trade.get("execTime"))
+            if fill_latency is not None:
+                sampled_log.info("order_to_fill", f"Order-to-fill latency for {trade.get('symbol')} ({trade.get('orderId')}): {fill_latency} ms",
+                                 extra={"symbol": trade.get("symbol"), "order_id": trade.get("orderId"), "latency_ms": fill_latency})
+            realized_pnl = self.pnl_engine.apply_execution(trade)
+            self.position_book.note_execution(trade.get("symbol"), trade.get("seq"))
+            closed_size = float(trade.get("closedSize") or 0)
+            
             order_id = trade.get("orderId")
             if not order_id:
                 symbol = trade.get("symbol")
-                self.notifier.send_order_filled(trade, positions=self.positions)
+                trace = self.tracer.start("execution", symbol, trade.get("execId"), trade.get("execTime"))
+                self.tracer.deliver(trace, self.notifier.send_order_filled, trade, positions=self.positions)
                 continue
                 
             if order_id in self.execution_buffer:
@@ -244,13 +412,22 @@ class BybitMonitor:
                     
                 existing["execQty"] = str(total_qty)
                 existing["execPrice"] = str(avg_price)
+                
+                entry = self.execution_buffer[order_id]
+                entry["closed_size"] += closed_size
+                if realized_pnl is not None:
+                    entry["pnl"] = (entry["pnl"] or 0.0) + realized_pnl
             else:
                 self.execution_buffer[order_id] = {
                     "data": trade.copy(), 
-                    "timer": None
+                    "timer": None,
+                    "pnl": realized_pnl,
+                    "closed_size": closed_size,
+                    # Traced from the first fill of the order
+                    "trace": self.tracer.start("execution", trade.get("symbol"), order_id, trade.get("execTime"))
                 }
             
-            timer = threading.Timer(3.0, self._flush_execution_buffer, args=[order_id])
+            timer = self.clock.timer(self.EXECUTION_AGGREGATION_WINDOW, self._flush_execution_buffer, args=[order_id])
             self.execution_buffer[order_id]["timer"] = timer
             timer.start()
         
@@ -260,57 +437,80 @@ class BybitMonitor:
     def _flush_execution_buffer(self, order_id):
         """Called by timer to send aggregated execution."""
         if order_id in self.execution_buffer:
-            trade_data = self.execution_buffer[order_id]["data"]
-            del self.execution_buffer[order_id]
+            entry = self.execution_buffer.pop(order_id)
+            trade_data = entry["data"]
+            local_pnl = entry.get("pnl")
+            closed_size = entry.get("closed_size", 0.0)
+            trace = entry.get("trace")
+            if trace is not None:
+                trace.begin("aggregation_wait", at=trace.received)
+                trace.end("aggregation_wait")
             
             symbol = trade_data.get("symbol")
             exec_type = trade_data.get("execType")
             
-            # Try to get stopOrderType from trade data OR cached order data
-            stop_order_type = trade_data.get("stopOrderType") or self.order_stop_types.get(order_id, "")
-            
-            # Cleanup cache
-            if order_id in self.order_stop_types:
-                del self.order_stop_types[order_id]
-            
-            # 1. Retry Logic for PnL (Fix 0 PnL issue)
-            pnl = None
-            if self.stats_service:
+            # 1. PnL: computed locally from the execution stream; REST only reconciles
+            pnl = local_pnl
+            if pnl is not None:
+                if self.stats_service:
+                    threading.Thread(
+                        target=self._reconcile_closed_pnl,
+                        args=(symbol, order_id, pnl),
+                        daemon=True
+                    ).start()
+            elif closed_size > 0 and self.stats_service:
+                # Entry unknown locally (e.g. position opened before startup) -> fall back to REST
                 # Try up to 3 times (0s, 2s, 4s delay effectively)
-                for attempt in range(1, 4):
-                    pnl = self.stats_service.get_closed_pnl_by_order(symbol, order_id)
-                    if pnl is not None:
-                         break
-                    if attempt < 3:
-                        log.warning(f"PnL not ready for {symbol} (Attempt {attempt}/3). Retrying in 2s...")
-                        time.sleep(2.0)
+                with span(trace, "pnl"):
+                    for attempt in range(1, 4):
+                        pnl = self.stats_service.get_closed_pnl_by_order(symbol, order_id)
+                        if pnl is not None:
+                             break
+                        if attempt < 3:
+                            log.warning(f"PnL not ready for {symbol} (Attempt {attempt}/3). Retrying in 2s...")
+                            self.clock.sleep(2.0)
             
-            # 2. Determine Close Type
-            close_type = None
-            if stop_order_type == "TakeProfit": 
-                close_type = "TakeProfit"
-            elif stop_order_type == "StopLoss": 
-                close_type = "StopLoss"
-            elif stop_order_type == "TrailingStop":
-                close_type = "TrailingStop"
-            elif exec_type == "BustTrade": 
-                close_type = "Liquidation"
+            # 2. Determine Close Type (stopOrderType from trade data OR the order store)
+            close_type = self.order_store.close_type(order_id, trade_data.get("stopOrderType"), exec_type)
             
-            # --- FORCE REFRESH POSITIONS ---
-            try:
-                log.info("Refreshing positions via REST to ensure Footer accuracy...")
-                # Fetch fresh linear positions
-                fresh_positions = self.bybit_adapter.get_positions(category="linear")
-                if fresh_positions:
-                    for pos in fresh_positions:
-                        self.positions[pos.get("symbol")] = pos
-            except Exception as e:
-                log.error(f"Failed to refresh positions during execution flush: {e}")
+            # --- REFRESH POSITIONS ONLY IF THE STREAM IS BEHIND ---
+            if self.position_book.is_stale() and self.bybit_adapter:
+                try:
+                    log.info("Position stream is behind. Refreshing positions via REST for Footer accuracy...")
+                    with span(trace, "rest_refresh"):
+                        self._refresh_linear_positions()
+                except Exception as e:
+                    log.error(f"Failed to refresh positions during execution flush: {e}")
             # -------------------------------
 
-            self.notifier.send_order_filled(trade_data, pnl=pnl, positions=self.positions, close_type=close_type)
+            self.tracer.deliver(trace, self.notifier.send_order_filled, trade_data, pnl=pnl,
+                                positions=self.positions, close_type=close_type)
 
 
+    def _refresh_linear_positions(self):
+        """
+        Replaces the linear positions in the book with a REST snapshot over every configured
+        linear settle coin (the snapshot replaces the whole category, so one coin alone would
+        drop the others' positions). Raises if any coin fails, leaving the book untouched.
+        """
+        fresh_positions = []
+        for category, coin in self._settle_targets():
+            if category == "linear":
+                fresh_positions.extend(self.bybit_adapter.get_positions(category="linear", settleCoin=coin))
+        self.position_book.apply_snapshot(fresh_positions, category="linear")
+
+    def _reconcile_closed_pnl(self, symbol, order_id, local_pnl):
+        """Cross-checks a locally computed PnL against Bybit's closed-PnL record once it is published."""
+        time.sleep(self.PNL_RECONCILE_DELAY)
+        remote_pnl = self.stats_service.get_closed_pnl_by_order(symbol, order_id)
+        if remote_pnl is None:
+            log.info(f"PnL reconcile for {symbol} ({order_id}): no closed-PnL record yet, local {local_pnl:+.4f}")
+        elif abs(remote_pnl - local_pnl) > max(0.01, abs(remote_pnl) * 0.01):
+            log.warning(f"PnL reconcile mismatch for {symbol} ({order_id}): local {local_pnl:+.4f} vs Bybit {remote_pnl:+.4f}")
+        else:
+            sampled_log.info("pnl_reconcile_ok", f"PnL reconcile OK for {symbol} ({order_id}): {remote_pnl:+.4f}",
+                             extra={"symbol": symbol, "order_id": order_id})
+
     def _run_sync_delayed(self):
         time.sleep(3) 
         try:
@@ -319,175 +519,416 @@ class BybitMonitor:
             log.error(f"Auto-Sync failed: {e}")
 
     def _safe_float_compare(self, val1, val2):
-        """Helper to compare two price strings/floats/nones."""
-        try:
-            v1 = float(val1) if val1 and val1 != "" else 0.0
-            v2 = float(val2) if val2 and val2 != "" else 0.0
-            return abs(v1 - v2) > 0.000001 # Epsilon for checks
-        except:
-             return val1 != val2 # Fallback to string
+        """Helper to compare two prices (Decimals/strings/floats/nones); True if they differ."""
+        v1 = parse_decimal(val1)
+        v2 = parse_decimal(val2)
+        if v1 is None and val1 not in (None, "") or v2 is None and val2 not in (None, ""):
+            return val1 != val2 # Fallback to string
+        # Exact decimal compare; unset ("" / "0") counts as zero
+        return (v1 or ZERO) != (v2 or ZERO)
 
     def _on_position_update(self, message):
-        """Callback for position stream."""
+        """Callback for position stream. Conflates pushes per symbol (latest wins) for the worker."""
         data = message.get("data", [])
-        now = time.time()
+        is_snapshot = message.get("type") == "snapshot"
         
         for pos in data:
             symbol = pos.get("symbol")
+            if symbol:
+                self.position_queue.put(symbol, pos, is_snapshot=is_snapshot)
+
+    def _process_position_update(self, symbol, pos, is_snapshot=False):
+        """Runs on the conflation worker with the merged state of all pushes since the last drain."""
+        now = self.clock.time()
+        
+        # Apply to the position book (Merge to handle partial updates, drop out-of-order pushes)
+        current_pos_state = self.position_book.apply_update(pos, is_snapshot=is_snapshot)
+        if current_pos_state is None:
+            return
+        
+        # Use the FULL merged state for logic checks
+        self.pnl_engine.apply_position(current_pos_state)
+        
+        current_tp = current_pos_state.get("takeProfit", "") or ""
+        current_sl = current_pos_state.get("stopLoss", "") or ""
+        
+        last_state = self.last_position_state.get(symbol, {})
+        last_tp = last_state.get("tp", "") or ""
+        last_sl = last_state.get("sl", "") or ""
+        
+        # Initialize state if first run
+        if symbol not in self.last_position_state:
+            self.last_position_state[symbol] = {"tp": current_tp, "sl": current_sl}
+        else:
+            # Detect Change using Float Compare
+            changed_tp = self._safe_float_compare(current_pos_state.take_profit, last_tp)
+            changed_sl = self._safe_float_compare(current_pos_state.stop_loss, last_sl)
             
-            # Cache the latest position data (Merge to handle partial updates)
-            if symbol not in self.positions:
-                self.positions[symbol] = pos
-            else:
-                self.positions[symbol].update(pos)
-            
-            # Use the FULL merged state for logic checks
-            current_pos_state = self.positions[symbol]
-            
-            current_tp = current_pos_state.get("takeProfit", "") or ""
-            current_sl = current_pos_state.get("stopLoss", "") or ""
-            
-            last_state = self.last_position_state.get(symbol, {})
-            last_tp = last_state.get("tp", "") or ""
-            last_sl = last_state.get("sl", "") or ""
+            # Check Position Size (From merged state)
+            size = current_pos_state.size or ZERO
             
-            # Initialize state if first run
-            if symbol not in self.last_position_state:
-                self.last_position_state[symbol] = {"tp": current_tp, "sl": current_sl}
-            else:
-                # Detect Change using Float Compare
-                changed_tp = self._safe_float_compare(current_tp, last_tp)
-                changed_sl = self._safe_float_compare(current_sl, last_sl)
+            if changed_tp or changed_sl:
+                log.info(f"Position TP/SL Changed for {symbol}: TP {last_tp}->{current_tp}, SL {last_sl}->{current_sl}")
                 
-                # Check Position Size (From merged state)
-                size = float(current_pos_state.get("size", 0))
+                # Do NOT update last_position_state immediately (wait for debounce)
+                # This prevents transient glitches (A->B->A) from triggering a B->A notification
                 
-                if changed_tp or changed_sl:
-                    log.info(f"Position TP/SL Changed for {symbol}: TP {last_tp}->{current_tp}, SL {last_sl}->{current_sl}")
+                if size > 0:
+                    mod_data = {
+                        "symbol": symbol,
+                        "side": current_pos_state.get("side"),
+                        "orderType": "Position Update",
+                        "price": current_pos_state.get("entryPrice", "N/A"), 
+                        "takeProfit": current_tp,
+                        "stopLoss": current_sl,
+                        "triggerPrice": f"{current_sl} (SL) / {current_tp} (TP)" 
+                    }
                     
-                    # Do NOT update last_position_state immediately (wait for debounce)
-                    # This prevents transient glitches (A->B->A) from triggering a B->A notification
+                    # Implement Debounce: Cancel existing timer, start new one
+                    if symbol in self.position_update_timers:
+                         self.position_update_timers[symbol].cancel()
+                    trace = self.tracer.start("tpsl", symbol, None, current_pos_state.updated_time)
+                    
+                    # Define the delayed send function
+                    def delayed_send():
+                         log.info(f"Sending Debounced TP/SL Alert for {symbol}")
+                         if trace is not None:
+                             trace.begin("debounce_wait", at=trace.received)
+                             trace.end("debounce_wait")
+                         
+                         # Commit state ONLY when actually sending
+                         self.last_position_state[symbol] = {"tp": current_tp, "sl": current_sl}
+                         # Suppress redundant PnL update
+                         self.last_position_update[symbol] = self.clock.time()
+                         
+                         self.tracer.deliver(trace, self.notifier.send_order_modified, mod_data, positions=self.positions)
+                         self._state_changed()
+                         # Cleanup timer ref
+                         if symbol in self.position_update_timers:
+                             del self.position_update_timers[symbol]
+                    
+                    # Start 5s Timer
+                    timer = self.clock.timer(self.TPSL_DEBOUNCE_WINDOW, delayed_send)
+                    self.position_update_timers[symbol] = timer
+                    timer.start()
+                    
+                    # NOTE: removed immediate self.last_position_update setting here
                     
-                    if size > 0:
-                        mod_data = {
-                            "symbol": symbol,
-                            "side": current_pos_state.get("side"),
-                            "orderType": "Position Update",
-                            "price": current_pos_state.get("entryPrice", "N/A"), 
-                            "takeProfit": current_tp,
-                            "stopLoss": current_sl,
-                            "triggerPrice": f"{current_sl} (SL) / {current_tp} (TP)" 
-                        }
-                        
-                        # Implement Debounce: Cancel existing timer, start new one
-                        if symbol in self.position_update_timers:
-                             self.position_update_timers[symbol].cancel()
-                        
-                        # Define the delayed send function
-                        def delayed_send():
-                             log.info(f"Sending Debounced TP/SL Alert for {symbol}")
-                             
-                             # Commit state ONLY when actually sending
-                             self.last_position_state[symbol] = {"tp": current_tp, "sl": current_sl}
-                             # Suppress redundant PnL update
-                             self.last_position_update[symbol] = time.time()
-                             
-                             self.notifier.send_order_modified(mod_data, positions=self.positions)
-                             # Cleanup timer ref
-                             if symbol in self.position_update_timers:
-                                 del self.position_update_timers[symbol]
-                        
-                        # Start 5s Timer
-                        timer = threading.Timer(5.0, delayed_send)
-                        self.position_update_timers[symbol] = timer
-                        timer.start()
-                        
-                        # NOTE: removed immediate self.last_position_update setting here
-                        
-                    else:
-                        log.info(f"Suppressed TP/SL Alert for {symbol} because position is closed (Size=0).")
-
                 else:
-                    # No change detected vs Last Committed State.
-                    # If a timer is running, it means a transient change occurred but Reverted (A -> B -> A).
-                    if symbol in self.position_update_timers:
-                        log.info(f"TP/SL for {symbol} reverted to original state. Cancelling debounce timer.")
-                        self.position_update_timers[symbol].cancel()
-                        del self.position_update_timers[symbol]
+                    log.info(f"Suppressed TP/SL Alert for {symbol} because position is closed (Size=0).")
+
+            else:
+                # No change detected vs Last Committed State.
+                # If a timer is running, it means a transient change occurred but Reverted (A -> B -> A).
+                if symbol in self.position_update_timers:
+                    log.info(f"TP/SL for {symbol} reverted to original state. Cancelling debounce timer.")
+                    self.position_update_timers[symbol].cancel()
+                    del self.position_update_timers[symbol]
+        
+        # PnL Throttling Logic
+        last_time = self.last_position_update.get(symbol, 0)
+        if now - last_time >= self.UPDATE_COOLDOWN:
+            trace = self.tracer.start("position", symbol, None, current_pos_state.updated_time)
+            self.tracer.deliver(trace, self.notifier.send_position_update, current_pos_state)
+            self.last_position_update[symbol] = now
+        
+        self._state_changed()
+
+    @staticmethod
+    def _settle_targets():
+        """(category, settleCoin) pairs from MONITOR_SETTLE_COINS; one default shared with src/config.py."""
+        return parse_settle_targets(settings.get("monitor_settle_coins") or DEFAULT_MONITOR_SETTLE_COINS)
+
+    def _fetch_exchange_state(self):
+        """Fetches open positions (Category -> List) and active orders for every configured settle coin, concurrently."""
+        targets = self._settle_targets()
+        return StartupWarmup(self.bybit_adapter, targets).fetch()
+
+    def _apply_exchange_state(self, positions, orders):
+        """Makes a REST snapshot authoritative: position book, PnL engine, TP/SL baselines, cooldowns and orders."""
+        active_positions = []
+        for category, category_positions in positions.items():
+            # Only cache legitimate positions (Size > 0)
+            active = [p for p in map(Position.coerce, category_positions) if p.is_open]
+            self.position_book.apply_snapshot(active, category=category)
+            active_positions.extend(active)
+        
+        if not active_positions:
+            log.info("No active positions found.")
+        
+        now = self.clock.time()
+        for pos in active_positions:
+            symbol = pos.get("symbol")
+            log.info(f"Loaded Active Position: {symbol}, Size: {pos.get('size')}")
+            
+            self.pnl_engine.apply_position(pos)
+            
+            # Also Initialize Tracking State
+            self.last_position_state[symbol] = {
+                "tp": pos.get("takeProfit", "") or "", 
+                "sl": pos.get("stopLoss", "") or ""
+            }
             
-            # PnL Throttling Logic
-            last_time = self.last_position_update.get(symbol, 0)
-            if now - last_time >= self.UPDATE_COOLDOWN:
-                self.notifier.send_position_update(current_pos_state)
-                self.last_position_update[symbol] = now
+            # Initialize PnL cooldown to prevent immediate spam on restart (keep restored ones)
+            self.last_position_update.setdefault(symbol, now)
+        
+        log.info(f"Total {len(self.positions)} active positions loaded.")
+        
+        for order in orders:
+            self.order_store.observe(order)
+        self.order_store.set_known(order.get("orderId") for order in orders)
+        log.info(f"Loaded {len(orders)} active orders to ignore.")
+        
+        self._state_changed()
 
-    def start(self):
-        log.info("Starting Bybit Monitor (Custom WebSocket)...")
+    def _collect_state(self):
+        """State persisted across restarts."""
+        return {
+            "positions": {symbol: pos.to_dict() for symbol, pos in self.position_book.snapshot().items()},
+            "last_position_state": dict(self.last_position_state),
+            "last_position_update": dict(self.last_position_update),
+            "active_orders": self.order_store.known_ids(),
+        }
+
+    def _state_changed(self):
+        self.state_store.schedule_save(self._collect_state)
+
+    def _restore_state(self, snapshot):
+        """Loads a persisted snapshot. The book stays marked stale until REST reconciliation completes."""
+        positions = snapshot.get("positions", {})
+        self.position_book.apply_snapshot(positions.values())
+        self.position_book.mark_disconnected()
+        for pos in positions.values():
+            self.pnl_engine.apply_position(pos)
         
-        # Auto-Sync on Startup
-        if self.sync_service:
-             log.info("Triggering background sync to catch up on any missing records...")
-             threading.Thread(target=self.sync_service.run_sync, kwargs={"silent": False}, daemon=True).start()
+        self.last_position_state.update(snapshot.get("last_position_state", {}))
+        self.last_position_update.update(snapshot.get("last_position_update", {}))
+        active_orders = snapshot.get("active_orders", [])
+        self.order_store.add_known(active_orders)
         
-        # Prefetch Initial Positions via REST API to warm the cache
+        age = time.time() - snapshot.get("saved_at", 0)
+        log.info(f"Restored monitor state from {self.state_store.path} (age {age:.0f}s): "
+                 f"{len(positions)} positions, {len(active_orders)} active orders.")
+
+    def _reconcile_restored_state(self):
+        """Background: diffs the restored snapshot against REST, applies REST, then runs the catch-up sync."""
         try:
-            log.info("Fetching initial open positions (Scanning Linear & Inverse)...")
+            before_positions = self.position_book.snapshot()
+            before_tpsl = dict(self.last_position_state)
+            before_orders = set(self.order_store.known_ids())
+            
+            positions, orders = self._fetch_exchange_state()
             
-            # 1. Fetch Linear (USDT/USDC Perps)
-            positions_linear = self.bybit_adapter.get_positions(category="linear", settleCoin="USDT")
+            after_positions = {
+                p.get("symbol"): p for category_positions in positions.values()
+                for p in category_positions if float(p.get("size", 0)) > 0
+            }
+            after_orders = {order.get("orderId") for order in orders if order.get("orderId")}
+            
+            changes = []
+            for symbol in sorted(after_positions.keys() - before_positions.keys()):
+                changes.append(f"opened {symbol}")
+            for symbol in sorted(before_positions.keys() - after_positions.keys()):
+                changes.append(f"closed {symbol}")
+            for symbol in sorted(after_positions.keys() & before_positions.keys()):
+                old, new = before_positions[symbol], after_positions[symbol]
+                if self._safe_float_compare(old.get("size"), new.get("size")):
+                    changes.append(f"resized {symbol} {old.get('size')}->{new.get('size')}")
+                old_tpsl = before_tpsl.get(symbol, {})
+                if (self._safe_float_compare(old_tpsl.get("tp"), new.get("takeProfit"))
+                        or self._safe_float_compare(old_tpsl.get("sl"), new.get("stopLoss"))):
+                    changes.append(f"TP/SL {symbol}")
+            if after_orders - before_orders:
+                changes.append(f"{len(after_orders - before_orders)} orders placed")
+            if before_orders - after_orders:
+                changes.append(f"{len(before_orders - after_orders)} orders gone")
+            
+            if changes:
+                log.info(f"Reconciled restored state against REST. Changes while offline: {', '.join(changes)}")
+            else:
+                log.info("Reconciled restored state against REST. No changes while offline.")
             
-            # 2. Fetch Inverse (Coin-Margined) - Try BTC/ETH or handle gracefully
-            positions_inverse = []
+            self._apply_exchange_state(positions, orders)
+        except Exception as e:
+            log.error(f"Failed to reconcile restored state: {e}")
+        
+        # Auto-Sync after reconciliation so both don't compete for the rate budget
+        if self.sync_service:
             try:
-                positions_inverse = self.bybit_adapter.get_positions(category="inverse", settleCoin="BTC")
+                self.sync_service.run_sync(silent=False)
             except Exception as e:
-                log.warning(f"Could not fetch Inverse positions (BTC): {e}")
+                log.error(f"Auto-Sync failed: {e}")
+
+    def _start_gap_reconciliation(self):
+        """Starts reconciling the pending gap unless a reconciliation is already running (it picks the gap up)."""
+        with self._gap_lock:
+            if self._gap_running or not self._gap_window:
+                return
+            self._gap_running = True
+        threading.Thread(target=self._run_gap_reconciliation, daemon=True).start()
+
+    def _run_gap_reconciliation(self):
+        """
+        Background: reconciles the pending gap until none is left. A reconnect during a run
+        widens the window and the loop reconciles it again; held live events are released
+        only when no gap is pending. If the socket is down when a run ends, the hold stays
+        and the next subscribe ack starts a new run.
+        """
+        window = None
+        release = False
+        try:
+            while True:
+                with self._gap_lock:
+                    pending = self._gap_window
+                    if pending is not None and pending != window and self._disconnected_at is None:
+                        window = pending  # New, or widened by a reconnect during the last run
+                    else:
+                        if pending is not None and pending == window and self._disconnected_at is None:
+                            # Reconciled and still connected: nothing pending any more
+                            self._gap_window = None
+                            self._gap_held = False
+                            release = True
+                        # Under the same lock as the check, so a gap opened from here on starts a new run
+                        self._gap_running = False
+                        break
+                self._reconcile_gap(window)
+        except BaseException:
+            with self._gap_lock:
+                self._gap_running = False
+            raise
+        if release:
+            self._release_events()
+
+    def _reconcile_gap(self, gap_window):
+        """
+        Fetches what happened during `gap_window` and re-emits only the missed events
+        (order final states, new orders, executions, TP/SL changes) through the normal
+        handlers. Called by _run_gap_reconciliation, which releases the held live events.
+        """
+        gap_start, gap_end = gap_window
+        since = gap_start - self.GAP_MARGIN_MS
+        log.info(f"Reconciling events missed while offline ({(gap_end - gap_start) / 1000:.1f}s gap)...")
+        try:
+            targets = self._settle_targets()
+            warmup = StartupWarmup(self.bybit_adapter, targets)
+            missed_orders, missed_execs = [], []
             
-            initial_positions = positions_linear + positions_inverse
+            # 1. Orders that reached a final state while offline (only ones we were tracking)
+            for category, coin in warmup.order_targets():
+                try:
+                    for order in self.bybit_adapter.get_order_history(category, start_time=since, settleCoin=coin):
+                        if (self.order_store.is_known(order.get("orderId"))
+                                and order.get("orderStatus") in ["Cancelled", "Deactivated", "Filled"]
+                                and int(order.get("updatedTime") or 0) < gap_end):
+                            missed_orders.append(order)
+                except Exception as e:
+                    log.warning(f"Could not fetch {category} order history for gap: {e}")
             
-            if not initial_positions:
-                 log.info("No active positions found on startup.")
+            # 2. Executions not seen live
+            for category in sorted({category for category, _ in targets}):
+                try:
+                    for trade in self.bybit_adapter.get_executions(category, start_time=since):
+                        if (trade.get("execType") != "Funding"
+                                and trade.get("execId") not in self.seen_exec_ids
+                                and int(trade.get("execTime") or 0) < gap_end):
+                            trade.setdefault("category", category)
+                            missed_execs.append(trade)
+                except Exception as e:
+                    log.warning(f"Could not fetch {category} executions for gap: {e}")
             
-            for pos in initial_positions:
-                symbol = pos.get("symbol")
-                size = float(pos.get("size", 0))
-                
-                # Only cache legitimate positions (Size > 0)
-                if size > 0:
-                    log.info(f"Loaded Active Position: {symbol}, Size: {size}")
-                    
-                    # Store full position data
-                    self.positions[symbol] = pos
-                    
-                    # Also Initialize Tracking State
-                    self.last_position_state[symbol] = {
-                        "tp": pos.get("takeProfit", "") or "", 
-                        "sl": pos.get("stopLoss", "") or ""
-                    }
-                    
-                    # Initialize PnL cooldown to prevent immediate spam on restart
-                    self.last_position_update[symbol] = time.time()
-                    
-            log.info(f"Total {len(self.positions)} active positions loaded.")
+            # 3. Current positions and open orders
+            positions, orders = warmup.fetch()
+            new_orders = [
+                order for order in orders
+                if not self.order_store.is_known(order.get("orderId"))
+                and since <= int(order.get("createdTime") or 0) < gap_end
+                and not order.get("reduceOnly") and not order.get("closeOnTrigger")
+                and not order.get("stopOrderType")
+            ]
             
-            # Prefetch Active Orders to prevent Ghost Signals
-            log.info("Fetching active orders to prevent ghost signals...")
-            active_orders_linear = self.bybit_adapter.get_active_orders(category="linear", settleCoin="USDT")
-            active_orders_inverse = []
-            try:
-                active_orders_inverse = self.bybit_adapter.get_active_orders(category="inverse", settleCoin="BTC")
-            except Exception as e:
-                log.warning(f"Could not fetch Inverse active orders (BTC): {e}")
+            log.info(f"Gap reconciliation: {len(missed_orders)} order updates, {len(new_orders)} new orders, "
+                     f"{len(missed_execs)} executions missed.")
             
-            all_active = active_orders_linear + active_orders_inverse
-            for order in all_active:
-                self.active_orders.add(order.get("orderId"))
+            missed_orders.sort(key=lambda o: int(o.get("updatedTime") or 0))
+            if missed_orders:
+                self._on_order_update({"data": missed_orders})
+            if new_orders:
+                self._on_order_update({"data": sorted(new_orders, key=lambda o: int(o.get("createdTime") or 0))})
+            if missed_execs:
+                missed_execs.sort(key=lambda t: int(t.get("execTime") or 0))
+                self._on_execution_update({"data": missed_execs})
             
-            log.info(f"Loaded {len(self.active_orders)} active orders to ignore.")
+            # Orders no longer open were closed while offline; anything open is known from now on
+            for order in orders:
+                self.order_store.observe(order)
+            self.order_store.set_known(order.get("orderId") for order in orders)
             
+            # Positions go through the normal pipeline so missed TP/SL changes are reported once
+            was_open = {
+                symbol for symbol, pos in self.position_book.snapshot().items()
+                if float(pos.get("size") or 0) > 0
+            }
+            open_symbols = set()
+            for category, category_positions in positions.items():
+                active = [p for p in category_positions if float(p.get("size", 0)) > 0]
+                self.position_book.apply_snapshot(active, category=category)
+                for pos in active:
+                    open_symbols.add(pos.get("symbol"))
+                    self.position_queue.put(pos.get("symbol"), pos, is_snapshot=True)
+            for symbol in was_open - open_symbols:
+                # Closed while offline
+                self.position_queue.put(symbol, {"symbol": symbol, "size": "0", "side": ""})
+            
+            self._state_changed()
+        except Exception as e:
+            log.error(f"Failed to reconcile reconnect gap: {e}")
+
+    def _cold_start_warmup(self):
+        """Background: loads the REST snapshot while the socket connects, then releases buffered events."""
+        try:
+            positions, orders = self._fetch_exchange_state()
+            self._apply_exchange_state(positions, orders)
         except Exception as e:
             log.error(f"Failed to fetch initial state: {e}")
-            
+        finally:
+            self._release_events()
+        
+        # Auto-Sync on Startup, once the snapshot no longer needs the rate budget
+        if self.sync_service:
+            log.info("Triggering background sync to catch up on any missing records...")
+            try:
+                self.sync_service.run_sync(silent=False)
+            except Exception as e:
+                log.error(f"Auto-Sync failed: {e}")
+
+    def stop(self):
+        """Stops the reconnect loop and persists the current state."""
+        self.keep_running = False
+        self.position_queue.stop()
+        if self.ws:
+            self.ws.close()
+        self.state_store.flush()
+
+    def start(self):
+        log.info("Starting Bybit Monitor (Custom WebSocket)...")
+        if settings.get("metrics_port"):
+            try:
+                metrics.start_metrics_server(int(settings["metrics_port"]))
+            except (OSError, ValueError) as e:
+                log.error(f"Could not start the metrics endpoint: {e}")
+        POSITION_QUEUE_DEPTH.set_function(lambda: self.position_queue.stats()["pending"])
+        self.position_queue.start()
+        
+        snapshot = self.state_store.load()
+        if snapshot:
+            # Warm start: connect right away, reconcile against REST in the background
+            self._restore_state(snapshot)
+            threading.Thread(target=self._reconcile_restored_state, daemon=True).start()
+        else:
+            # Cold start: warm the cache via REST in parallel with connecting; stream events wait for it
+            self._hold_events()
+            threading.Thread(target=self._cold_start_warmup, daemon=True).start()
+        
         self.ws = websocket.WebSocketApp(
             self.ws_url,
             on_open=self.on_open,
@@ -499,14 +940,23 @@ class BybitMonitor:
         while self.keep_running:
             try:
                 self.ws.run_forever()
-                log.info("Reconnecting in 5 seconds...")
-                time.sleep(5)
+                if not self.keep_running:
+                    break
+                delay = self.backoff.next_delay()
+                log.info(f"Reconnecting in {delay:.1f} seconds (attempt {self.backoff.attempt})...")
+                time.sleep(delay)
             except KeyboardInterrupt:
                 self.keep_running = False
                 break
             except Exception as e:
                 log.error(f"WebSocket crashed: {e}")
-                time.sleep(5)
+                time.sleep(self.backoff.next_delay())
+        
+        # Persist state at shutdown
+        self.state_store.flush()
+        if self.journal:
+            self.journal.close()
+        self.tracer.close()
 
 if __name__ == "__main__":
     monitor = BybitMonitor()
@@ -0,0 +1,577 @@
+# src/sandbox/fake_bybit.py
+"""
+Local stand-in for the Bybit v5 REST API and private WebSocket, for load tests.
+
+Serves the REST endpoints BybitAdapter uses and the private stream (auth, subscribe,
+ping, topics order/execution/position) on a single port. A background simulator
+trades a few symbols and can inject fill storms, rate-limit responses and
+connection drops at configurable rates. REST and stream share the same state, so
+the sync and the monitor see a consistent account.
+
+Usage:
+    python -m src.sandbox.fake_bybit --port 8081 --fill-rate 2 --storm-every 60 --storm-size 200
+
+Then point the services at it:
+    BYBIT_BASE_URL=http://127.0.0.1:8081
+    BYBIT_WS_URL=ws://127.0.0.1:8081/v5/private
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import itertools
+import json
+import random
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from ..utils.logger import log
+
+WS_MAGIC = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+DEFAULT_SYMBOLS = {"BTCUSDT": 60000.0, "ETHUSDT": 3000.0, "SOLUSDT": 150.0, "XRPUSDT": 0.6}
+TAKER_FEE_RATE = 0.00055
+HISTORY_LIMIT = 100000  # Per record type; oldest records are dropped beyond this
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class FakeExchange:
+    """
+    In-memory account: positions, orders, executions, closed PnL and the transaction log.
+    Every mutation is also published to connected stream sessions.
+    """
+
+    def __init__(self, symbols: Optional[Dict[str, float]] = None, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.prices = dict(symbols or DEFAULT_SYMBOLS)
+        self.lock = threading.Lock()
+        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.order_log = deque(maxlen=HISTORY_LIMIT)
+        self.executions = deque(maxlen=HISTORY_LIMIT)
+        self.closed_pnl = deque(maxlen=HISTORY_LIMIT)
+        self.transactions = deque(maxlen=HISTORY_LIMIT)
+        self.sessions = set()
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+
+    def _id(self, prefix: str) -> str:
+        return f"{prefix}-{next(self._ids):010d}"
+
+    def publish(self, topic: str, data: List[Dict[str, Any]]):
+        frame = json.dumps({
+            "id": self._id("msg"),
+            "topic": topic,
+            "creationTime": _now_ms(),
+            "data": data,
+        })
+        for session in list(self.sessions):
+            session.push(topic, frame)
+
+    # --- Simulation -------------------------------------------------------
+
+    def tick_prices(self):
+        with self.lock:
+            for symbol, price in self.prices.items():
+                self.prices[symbol] = max(price * (1 + self.rng.gauss(0, 0.0005)), 1e-6)
+            updates = [self._refresh_position(symbol) for symbol in list(self.positions)]
+        if updates:
+            self.publish("position", updates)
+
+    def _refresh_position(self, symbol: str) -> Dict[str, Any]:
+        pos = self.positions[symbol]
+        mark = self.prices[symbol]
+        size = float(pos["size"])
+        direction = 1 if pos["side"] == "Buy" else -1
+        entry = float(pos["entryPrice"] or 0)
+        pos.update({
+            "markPrice": f"{mark:.6f}",
+            "positionValue": f"{size * entry:.4f}",
+            "unrealisedPnl": f"{(mark - entry) * size * direction:.6f}",
+            "seq": next(self._seq),
+            "updatedTime": str(_now_ms()),
+        })
+        return dict(pos)
+
+    def trade(self, fills: int = 1, stop_type: str = ""):
+        """Opens, adds to or closes a position with one order filled in `fills` parts."""
+        with self.lock:
+            symbol = self.rng.choice(list(self.prices))
+            price = self.prices[symbol]
+            pos = self.positions.get(symbol)
+            if pos and self.rng.random() < 0.5:
+                side = "Sell" if pos["side"] == "Buy" else "Buy"
+                qty = float(pos["size"])
+                reduce_only = True
+            else:
+                side = pos["side"] if pos else self.rng.choice(("Buy", "Sell"))
+                qty = round(self.rng.uniform(1, 10) * 100 / price, 6) or 0.001
+                reduce_only = False
+                stop_type = ""
+
+            now = _now_ms()
+            order = {
+                "orderId": self._id("ord"), "orderLinkId": "", "symbol": symbol, "side": side,
+                "orderType": "Market", "price": "0", "qty": str(qty), "leavesQty": str(qty),
+                "cumExecQty": "0", "avgPrice": "", "orderStatus": "New", "stopOrderType": stop_type,
+                "triggerPrice": "0", "takeProfit": "", "stopLoss": "", "reduceOnly": reduce_only,
+                "closeOnTrigger": reduce_only, "category": "linear", "positionIdx": 0,
+                "createdTime": str(now), "updatedTime": str(now),
+            }
+            self.orders[order["orderId"]] = order
+            self.order_log.append(dict(order))
+        self.publish("order", [dict(order)])
+
+        remaining = qty
+        for index in range(fills):
+            part = remaining if index == fills - 1 else round(qty / fills, 6)
+            remaining = round(remaining - part, 6)
+            if part <= 0:
+                continue
+            self._fill(order, part)
+
+        with self.lock:
+            order.update({"orderStatus": "Filled", "leavesQty": "0", "updatedTime": str(_now_ms())})
+            self.orders.pop(order["orderId"], None)
+            self.order_log.append(dict(order))
+        self.publish("order", [dict(order)])
+
+    def _fill(self, order: Dict[str, Any], qty: float):
+        with self.lock:
+            symbol = order["symbol"]
+            price = self.prices[symbol]
+            fee = qty * price * TAKER_FEE_RATE
+            pos = self.positions.get(symbol)
+            closed_size = 0.0
+            pnl = None
+            if pos and pos["side"] != order["side"]:
+                closed_size = min(qty, float(pos["size"]))
+                entry = float(pos["entryPrice"])
+                direction = 1 if pos["side"] == "Buy" else -1
+                pnl = (price - entry) * closed_size * direction - fee
+                left = round(float(pos["size"]) - closed_size, 6)
+                if left <= 0:
+                    self.positions.pop(symbol)
+                    flat = dict(pos, side="", size="0", positionValue="0", unrealisedPnl="0",
+                                seq=next(self._seq), updatedTime=str(_now_ms()))
+                    position_update = flat
+                else:
+                    pos["size"] = str(left)
+                    position_update = self._refresh_position(symbol)
+            else:
+                if pos is None:
+                    pos = {"symbol": symbol, "side": order["side"], "size": "0", "entryPrice": "0",
+                           "avgPrice": "0", "category": "linear", "positionIdx": 0, "leverage": "10",
+                           "takeProfit": "", "stopLoss": "", "tpslMode": "Full", "positionStatus": "Normal",
+                           "createdTime": str(_now_ms())}
+                    self.positions[symbol] = pos
+                size = float(pos["size"])
+                entry = (size * float(pos["entryPrice"]) + qty * price) / (size + qty)
+                pos.update({"size": str(round(size + qty, 6)), "entryPrice": f"{entry:.6f}", "avgPrice": f"{entry:.6f}"})
+                position_update = self._refresh_position(symbol)
+
+            order["cumExecQty"] = str(round(float(order["cumExecQty"]) + qty, 6))
+            order["leavesQty"] = str(max(round(float(order["qty"]) - float(order["cumExecQty"]), 6), 0))
+            order["avgPrice"] = f"{price:.6f}"
+            if float(order["leavesQty"]) > 0:
+                order["orderStatus"] = "PartiallyFilled"
+
+            now = _now_ms()
+            execution = {
+                "execId": self._id("exe"), "orderId": order["orderId"], "orderLinkId": "", "symbol": symbol,
+                "side": order["side"], "orderType": "Market", "stopOrderType": order["stopOrderType"],
+                "execType": "Trade", "execQty": str(qty), "execPrice": f"{price:.6f}",
+                "execValue": f"{qty * price:.6f}", "execFee": f"{fee:.8f}", "feeRate": str(TAKER_FEE_RATE),
+                "closedSize": str(closed_size), "isMaker": False, "category": "linear",
+                "execTime": str(now), "seq": next(self._seq),
+            }
+            self.executions.append(execution)
+            self.transactions.append({
+                "id": self._id("txn"), "symbol": symbol, "category": "linear", "side": order["side"],
+                "type": "TRADE", "qty": str(qty), "size": position_update.get("size", "0"),
+                "tradePrice": f"{price:.6f}", "fee": f"{fee:.8f}",
+                # Cash change: realised PnL net of the fee on closes, just the fee on opens
+                "change": f"{pnl if pnl is not None else -fee:.8f}",
+                "cashFlow": "0", "currency": "USDT", "orderId": order["orderId"], "tradeId": execution["execId"],
+                "transactionTime": str(now),
+            })
+            if pnl is not None:
+                self.closed_pnl.append({
+                    "symbol": symbol, "orderId": order["orderId"], "side": order["side"], "qty": str(closed_size),
+                    "orderPrice": "0", "orderType": "Market", "execType": "Trade", "closedSize": str(closed_size),
+                    "cumEntryValue": f"{closed_size * entry:.6f}", "avgEntryPrice": f"{entry:.6f}",
+                    "cumExitValue": f"{closed_size * price:.6f}", "avgExitPrice": f"{price:.6f}",
+                    "closedPnl": f"{pnl:.8f}", "fillCount": "1", "leverage": "10",
+                    "createdTime": str(now), "updatedTime": str(now),
+                })
+            order_update = dict(order)
+        self.publish("execution", [execution])
+        self.publish("position", [position_update])
+        if order_update["orderStatus"] == "PartiallyFilled":
+            self.publish("order", [order_update])
+
+
+class Simulator(threading.Thread):
+    """Drives FakeExchange: steady fills, periodic fill storms and price ticks."""
+
+    def __init__(self, exchange: FakeExchange, fill_rate: float = 1.0, fills_per_order: int = 3,
+                 storm_every: float = 0.0, storm_size: int = 100, tick_interval: float = 1.0):
+        super().__init__(daemon=True, name="FakeBybitSimulator")
+        self.exchange = exchange
+        self.fill_rate = fill_rate
+        self.fills_per_order = fills_per_order
+        self.storm_every = storm_every
+        self.storm_size = storm_size
+        self.tick_interval = tick_interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        rng = self.exchange.rng
+        next_tick = time.time()
+        next_storm = time.time() + self.storm_every if self.storm_every > 0 else None
+        next_trade = time.time()
+        while not self.stopped.is_set():
+            now = time.time()
+            if now >= next_tick:
+                self.exchange.tick_prices()
+                next_tick = now + self.tick_interval
+            if next_storm is not None and now >= next_storm:
+                log.info(f"Fake Bybit: fill storm of {self.storm_size} orders")
+                for _ in range(self.storm_size):
+                    self.exchange.trade(fills=self.fills_per_order,
+                                        stop_type=rng.choice(("", "", "TakeProfit", "StopLoss")))
+                next_storm = now + self.storm_every
+            if self.fill_rate > 0 and now >= next_trade:
+                self.exchange.trade(fills=rng.randint(1, self.fills_per_order),
+                                    stop_type=rng.choice(("", "", "TakeProfit", "StopLoss")))
+                next_trade = now + rng.expovariate(self.fill_rate)
+            self.stopped.wait(0.01)
+
+
+class _StreamSession:
+    """One private-stream connection: frame I/O and topic fan-out."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.topics = set()
+        self.authed = False
+        self._send_lock = threading.Lock()
+        self.closed = False
+
+    def push(self, topic: str, frame: str):
+        if self.authed and topic in self.topics:
+            self.send_text(frame)
+
+    def send_text(self, text: str):
+        self._send(0x1, text.encode("utf-8"))
+
+    def _send(self, opcode: int, payload: bytes):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([length])
+        elif length < 65536:
+            header += bytes([126]) + struct.pack("!H", length)
+        else:
+            header += bytes([127]) + struct.pack("!Q", length)
+        with self._send_lock:
+            if self.closed:
+                return
+            try:
+                self.sock.sendall(header + payload)
+            except OSError:
+                self.closed = True
+
+    def _read_exact(self, count: int) -> bytes:
+        data = b""
+        while len(data) < count:
+            chunk = self.sock.recv(count - len(data))
+            if not chunk:
+                raise ConnectionError("client closed")
+            data += chunk
+        return data
+
+    def read_frame(self):
+        """Returns (opcode, payload) of the next client frame."""
+        first, second = self._read_exact(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self._read_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self._read_exact(8))[0]
+        mask = self._read_exact(4) if second & 0x80 else b"\x00\x00\x00\x00"
+        payload = bytearray(self._read_exact(length))
+        for i in range(length):
+            payload[i] ^= mask[i % 4]
+        return opcode, bytes(payload)
+
+    def drop(self):
+        """Closes the TCP connection without a close frame (simulated network failure)."""
+        with self._send_lock:
+            self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class FakeBybitServer(ThreadingHTTPServer):
+    """HTTP server holding the exchange and the fault-injection settings."""
+
+    daemon_threads = True
+
+    def __init__(self, address, exchange: FakeExchange, api_key: str, api_secret: str,
+                 rate_limit_prob: float = 0.0, disconnect_every: float = 0.0, latency: float = 0.0):
+        super().__init__(address, _Handler)
+        self.exchange = exchange
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.rate_limit_prob = rate_limit_prob
+        self.disconnect_every = disconnect_every
+        self.latency = latency
+        self.requests = 0
+        self.rate_limited = 0
+
+
+def _paginate(records: List[Dict[str, Any]], params: Dict[str, str], max_limit: int = 1000) -> Dict[str, Any]:
+    """Cursor pagination: the cursor is the offset into the (newest first) result list."""
+    try:
+        limit = min(max(int(params.get("limit", 50)), 1), max_limit)
+        offset = int(params.get("cursor") or 0)
+    except ValueError:
+        limit, offset = 50, 0
+    page = records[offset:offset + limit]
+    next_cursor = str(offset + limit) if offset + limit < len(records) else ""
+    return {"category": params.get("category", ""), "list": page, "nextPageCursor": next_cursor}
+
+
+def _in_window(records, time_key: str, params: Dict[str, str], default_days: int = 7):
+    end = int(params.get("endTime") or _now_ms())
+    start = int(params.get("startTime") or end - default_days * 86400 * 1000)
+    return [r for r in records if start <= int(r[time_key]) <= end]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeBybitServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, payload: Dict[str, Any], status: int = 200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, code: int, message: str):
+        self._reply({"retCode": code, "retMsg": message, "result": {}, "time": _now_ms()})
+
+    def _authorized(self, query: str) -> bool:
+        key = self.headers.get("X-BAPI-API-KEY", "")
+        timestamp = self.headers.get("X-BAPI-TIMESTAMP", "")
+        recv_window = self.headers.get("X-BAPI-RECV-WINDOW", "5000")
+        expected = hmac.new(self.server.api_secret.encode("utf-8"),
+                            f"{timestamp}{key}{recv_window}{query}".encode("utf-8"), hashlib.sha256).hexdigest()
+        return key == self.server.api_key and hmac.compare_digest(expected, self.headers.get("X-BAPI-SIGN", ""))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/v5/private" and self.headers.get("Upgrade", "").lower() == "websocket":
+            self._serve_stream()
+            return
+
+        server = self.server
+        server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+        if not self._authorized(url.query):
+            self._error(10004, "error sign!")
+            return
+        if server.rate_limit_prob and server.exchange.rng.random() < server.rate_limit_prob:
+            server.rate_limited += 1
+            self._error(10006, "Too many visits!")
+            return
+
+        params = dict(parse_qsl(url.query))
+        route = ROUTES.get(url.path)
+        if route is None:
+            self._reply({"retCode": 10001, "retMsg": f"unknown path {url.path}", "result": {}}, status=404)
+            return
+        with server.exchange.lock:
+            result = route(server.exchange, params)
+        self._reply({"retCode": 0, "retMsg": "OK", "result": result, "retExtInfo": {}, "time": _now_ms()})
+
+    # --- Private stream ---------------------------------------------------
+
+    def _serve_stream(self):
+        key = self.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WS_MAGIC).encode("ascii")).digest()).decode("ascii")
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+
+        server = self.server
+        session = _StreamSession(self.connection)
+        server.exchange.sessions.add(session)
+        killer = None
+        if server.disconnect_every > 0:
+            killer = threading.Timer(server.exchange.rng.expovariate(1 / server.disconnect_every), session.drop)
+            killer.daemon = True
+            killer.start()
+        try:
+            while not session.closed:
+                opcode, payload = session.read_frame()
+                if opcode == 0x8:
+                    session._send(0x8, payload[:2])
+                    break
+                if opcode == 0x9:
+                    session._send(0xA, payload)
+                    continue
+                if opcode == 0x1:
+                    self._on_stream_request(session, payload.decode("utf-8"))
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            if killer:
+                killer.cancel()
+            server.exchange.sessions.discard(session)
+            session.closed = True
+            self.close_connection = True
+
+    def _on_stream_request(self, session: _StreamSession, text: str):
+        try:
+            request = json.loads(text)
+        except ValueError:
+            return
+        op = request.get("op")
+        reply = {"req_id": request.get("req_id", ""), "op": op, "conn_id": str(id(session))}
+        if op == "auth":
+            try:
+                key, expires, signature = request.get("args", [])[:3]
+            except ValueError:
+                key, expires, signature = "", "0", ""
+            expected = hmac.new(self.server.api_secret.encode("utf-8"),
+                                f"GET/realtime{expires}".encode("utf-8"), hashlib.sha256).hexdigest()
+            session.authed = key == self.server.api_key and hmac.compare_digest(expected, str(signature)) \
+                and int(expires) > _now_ms()
+            reply.update({"success": session.authed, "ret_msg": "" if session.authed else "Params Error"})
+        elif op == "subscribe":
+            session.topics.update(request.get("args", []))
+            reply.update({"success": session.authed, "ret_msg": ""})
+        elif op == "ping":
+            reply.update({"success": True, "ret_msg": "pong", "op": "pong"})
+        else:
+            reply.update({"success": False, "ret_msg": f"unknown op {op}"})
+        session.send_text(json.dumps(reply))
+
+
+# --- REST routes (called with the exchange lock held) --------------------
+
+def _positions(exchange: FakeExchange, params):
+    records = [dict(p) for p in exchange.positions.values()
+               if params.get("settleCoin", "USDT") == "USDT" or p["symbol"].endswith(params.get("settleCoin", ""))]
+    return _paginate(records, params, max_limit=200)
+
+
+def _open_orders(exchange: FakeExchange, params):
+    records = [dict(o) for o in exchange.orders.values() if not params.get("symbol") or o["symbol"] == params["symbol"]]
+    return _paginate(records, params, max_limit=50)
+
+
+def _order_history(exchange: FakeExchange, params):
+    return _paginate(list(reversed(_in_window(exchange.order_log, "updatedTime", params))), params, max_limit=50)
+
+
+def _executions(exchange: FakeExchange, params):
+    return _paginate(list(reversed(_in_window(exchange.executions, "execTime", params))), params, max_limit=100)
+
+
+def _closed_pnl(exchange: FakeExchange, params):
+    return _paginate(list(reversed(_in_window(exchange.closed_pnl, "updatedTime", params))), params, max_limit=100)
+
+
+def _transaction_log(exchange: FakeExchange, params):
+    return _paginate(list(reversed(_in_window(exchange.transactions, "transactionTime", params))), params, max_limit=50)
+
+
+def _wallet_balance(exchange: FakeExchange, params):
+    unrealised = sum(float(p.get("unrealisedPnl") or 0) for p in exchange.positions.values())
+    realised = sum(float(r["closedPnl"]) for r in exchange.closed_pnl)
+    equity = 10000 + realised + unrealised
+    return {"list": [{
+        "accountType": params.get("accountType", "UNIFIED"),
+        "totalEquity": f"{equity:.4f}",
+        "totalWalletBalance": f"{10000 + realised:.4f}",
+        "totalPerpUPL": f"{unrealised:.4f}",
+        "coin": [{"coin": "USDT", "equity": f"{equity:.4f}", "walletBalance": f"{10000 + realised:.4f}",
+                  "unrealisedPnl": f"{unrealised:.4f}", "cumRealisedPnl": f"{realised:.4f}"}],
+    }]}
+
+
+def _sub_members(exchange: FakeExchange, params):
+    return {"subMembers": []}
+
+
+ROUTES = {
+    "/v5/position/list": _positions,
+    "/v5/order/realtime": _open_orders,
+    "/v5/order/history": _order_history,
+    "/v5/execution/list": _executions,
+    "/v5/position/closed-pnl": _closed_pnl,
+    "/v5/account/transaction-log": _transaction_log,
+    "/v5/account/wallet-balance": _wallet_balance,
+    "/v5/user/query-sub-members": _sub_members,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Bybit v5 REST + private WebSocket server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--api-key", default="test-key", help="Key the clients must sign with")
+    parser.add_argument("--api-secret", default="test-secret")
+    parser.add_argument("--fill-rate", type=float, default=1.0, help="Orders filled per second (steady state)")
+    parser.add_argument("--fills-per-order", type=int, default=3, help="Max partial fills per order")
+    parser.add_argument("--storm-every", type=float, default=0.0, help="Seconds between fill storms (0 = off)")
+    parser.add_argument("--storm-size", type=int, default=100, help="Orders per fill storm")
+    parser.add_argument("--tick-interval", type=float, default=1.0, help="Seconds between mark-price position updates")
+    parser.add_argument("--rate-limit-prob", type=float, default=0.0, help="Share of REST calls answered with retCode 10006")
+    parser.add_argument("--disconnect-every", type=float, default=0.0, help="Mean seconds between stream drops (0 = off)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Added REST latency in seconds")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    exchange = FakeExchange(seed=args.seed)
+    server = FakeBybitServer((args.host, args.port), exchange, args.api_key, args.api_secret,
+                             rate_limit_prob=args.rate_limit_prob, disconnect_every=args.disconnect_every,
+                             latency=args.latency)
+    simulator = Simulator(exchange, fill_rate=args.fill_rate, fills_per_order=args.fills_per_order,
+                          storm_every=args.storm_every, storm_size=args.storm_size, tick_interval=args.tick_interval)
+    simulator.start()
+    log.info(f"Fake Bybit listening on http://{args.host}:{args.port} (stream at ws://{args.host}:{args.port}/v5/private)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stopped.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
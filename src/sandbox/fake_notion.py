@@ -0,0 +1,351 @@
+# src/sandbox/fake_notion.py
+"""
+Local stand-in for the parts of the Notion API that NotionClient uses, for throughput benchmarks.
+
+Emulates POST /v1/databases/{id}/query (filters, sorts, cursors), POST /v1/pages and
+GET /v1/databases/{id}, keeping pages in memory. Latency, a request-rate limit
+(Notion averages 3 req/s) and random 429s are configurable.
+
+Usage:
+    python -m src.sandbox.fake_notion --port 8090 --latency 0.15 --rate-limit 3 --seed-pages 5000
+
+Then point NotionClient at it:
+    NOTION_BASE_URL=http://127.0.0.1:8090
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from ..utils.logger import log
+
+MAX_PAGE_SIZE = 100
+
+
+def _iso_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _to_response_property(value: Dict[str, Any]) -> Dict[str, Any]:
+    """Adds the read-side fields Notion returns (plain_text, ids) to a written property value."""
+    prop = dict(value)
+    for key in ("rich_text", "title"):
+        if key in prop:
+            items = []
+            for item in prop[key] or []:
+                content = item.get("text", {}).get("content", "")
+                items.append(dict(item, plain_text=content, href=None, annotations={}))
+            prop[key] = items
+            prop["type"] = key
+    if "select" in prop:
+        prop["type"] = "select"
+        if prop["select"] is not None:
+            prop["select"] = dict(prop["select"], color="default")
+    for key in ("number", "date", "checkbox"):
+        if key in prop:
+            prop["type"] = key
+    return prop
+
+
+def _comparable(prop: Dict[str, Any]) -> Any:
+    """The value a filter or sort compares for a stored property."""
+    kind = prop.get("type")
+    if kind in ("rich_text", "title"):
+        return "".join(item.get("plain_text", "") for item in prop.get(kind) or [])
+    if kind == "select":
+        return (prop.get("select") or {}).get("name")
+    if kind == "date":
+        start = (prop.get("date") or {}).get("start")
+        return datetime.fromisoformat(start.replace("Z", "+00:00")) if start else None
+    return prop.get(kind)
+
+
+def _sort_value(page: Dict[str, Any], name: str):
+    prop = page["properties"].get(name)
+    value = _comparable(prop) if prop else None
+    # Empty values sort together instead of failing comparisons
+    return (value is None, value)
+
+
+def _match_condition(value: Any, condition: Dict[str, Any]) -> bool:
+    for op, expected in condition.items():
+        if op == "is_empty":
+            return value in (None, "")
+        if op == "is_not_empty":
+            return value not in (None, "")
+        if value is None:
+            return False
+        if isinstance(value, datetime) and isinstance(expected, str):
+            expected = datetime.fromisoformat(expected.replace("Z", "+00:00"))
+            if expected.tzinfo is None:
+                expected = expected.replace(tzinfo=timezone.utc)
+        if op == "equals" or op == "on":
+            if value != expected:
+                return False
+        elif op == "does_not_equal":
+            if value == expected:
+                return False
+        elif op == "contains":
+            if str(expected) not in str(value):
+                return False
+        elif op == "starts_with":
+            if not str(value).startswith(str(expected)):
+                return False
+        elif op in ("greater_than", "after"):
+            if not value > expected:
+                return False
+        elif op in ("less_than", "before"):
+            if not value < expected:
+                return False
+        elif op in ("greater_than_or_equal_to", "on_or_after"):
+            if not value >= expected:
+                return False
+        elif op in ("less_than_or_equal_to", "on_or_before"):
+            if not value <= expected:
+                return False
+        else:
+            raise ValueError(f"Unsupported filter condition: {op}")
+    return True
+
+
+def _match(page: Dict[str, Any], flt: Optional[Dict[str, Any]]) -> bool:
+    if not flt:
+        return True
+    if "and" in flt:
+        return all(_match(page, sub) for sub in flt["and"])
+    if "or" in flt:
+        return any(_match(page, sub) for sub in flt["or"])
+    if "timestamp" in flt:
+        kind = flt["timestamp"]
+        value = datetime.fromisoformat(page[kind].replace("Z", "+00:00"))
+        return _match_condition(value, flt[kind])
+    prop = page["properties"].get(flt.get("property"))
+    value = _comparable(prop) if prop else None
+    for kind in ("rich_text", "title", "number", "select", "date", "checkbox"):
+        if kind in flt:
+            return _match_condition(value, flt[kind])
+    raise ValueError(f"Unsupported filter: {flt}")
+
+
+class FakeNotionStore:
+    """Pages per database, in insertion order."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.databases: Dict[str, List[Dict[str, Any]]] = {}
+
+    def create_page(self, database_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        now = _iso_now()
+        page_id = str(uuid.uuid4())
+        page = {
+            "object": "page",
+            "id": page_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+            "parent": {"type": "database_id", "database_id": database_id},
+            "properties": {name: _to_response_property(value) for name, value in properties.items()},
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        }
+        with self.lock:
+            self.databases.setdefault(database_id, []).append(page)
+        return page
+
+    def query(self, database_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        page_size = min(int(body.get("page_size") or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+        offset = int(body.get("start_cursor") or 0)
+        with self.lock:
+            pages = [p for p in self.databases.get(database_id, []) if _match(p, body.get("filter"))]
+
+        # Apply sorts last-to-first so the first sort has the highest precedence
+        for sort in reversed(body.get("sorts") or []):
+            if "timestamp" in sort:
+                key = lambda page, kind=sort["timestamp"]: page[kind]
+            else:
+                key = lambda page, name=sort["property"]: _sort_value(page, name)
+            pages.sort(key=key, reverse=sort.get("direction") == "descending")
+
+        results = pages[offset:offset + page_size]
+        has_more = offset + page_size < len(pages)
+        return {
+            "object": "list",
+            "results": results,
+            "next_cursor": str(offset + page_size) if has_more else None,
+            "has_more": has_more,
+            "type": "page_or_database",
+        }
+
+    def seed(self, database_id: str, count: int, rng: random.Random):
+        """Fills a database with synthetic trade pages in NotionClient's schema."""
+        start = datetime.now(timezone.utc) - timedelta(days=365)
+        for index in range(count):
+            symbol = rng.choice(("BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"))
+            side = rng.choice(("Buy", "Sell"))
+            timestamp = start + timedelta(seconds=index * 365 * 86400 / max(count, 1))
+            self.create_page(database_id, {
+                "Trade": {"title": [{"type": "text", "text": {"content": f"{symbol} {side}"}}]},
+                "Symbol": {"select": {"name": symbol}},
+                "Side": {"select": {"name": side}},
+                "Size": {"number": round(rng.uniform(0.01, 5), 4)},
+                "Entry/Exit Price": {"number": round(rng.uniform(1, 60000), 2)},
+                "Fee": {"number": round(rng.uniform(0, 5), 4)},
+                "PnL": {"number": round(rng.gauss(0, 50), 4)},
+                "Timestamp": {"date": {"start": timestamp.isoformat()}},
+                "Subaccount": {"rich_text": [{"type": "text", "text": {"content": "Main Account"}}]},
+                "Transaction ID": {"rich_text": [{"type": "text", "text": {"content": f"seed-{index}"}}]},
+            })
+
+
+class FakeNotionServer(ThreadingHTTPServer):
+    """HTTP server holding the store and the latency / rate-limit settings."""
+
+    daemon_threads = True
+
+    def __init__(self, address, store: FakeNotionStore, token: Optional[str] = None, latency: float = 0.0,
+                 jitter: float = 0.0, rate_limit: float = 0.0, error_429_prob: float = 0.0, seed: Optional[int] = None):
+        super().__init__(address, _Handler)
+        self.store = store
+        self.token = token
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.error_429_prob = error_429_prob
+        self.rng = random.Random(seed)
+        self._bucket_lock = threading.Lock()
+        self._tokens = max(rate_limit, 1.0)
+        self._refilled_at = time.time()
+        self.requests = 0
+        self.throttled = 0
+
+    def take_token(self) -> bool:
+        """Token bucket with a burst of one second's worth of requests."""
+        if self.rate_limit <= 0:
+            return True
+        with self._bucket_lock:
+            now = time.time()
+            self._tokens = min(max(self.rate_limit, 1.0), self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeNotionServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, payload: Dict[str, Any], status: int = 200, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None):
+        self._reply({"object": "error", "status": status, "code": code, "message": message}, status, headers)
+
+    def _admit(self) -> bool:
+        """Applies auth, latency and throttling; replies with the error and returns False if rejected."""
+        server = self.server
+        server.requests += 1
+        delay = server.latency + (server.rng.uniform(0, server.jitter) if server.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if server.token and self.headers.get("Authorization") != f"Bearer {server.token}":
+            self._error(401, "unauthorized", "API token is invalid.")
+            return False
+        if not server.take_token() or (server.error_429_prob and server.rng.random() < server.error_429_prob):
+            server.throttled += 1
+            self._error(429, "rate_limited", "You have been rate limited. Please try again in a few minutes.",
+                        {"Retry-After": "1"})
+            return False
+        return True
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_POST(self):
+        try:
+            body = self._body()
+        except ValueError:
+            self._error(400, "invalid_json", "Error parsing JSON body.")
+            return
+        if not self._admit():
+            return
+
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        try:
+            if parts[:2] == ["v1", "databases"] and len(parts) == 4 and parts[3] == "query":
+                self._reply(self.server.store.query(parts[2], body))
+            elif parts == ["v1", "pages"]:
+                database_id = (body.get("parent") or {}).get("database_id")
+                if not database_id:
+                    self._error(400, "validation_error", "body.parent.database_id should be defined.")
+                    return
+                self._reply(self.server.store.create_page(database_id, body.get("properties") or {}))
+            else:
+                self._error(404, "object_not_found", f"Unknown endpoint {self.path}")
+        except (ValueError, KeyError, TypeError) as e:
+            self._error(400, "validation_error", str(e))
+
+    def do_GET(self):
+        if not self._admit():
+            return
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        if parts[:2] == ["v1", "databases"] and len(parts) == 3:
+            self._reply({"object": "database", "id": parts[2], "title": [], "properties": {}})
+        else:
+            self._error(404, "object_not_found", f"Unknown endpoint {self.path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Notion API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--token", help="Require this integration token (default: accept any)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency up to this many seconds")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before 429s (0 = off)")
+    parser.add_argument("--error-429-prob", type=float, default=0.0, help="Share of requests answered with a random 429")
+    parser.add_argument("--database-id", help="Database to pre-populate with --seed-pages")
+    parser.add_argument("--seed-pages", type=int, default=0, help="Synthetic trade pages to pre-populate")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    store = FakeNotionStore()
+    if args.seed_pages:
+        if not args.database_id:
+            parser.error("--seed-pages requires --database-id")
+        store.seed(args.database_id, args.seed_pages, random.Random(args.seed))
+
+    server = FakeNotionServer((args.host, args.port), store, token=args.token, latency=args.latency,
+                              jitter=args.jitter, rate_limit=args.rate_limit,
+                              error_429_prob=args.error_429_prob, seed=args.seed)
+    log.info(f"Fake Notion listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        log.info(f"Fake Notion served {server.requests} requests ({server.throttled} throttled)")
+
+
+if __name__ == "__main__":
+    main()
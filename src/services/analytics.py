@@ -0,0 +1,252 @@
+# src/services/analytics.py
+"""
+Performance analytics over closed-PnL history, computed with NumPy in one pass.
+
+    equity curve       cumulative realized PnL per record (plus `capital`, if given)
+    max drawdown       largest peak-to-trough fall of the equity curve, with its dates
+    profit factor      gross profit / gross loss
+    expectancy         mean PnL per closed record (win rate x avg win - loss rate x avg loss)
+    sharpe / sortino   annualized, on calendar-day PnL buckets over the whole queried range
+                       (days without trades, including idle days at either end, count as 0);
+                       returns are PnL / equity at the start of the day when `capital` is given
+    streaks            longest win and loss runs, and the current run
+    by_symbol          count, PnL, wins, losses, win rate and profit factor per symbol
+
+NumPy comes with pandas (requirements.txt) and is only imported when analytics run.
+Results are cached per (range, store version, day), so a repeated query is a dict lookup.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..adapters.models import ClosedPnl
+
+DAY_MS = 24 * 60 * 60 * 1000
+HOUR_MS = 60 * 60 * 1000
+TRADING_DAYS_PER_YEAR = 365  # Crypto trades every day
+
+
+def compute_analytics(records: Sequence[ClosedPnl], tz=None, capital: Optional[float] = None,
+                      start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Analytics of closed-PnL records (any order). `tz` sets the calendar days (None: local time).
+    start_ms / end_ms bound the queried range, so the daily series covers every day in it
+    (None: from the first to the last record).
+    """
+    import numpy as np
+
+    records = [record for record in records if record.updated_time is not None]
+    if not records:
+        return {"records": 0}
+    times = np.fromiter((record.updated_time for record in records), dtype=np.int64, count=len(records))
+    pnl = np.fromiter((float(record.closed_pnl or 0) for record in records), dtype=np.float64, count=len(records))
+    order = np.argsort(times, kind="stable")
+    times, pnl = times[order], pnl[order]
+    symbols = np.array([records[i].symbol for i in order])
+
+    result: Dict[str, Any] = {
+        "records": int(len(pnl)),
+        "start": int(times[0]),
+        "end": int(times[-1]),
+    }
+    result.update(_trade_stats(np, pnl))
+    result.update(_equity_stats(np, times, pnl, capital))
+    result.update(_daily_ratios(np, times, pnl, tz, capital, start_ms, end_ms))
+    result["streaks"] = _streaks(np, pnl)
+    result["by_symbol"] = _by_symbol(np, symbols, pnl)
+    return result
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return float(numerator / denominator) if denominator else None
+
+
+def _trade_stats(np, pnl) -> Dict[str, Any]:
+    wins = pnl > 0
+    losses = pnl < 0
+    gross_profit = float(pnl[wins].sum())
+    gross_loss = float(-pnl[losses].sum())
+    win_count = int(wins.sum())
+    loss_count = int(losses.sum())
+    return {
+        "total_pnl": float(pnl.sum()),
+        "wins": win_count,
+        "losses": loss_count,
+        "win_rate": _ratio(win_count, win_count + loss_count),
+        "gross_profit": gross_profit,
+        "gross_loss": gross_loss,
+        "profit_factor": _ratio(gross_profit, gross_loss),
+        "expectancy": float(pnl.mean()),
+        "avg_win": _ratio(gross_profit, win_count),
+        "avg_loss": _ratio(-gross_loss, loss_count),
+        "max_win": float(pnl.max()) if win_count else 0.0,
+        "max_loss": float(pnl.min()) if loss_count else 0.0,
+    }
+
+
+def _equity_stats(np, times, pnl, capital) -> Dict[str, Any]:
+    base = capital or 0.0
+    # Equity before the first record, then after each one
+    equity = np.concatenate(([base], base + np.cumsum(pnl)))
+    peaks = np.maximum.accumulate(equity)
+    drawdowns = peaks - equity
+    trough = int(drawdowns.argmax())
+    max_drawdown = float(drawdowns[trough])
+    peak = int(equity[:trough + 1].argmax()) if trough else 0
+    point_times = np.concatenate(([times[0]], times))
+    return {
+        "equity_curve": list(zip(times.tolist(), np.round(equity[1:], 8).tolist())),
+        "final_equity": float(equity[-1]),
+        "max_drawdown": max_drawdown,
+        "max_drawdown_pct": _ratio(max_drawdown * 100, float(peaks[trough])) if capital else None,
+        "max_drawdown_start": int(point_times[peak]) if max_drawdown else None,
+        "max_drawdown_end": int(point_times[trough]) if max_drawdown else None,
+    }
+
+
+def _local_days(np, times, tz):
+    """Calendar day number (days since epoch in `tz`) per timestamp; UTC offsets resolved once per hour."""
+    hours, inverse = np.unique(times // HOUR_MS, return_inverse=True)
+    offsets = np.fromiter(
+        ((datetime.fromtimestamp(int(hour) * 3600, timezone.utc).astimezone(tz).utcoffset().total_seconds() * 1000)
+         for hour in hours),
+        dtype=np.int64, count=len(hours))
+    return (times + offsets[inverse]) // DAY_MS
+
+
+def _daily_ratios(np, times, pnl, tz, capital, start_ms=None, end_ms=None) -> Dict[str, Any]:
+    days = _local_days(np, times, tz)
+    first_day, last_day = int(days[0]), int(days[-1])
+    if start_ms is not None:
+        first_day = min(first_day, int(_local_days(np, np.array([start_ms], dtype=np.int64), tz)[0]))
+    if end_ms is not None:
+        last_day = max(last_day, int(_local_days(np, np.array([end_ms - 1], dtype=np.int64), tz)[0]))
+    # Every day of the range, 0 if idle
+    daily_pnl = np.bincount(days - first_day, weights=pnl, minlength=last_day - first_day + 1)
+    if capital:
+        start_equity = capital + np.concatenate(([0.0], np.cumsum(daily_pnl)[:-1]))
+        returns = daily_pnl / np.where(start_equity > 0, start_equity, np.nan)
+        returns = returns[~np.isnan(returns)]
+    else:
+        returns = daily_pnl
+    annualize = math.sqrt(TRADING_DAYS_PER_YEAR)
+    sharpe = sortino = None
+    if len(returns) > 1:
+        std = float(returns.std(ddof=1))
+        mean = float(returns.mean())
+        sharpe = mean / std * annualize if std else None
+        downside = float(np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2)))
+        sortino = mean / downside * annualize if downside else None
+    return {
+        "days": int(len(daily_pnl)),
+        "best_day": float(daily_pnl.max()),
+        "worst_day": float(daily_pnl.min()),
+        "sharpe": sharpe,
+        "sortino": sortino,
+    }
+
+
+def _streaks(np, pnl) -> Dict[str, int]:
+    signs = np.sign(pnl).astype(np.int8)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(signs)) + 1))
+    lengths = np.diff(np.concatenate((starts, [len(signs)])))
+    run_signs = signs[starts]
+    win_runs = lengths[run_signs > 0]
+    loss_runs = lengths[run_signs < 0]
+    return {
+        "longest_win": int(win_runs.max()) if len(win_runs) else 0,
+        "longest_loss": int(loss_runs.max()) if len(loss_runs) else 0,
+        # Positive: current winning run; negative: losing run
+        "current": int(lengths[-1] * run_signs[-1]),
+    }
+
+
+def _by_symbol(np, symbols, pnl) -> Dict[str, Dict[str, Any]]:
+    names, inverse = np.unique(symbols, return_inverse=True)
+    size = len(names)
+    count = np.bincount(inverse, minlength=size)
+    total = np.bincount(inverse, weights=pnl, minlength=size)
+    wins = np.bincount(inverse, weights=pnl > 0, minlength=size)
+    losses = np.bincount(inverse, weights=pnl < 0, minlength=size)
+    profit = np.bincount(inverse, weights=np.where(pnl > 0, pnl, 0.0), minlength=size)
+    loss = -np.bincount(inverse, weights=np.where(pnl < 0, pnl, 0.0), minlength=size)
+    breakdown = {}
+    for i, name in enumerate(names.tolist()):
+        decided = wins[i] + losses[i]
+        breakdown[name] = {
+            "records": int(count[i]),
+            "pnl": float(total[i]),
+            "wins": int(wins[i]),
+            "losses": int(losses[i]),
+            "win_rate": _ratio(wins[i], decided),
+            "profit_factor": _ratio(profit[i], loss[i]),
+        }
+    return dict(sorted(breakdown.items(), key=lambda item: item[1]["pnl"], reverse=True))
+
+
+class PnlAnalytics:
+    """compute_analytics over a ClosedPnlStore range, cached per (range, store version)."""
+
+    def __init__(self, pnl_store, tz=None, cache_size: int = 32):
+        self.store = pnl_store
+        self.tz = tz
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def analyze(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                capital: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Analytics of the stored records with start_ms <= updatedTime < end_ms (no REST calls).
+        An open end runs to now, so idle days up to today count in the daily series.
+        """
+        range_end = end_ms if end_ms is not None else int(time.time() * 1000)
+        # An open-ended range grows by a day at midnight even without new records
+        key = (start_ms, end_ms, capital, self.store.version, datetime.now(self.tz).date() if end_ms is None else None)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+        result = compute_analytics(self.store.between(start_ms, end_ms), tz=self.tz, capital=capital,
+                                   start_ms=start_ms, end_ms=range_end)
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+
+def format_summary(result: Dict[str, Any]) -> List[str]:
+    """Human-readable lines for the CLI."""
+    if not result.get("records"):
+        return ["No closed PnL records in range."]
+
+    def num(value, fmt="{:+,.2f}"):
+        return "n/a" if value is None else fmt.format(value)
+
+    start = datetime.fromtimestamp(result["start"] / 1000).strftime("%Y-%m-%d")
+    end = datetime.fromtimestamp(result["end"] / 1000).strftime("%Y-%m-%d")
+    streaks = result["streaks"]
+    lines = [
+        f"{result['records']} records, {start} .. {end} ({result['days']} days)",
+        f"Total PnL        {num(result['total_pnl'])} U",
+        f"Win rate         {num(result['win_rate'] and result['win_rate'] * 100, '{:.1f}')}% "
+        f"({result['wins']}W - {result['losses']}L)",
+        f"Profit factor    {num(result['profit_factor'], '{:.2f}')}",
+        f"Expectancy       {num(result['expectancy'])} U per record",
+        f"Max drawdown     {num(-result['max_drawdown'])} U"
+        + (f" ({result['max_drawdown_pct']:.1f}%)" if result.get("max_drawdown_pct") is not None else ""),
+        f"Sharpe / Sortino {num(result['sharpe'], '{:.2f}')} / {num(result['sortino'], '{:.2f}')} (daily, annualized)",
+        f"Streaks          longest win {streaks['longest_win']}, longest loss {streaks['longest_loss']}, "
+        f"current {streaks['current']:+d}",
+        "",
+        f"{'symbol':<14} {'records':>8} {'pnl':>12} {'win rate':>9} {'pf':>7}",
+    ]
+    for symbol, row in result["by_symbol"].items():
+        lines.append(f"{symbol:<14} {row['records']:>8} {row['pnl']:>12,.2f} "
+                     f"{num(row['win_rate'] and row['win_rate'] * 100, '{:.1f}'):>8}% {num(row['profit_factor'], '{:.2f}'):>7}")
+    return lines
@@ -36,7 +36,7 @@ class DiscordBot:
             return
 
         # Fetch Data
-        report_data = self.stats_service.get_daily_report_data()
+        report_data = {**self.stats_service.get_daily_report_data(), **self.stats_service.get_monthly_stats()}
         
         # Re-use the formatting logic. 
         # Since Notifier logic is coupled with Webhook, we'll format it here or reuse logic.
@@ -0,0 +1,99 @@
+# src/services/context.py
+"""
+Shared clients and services for one process.
+
+Every CLI command and scheduled job gets its Bybit adapter, Notion client, notifier and
+services from a ServiceContext, so a resident process builds each one once and keeps
+its connection pool, rate-limit budget and caches warm between jobs. Members are
+created (and their heavy modules imported) on first use.
+"""
+import threading
+
+from ..config import settings
+
+
+class ServiceContext:
+    def __init__(self, config=None):
+        self.config = config if config is not None else settings
+        self._lock = threading.RLock()
+        self._instances = {}
+
+    def _get(self, name, factory):
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._instances[name] = factory()
+        return instance
+
+    @property
+    def bybit(self):
+        def build():
+            from ..adapters.bybit import BybitAdapter
+            return BybitAdapter(
+                api_key=self.config["bybit_api_key"],
+                api_secret=self.config["bybit_api_secret"],
+                base_url=self.config.get("bybit_base_url")
+            )
+        return self._get("bybit", build)
+
+    @property
+    def notion(self):
+        def build():
+            from ..clients.notion import NotionClient
+            return NotionClient(
+                token=self.config["notion_token"],
+                database_id=self.config["notion_db_id"],
+                base_url=self.config.get("notion_base_url")
+            )
+        return self._get("notion", build)
+
+    @property
+    def notifier(self):
+        def build():
+            from ..monitor.notifier import DiscordNotifier
+            return DiscordNotifier()
+        return self._get("notifier", build)
+
+    @property
+    def sync(self):
+        def build():
+            from .sync import SyncService
+            return SyncService(
+                exchange_adapter=self.bybit,
+                notion_client=self.notion,
+                history_path=self.config.get("sync_history_path")
+            )
+        return self._get("sync", build)
+
+    @property
+    def pnl_store(self):
+        def build():
+            from .pnl_store import ClosedPnlStore
+            return ClosedPnlStore(self.bybit, path=self.config.get("closed_pnl_store_path") or None)
+        return self._get("pnl_store", build)
+
+    @property
+    def execution_store(self):
+        def build():
+            from .pnl_store import ExecutionStore
+            return ExecutionStore(self.bybit, path=self.config.get("execution_store_path") or None)
+        return self._get("execution_store", build)
+
+    @property
+    def stats(self):
+        def build():
+            from .pnl_aggregates import load_timezone
+            from .stats import StatsService
+            return StatsService(exchange_adapter=self.bybit, pnl_store=self.pnl_store,
+                                tz=load_timezone(self.config.get("report_timezone")),
+                                execution_store=self.execution_store)
+        return self._get("stats", build)
+
+    @property
+    def reporter(self):
+        def build():
+            from .reporter import ReporterService
+            return ReporterService(notion_client=self.notion)
+        return self._get("reporter", build)
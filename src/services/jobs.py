@@ -0,0 +1,101 @@
+# src/services/jobs.py
+"""
+The tasks behind the CLI subcommands and the scheduler, each taking a ServiceContext so
+a resident process reuses the same clients for every run.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from ..utils.logger import log
+from .context import ServiceContext
+
+
+def run_sync(ctx: ServiceContext, silent: bool = False):
+    """Bybit -> Notion transaction sync."""
+    ctx.sync.run_sync(silent=silent)
+
+
+def export_pnl_report(ctx: ServiceContext, output_format: str = "csv"):
+    """Monthly PnL report from Notion written to tax_report_<year>.csv/.xlsx."""
+    ctx.reporter.generate_pnl_report(output_format=output_format)
+
+
+def send_daily_report(ctx: ServiceContext):
+    """Today's realized PnL and win rate to the PnL webhook."""
+    report_data = ctx.stats.get_daily_report_data()
+    if not report_data:
+        log.warning("No daily report data; report not sent.")
+        return
+    ctx.notifier.send_daily_report(report_data)
+    log.info("Daily Report sent to Discord.")
+
+
+def send_pnl_dashboard(ctx: ServiceContext):
+    """Realized PnL plus open positions (unrealized) dashboard to the PnL webhook."""
+    log.info("Fetching account data from Bybit...")
+    report_data = ctx.stats.get_daily_report_data()
+    log.info("Fetching open positions...")
+    open_positions = ctx.bybit.get_position_records(category="linear")
+    log.info("Sending PnL Dashboard to Discord...")
+    ctx.notifier.send_pnl_dashboard(report_data, open_positions, multi_day_stats=None)
+    log.info("PnL Dashboard sent.")
+
+
+def send_position_snapshot(ctx: ServiceContext):
+    """One Discord message per open linear USDT position (or a 'no positions' notice)."""
+    positions = ctx.bybit.get_positions(category="linear", settleCoin="USDT")
+    active_positions = [p for p in positions if float(p.get("size", 0)) > 0]
+    if not active_positions:
+        log.info("No active positions found.")
+        ctx.notifier._send({
+            "embeds": [{
+                "title": "📊 當前持倉快照",
+                "description": "目前沒有任何持倉。",
+                "color": 9807270
+            }]
+        })
+        return
+    log.info(f"Found {len(active_positions)} active positions.")
+    for pos in active_positions:
+        ctx.notifier.send_position_update(pos)
+        log.info(f"Reported: {pos['symbol']} {pos['side']} Size: {pos['size']}")
+
+
+def scan_transactions(ctx: ServiceContext, minutes: int = 150, sub_uid: Optional[str] = None,
+                      output_path: str = "scan_2hours.txt"):
+    """Writes the last `minutes` of linear transaction-log entries (master, optionally one subaccount) to a file."""
+    now = datetime.now(timezone.utc)
+    start_time = now - timedelta(minutes=minutes)
+    now_ms = int(now.timestamp() * 1000)
+    start_ms = int(start_time.timestamp() * 1000)
+    log.info(f"Scanning transactions from {start_time} to {now}")
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("=== MASTER ACCOUNT (Linear) ===\n")
+        try:
+            _write_transactions(f, ctx.bybit.fetch_transaction_log("UNIFIED", "linear", start_ms, now_ms))
+        except Exception as e:
+            f.write(f"Error: {e}\n")
+
+        if sub_uid:
+            f.write(f"\n=== SUBACCOUNT {sub_uid} (Linear) ===\n")
+            try:
+                params = {
+                    "accountType": "UNIFIED",
+                    "category": "linear",
+                    "startTime": start_ms,
+                    "endTime": now_ms,
+                    "subMemberId": sub_uid
+                }
+                resp = ctx.bybit._request("GET", "/v5/account/transaction-log", params)
+                _write_transactions(f, resp.get("result", {}).get("list", []))
+            except Exception as e:
+                f.write(f"Error: {e}\n")
+    log.info(f"Scan results written to {output_path}")
+
+
+def _write_transactions(f, txs):
+    f.write(f"Count: {len(txs)}\n")
+    for t in txs:
+        pnl = float(t.get('change', 0)) + float(t.get('fee', 0))
+        f.write(f"[TX] {t['transactionTime']} | {t['symbol']} | PnL: {pnl} | ID: {t['orderId']} | Type: {t.get('type')}\n")
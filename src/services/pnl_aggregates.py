@@ -0,0 +1,128 @@
+# src/services/pnl_aggregates.py
+"""
+Per-day and per-month closed-PnL buckets, updated as each record arrives.
+
+The daily, monthly and N-day figures of the reports are lookups of one bucket per
+day/month instead of a scan over every record, however long the history gets. Days
+and months are calendar periods in the reporting timezone (REPORT_TIMEZONE, default
+the system's local time, which is what the reports used before).
+"""
+import threading
+from datetime import date, datetime, time, timedelta, tzinfo
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..adapters.models import ZERO, ClosedPnl
+from ..utils.logger import log
+
+
+def load_timezone(name: Optional[str]) -> Optional[tzinfo]:
+    """ZoneInfo for an IANA name; None (system local time) when empty or unknown."""
+    if not name:
+        return None
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        log.warning(f"Unknown reporting timezone '{name}', using local time: {e}")
+        return None
+
+
+class PnlBucket:
+    """PnL sum, win/loss counts and extremes of the records in one period."""
+
+    __slots__ = ("pnl", "wins", "losses", "max_win", "max_loss", "count")
+
+    def __init__(self):
+        self.pnl = ZERO
+        self.wins = 0
+        self.losses = 0
+        self.max_win = ZERO
+        self.max_loss = ZERO
+        self.count = 0
+
+    def add(self, pnl: Decimal):
+        self.pnl += pnl
+        self.count += 1
+        if pnl > 0:
+            self.wins += 1
+            if pnl > self.max_win:
+                self.max_win = pnl
+        elif pnl < 0:
+            self.losses += 1
+            if pnl < self.max_loss:
+                self.max_loss = pnl
+
+    def merge(self, other: "PnlBucket"):
+        self.pnl += other.pnl
+        self.count += other.count
+        self.wins += other.wins
+        self.losses += other.losses
+        self.max_win = max(self.max_win, other.max_win)
+        self.max_loss = min(self.max_loss, other.max_loss)
+
+    def to_stats(self) -> Dict[str, Any]:
+        """Same shape as StatsService.calculate_pnl_stats."""
+        return {
+            "pnl": float(self.pnl),
+            "wins": self.wins,
+            "losses": self.losses,
+            "max_win": float(self.max_win),
+            "max_loss": float(self.max_loss)
+        }
+
+
+_EMPTY = PnlBucket()
+
+
+class PnlAggregates:
+    def __init__(self, tz: Optional[tzinfo] = None):
+        self.tz = tz
+        self._days: Dict[date, PnlBucket] = {}
+        self._months: Dict[Tuple[int, int], PnlBucket] = {}
+        self._lock = threading.Lock()
+
+    def now(self) -> datetime:
+        return datetime.now(self.tz)
+
+    def local_date(self, ms: int) -> date:
+        return datetime.fromtimestamp(ms / 1000, self.tz).date()
+
+    def start_ms(self, day: date) -> int:
+        """Epoch ms of local midnight starting `day`."""
+        return int(datetime.combine(day, time(), tzinfo=self.tz).timestamp() * 1000)
+
+    def add(self, record):
+        """Adds one closed-PnL record (ClosedPnlStore listener; each record is added once)."""
+        record = ClosedPnl.coerce(record)
+        if record.updated_time is None:
+            return
+        pnl = record.closed_pnl or ZERO
+        day = self.local_date(record.updated_time)
+        with self._lock:
+            bucket = self._days.get(day)
+            if bucket is None:
+                bucket = self._days[day] = PnlBucket()
+            bucket.add(pnl)
+            month = self._months.get((day.year, day.month))
+            if month is None:
+                month = self._months[(day.year, day.month)] = PnlBucket()
+            month.add(pnl)
+
+    def day(self, day: date) -> PnlBucket:
+        return self._days.get(day, _EMPTY)
+
+    def month(self, year: int, month: int) -> PnlBucket:
+        return self._months.get((year, month), _EMPTY)
+
+    def last_days(self, days: int, today: Optional[date] = None) -> List[Tuple[date, PnlBucket]]:
+        """(date, bucket) for the `days` calendar days ending today, oldest first."""
+        today = today or self.now().date()
+        return [(day, self.day(day)) for day in (today - timedelta(days=offset) for offset in range(days - 1, -1, -1))]
+
+
+def combine(buckets) -> PnlBucket:
+    combined = PnlBucket()
+    for bucket in buckets:
+        combined.merge(bucket)
+    return combined
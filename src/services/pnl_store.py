@@ -0,0 +1,244 @@
+# src/services/pnl_store.py
+"""
+Local time series of closed-PnL records, kept up to date incrementally.
+
+Statistics read records from here instead of re-downloading everything since midnight
+(or N days ago) on each request: `refresh()` asks Bybit only for records since the end
+of the previous fetch (less a small overlap), so a stats request costs one small REST
+call however long ago the last trade was. Records are kept
+in memory sorted by `updatedTime` and appended to a JSON-lines file (one API-shaped
+record per line), so a restart does not refetch history.
+
+Lines with a "coveredFrom" key mark how far back the history is complete; older
+periods are fetched once, on the first query that needs them (`ensure_since`). Lines
+with a "fetchedTo" key record how far forward it was fetched.
+
+ExecutionStore keeps the account's fills the same way (position-cycle reconstruction).
+"""
+import bisect
+import os
+from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+from ..adapters.models import ClosedPnl, Execution
+from ..utils import json_codec
+from ..utils.logger import log
+
+DAY_MS = 24 * 60 * 60 * 1000
+# Refreshes re-read this much before the last fetch's end, for records Bybit publishes
+# with a slightly older timestamp; the repeats are de-duplicated
+REFRESH_OVERLAP_MS = 5 * 60 * 1000
+# A fetch that added nothing persists its watermark at most this often
+WATERMARK_PERSIST_MS = 60 * 60 * 1000
+
+
+class HistoryStore(ABC):
+    """Sorted, de-duplicated, persisted history of one record type (see the subclasses)."""
+
+    RECORD = None  # Record class; needs identity()
+    TIME_FIELD = None  # Attribute the history is ordered and fetched by
+    NAME = "history"  # In log messages, mid-sentence
+    DISPLAY_NAME = "History"  # ... and at the start of one
+
+    def __init__(self, adapter, path: Optional[str] = None, category: str = "linear",
+                 initial_days: int = 7, min_refresh_interval: float = 1.0):
+        """
+        Args:
+            adapter: BybitAdapter the records are fetched with.
+            path: JSON-lines file the history persists to (None keeps it in memory only).
+            initial_days: History fetched on the first refresh of an empty store.
+            min_refresh_interval: Refreshes within this many seconds of the last one are
+                skipped (a burst of stats requests shares one REST call).
+        """
+        self.adapter = adapter
+        self.path = path
+        self.category = category
+        self.initial_days = initial_days
+        self.min_refresh_interval = min_refresh_interval
+        self._records: List = []  # Oldest first
+        self._times: List[int] = []  # TIME_FIELD of _records, for bisect
+        self._keys = set()
+        self.version = 0  # Bumped whenever records are added (cache key for derived results)
+        self._covered_from: Optional[int] = None  # ms; history is complete from here on
+        self._fetched_to: Optional[int] = None  # ms; ... and up to here
+        self._persisted_fetched_to: Optional[int] = None
+        self._last_refresh = 0.0
+        self._listeners: List[Callable] = []
+        self._lock = threading.RLock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def newest_time(self) -> Optional[int]:
+        return self._times[-1] if self._times else None
+
+    @property
+    def covered_from(self) -> Optional[int]:
+        return self._covered_from
+
+    def subscribe(self, listener: Callable):
+        """Calls `listener(record)` for every record added from now on (stored ones are replayed first)."""
+        with self._lock:
+            for record in self._records:
+                listener(record)
+            self._listeners.append(listener)
+
+    # Reads
+
+    def between(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> List:
+        """Records with start_ms <= time < end_ms, oldest first (open bounds when None)."""
+        with self._lock:
+            lo = bisect.bisect_left(self._times, start_ms) if start_ms is not None else 0
+            hi = bisect.bisect_left(self._times, end_ms) if end_ms is not None else len(self._times)
+            return self._records[lo:hi]
+
+    def latest(self, count: int) -> List:
+        """The newest `count` records, newest first (the order the REST endpoint returns)."""
+        with self._lock:
+            return self._records[:-count - 1:-1] if count > 0 else []
+
+    # Updates
+
+    def refresh(self, force: bool = False) -> int:
+        """Fetches records since the end of the previous fetch. Returns how many were new."""
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_refresh < self.min_refresh_interval:
+                return 0
+            now_ms = int(now * 1000)
+            if self._covered_from is None:
+                return self.ensure_since(now_ms - self.initial_days * DAY_MS)
+            if self._fetched_to is not None:
+                start_ms = max(self._fetched_to - REFRESH_OVERLAP_MS, self._covered_from)
+            else:
+                # No watermark (history written before it existed): the newest record is a safe start
+                start_ms = self.newest_time if self.newest_time is not None else self._covered_from
+            # A record stamped ahead of the local clock must not push the start past now
+            added = self.add(self._fetch(min(start_ms, now_ms), now_ms))
+            self._set_fetched_to(now_ms, persist=added > 0)
+            self._last_refresh = now
+            return added
+
+    def ensure_since(self, start_ms: int) -> int:
+        """Makes the history complete from `start_ms` on, fetching only what is missing."""
+        with self._lock:
+            now = time.time()
+            now_ms = int(now * 1000)
+            if self._covered_from is not None and self._covered_from <= start_ms:
+                return self.refresh()
+            end_ms = self._covered_from if self._covered_from is not None else now_ms
+            added = self.add(self._fetch(start_ms, end_ms))
+            if self._covered_from is None:
+                self._last_refresh = now
+                self._set_fetched_to(now_ms, persist=True)
+            self._covered_from = start_ms
+            self._append_lines([json_codec.dumps({"coveredFrom": start_ms})])
+            if end_ms != now_ms:
+                added += self.refresh()
+            return added
+
+    def add(self, records: Iterable) -> int:
+        """Stores records not seen before (raw dicts are parsed) and notifies listeners."""
+        new = []
+        with self._lock:
+            for record in records:
+                record = self.RECORD.coerce(record)
+                key = record.identity()
+                record_time = getattr(record, self.TIME_FIELD)
+                if key in self._keys or record_time is None:
+                    continue
+                self._keys.add(key)
+                index = bisect.bisect_right(self._times, record_time)
+                self._times.insert(index, record_time)
+                self._records.insert(index, record)
+                new.append(record)
+            if new:
+                self.version += 1
+                self._append_lines(json_codec.dumps(record.to_dict()) for record in new)
+                for record in new:
+                    for listener in self._listeners:
+                        listener(record)
+        return len(new)
+
+    def _set_fetched_to(self, fetched_to: int, persist: bool):
+        self._fetched_to = fetched_to
+        if persist or self._persisted_fetched_to is None or \
+                fetched_to - self._persisted_fetched_to >= WATERMARK_PERSIST_MS:
+            self._persisted_fetched_to = fetched_to
+            self._append_lines([json_codec.dumps({"fetchedTo": fetched_to})])
+
+    @abstractmethod
+    def _fetch(self, start_ms: int, end_ms: int) -> List:
+        """Records with start_ms <= time <= end_ms from the exchange."""
+
+    # Persistence
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        rows = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json_codec.loads(line)
+                    except json_codec.JSONDecodeError:
+                        continue  # Torn last line after a crash
+                    if "coveredFrom" in row:
+                        covered = int(row["coveredFrom"])
+                        self._covered_from = covered if self._covered_from is None else min(self._covered_from, covered)
+                    elif "fetchedTo" in row:
+                        self._fetched_to = max(self._fetched_to or 0, int(row["fetchedTo"]))
+                        self._persisted_fetched_to = self._fetched_to
+                    else:
+                        rows.append(row)
+        except OSError as e:
+            log.warning(f"Could not read {self.NAME} store {self.path}: {e}")
+            return
+        path, self.path = self.path, None  # Don't re-append what is being loaded
+        try:
+            self.add(rows)
+        finally:
+            self.path = path
+        log.info(f"{self.DISPLAY_NAME} store loaded {len(self._records)} records from {self.path}")
+
+    def _append_lines(self, lines: Iterable[str]):
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(line + "\n" for line in lines)
+        except OSError as e:
+            log.warning(f"Could not write {self.NAME} store {self.path}: {e}")
+
+
+class ClosedPnlStore(HistoryStore):
+    """Closed-PnL records by updatedTime."""
+
+    RECORD = ClosedPnl
+    TIME_FIELD = "updated_time"
+    NAME = "closed-PnL"
+    DISPLAY_NAME = "Closed-PnL"
+
+    def _fetch(self, start_ms: int, end_ms: int) -> List[ClosedPnl]:
+        # Split into 7-day windows (the endpoint's limit) and fetched concurrently
+        return self.adapter.get_closed_pnl_history(self.category, start_ms, end_ms)
+
+
+class ExecutionStore(HistoryStore):
+    """Fills (Funding entries excluded) by execTime."""
+
+    RECORD = Execution
+    TIME_FIELD = "exec_time"
+    NAME = "execution"
+    DISPLAY_NAME = "Execution"
+
+    def _fetch(self, start_ms: int, end_ms: int) -> List[Execution]:
+        return self.adapter.get_execution_history(self.category, start_ms, end_ms)
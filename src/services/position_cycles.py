@@ -0,0 +1,289 @@
+# src/services/position_cycles.py
+"""
+Position lifecycles (open, scale-ins, partial closes, final close) rebuilt from fills.
+
+Every execution is split by its `closedSize` into a closing part, which reduces the
+opposite position side, and an opening part, which opens or adds to its own side. A
+side going back to zero closes its cycle. This covers one-way mode (including a fill
+that flips the position) and hedge mode alike. Closed-PnL records join the cycle
+their closing order belongs to, for the realized PnL Bybit reports.
+
+Cycles are indexed by (symbol, position side, number) and by close time, so the last
+cycle, any cycle or every cycle closed in a range is a lookup. The index follows the
+ExecutionStore and ClosedPnlStore: new records are applied incrementally, and the
+index is replayed from both stores only when older history is loaded behind it.
+
+Positions already open where the execution history starts have no opening fills; their
+cycle is marked incomplete and its entry price comes from the closed-PnL records.
+Cycle numbers count from the start of the loaded history.
+"""
+import bisect
+import heapq
+import threading
+from collections import deque
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..adapters.models import ZERO, ClosedPnl, Execution
+
+
+def _opposite(side: str) -> str:
+    return "Sell" if side == "Buy" else "Buy"
+
+
+class PositionCycle:
+    """One position side of a symbol from first opening fill to flat. `side` is the position side (Buy: long)."""
+
+    __slots__ = ("symbol", "side", "number", "opened_at", "closed_at", "complete", "size", "max_size",
+                 "entry_qty", "entry_value", "exit_qty", "exit_value", "fees", "entries", "exits", "pnl_records")
+
+    def __init__(self, symbol: str, side: str, number: int, opened_at: Optional[int], complete: bool):
+        self.symbol = symbol
+        self.side = side
+        self.number = number
+        self.opened_at = opened_at
+        self.closed_at: Optional[int] = None
+        self.complete = complete  # False: opened before the execution history starts
+        self.size = ZERO
+        self.max_size = ZERO
+        self.entry_qty = ZERO
+        self.entry_value = ZERO
+        self.exit_qty = ZERO
+        self.exit_value = ZERO
+        self.fees = ZERO
+        self.entries: List[Execution] = []  # Opening fills
+        self.exits: List[Execution] = []  # Closing fills
+        self.pnl_records: List[ClosedPnl] = []
+
+    @property
+    def is_open(self) -> bool:
+        return self.closed_at is None
+
+    @property
+    def realized_pnl(self) -> Decimal:
+        return sum((record.closed_pnl or ZERO for record in self.pnl_records), ZERO)
+
+    @property
+    def avg_entry_price(self) -> Decimal:
+        if self.complete and self.entry_qty:
+            return self.entry_value / self.entry_qty
+        # Opening fills not loaded: Bybit's position entry price at the last close
+        return (self.pnl_records[-1].avg_entry_price or ZERO) if self.pnl_records else ZERO
+
+    @property
+    def avg_exit_price(self) -> Decimal:
+        if self.exit_qty:
+            return self.exit_value / self.exit_qty
+        qty = sum((record.closed_size or ZERO for record in self.pnl_records), ZERO)
+        value = sum(((record.avg_exit_price or ZERO) * (record.closed_size or ZERO) for record in self.pnl_records), ZERO)
+        return value / qty if qty else ZERO
+
+    @property
+    def scale_ins(self) -> int:
+        """Opening orders after the first."""
+        return max(len({fill.order_id for fill in self.entries}) - 1, 0)
+
+    @property
+    def partial_closes(self) -> int:
+        """Closing orders before the final one (all of them while the cycle is open)."""
+        orders = len({fill.order_id for fill in self.exits})
+        return orders if self.is_open else max(orders - 1, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "cycle": self.number,
+            "openedAt": self.opened_at,
+            "closedAt": self.closed_at,
+            "complete": self.complete,
+            "size": float(self.size),
+            "maxSize": float(self.max_size),
+            "qty": float(self.exit_qty),
+            "avgEntryPrice": float(self.avg_entry_price),
+            "avgExitPrice": float(self.avg_exit_price),
+            "closedPnl": float(self.realized_pnl),
+            "fees": float(self.fees),
+            "scaleIns": self.scale_ins,
+            "partialCloses": self.partial_closes,
+            "record_count": len(self.pnl_records)
+        }
+
+    def __repr__(self):
+        state = "open" if self.is_open else f"closed@{self.closed_at}"
+        return f"PositionCycle({self.symbol} {self.side} #{self.number}, {state})"
+
+
+class PositionCycleIndex:
+    def __init__(self, pnl_store, execution_store):
+        self.pnl_store = pnl_store
+        self.execution_store = execution_store
+        self._lock = threading.Lock()
+        # Filled by the store listeners (which run under the stores' locks), drained by _sync
+        self._pending: deque = deque()
+        self._reset()
+        execution_store.subscribe(lambda record: self._pending.append((record.exec_time, 0, record)))
+        pnl_store.subscribe(lambda record: self._pending.append((record.updated_time, 1, record)))
+
+    def _reset(self):
+        self._legs: Dict[Tuple[str, str], List[PositionCycle]] = {}  # (symbol, side) -> cycles, oldest first
+        self._open: Dict[Tuple[str, str], PositionCycle] = {}
+        self._closed: List[PositionCycle] = []  # By close time
+        self._closed_times: List[int] = []
+        self._by_close_order: Dict[str, PositionCycle] = {}
+        self._orphans: Dict[str, List[ClosedPnl]] = {}  # Closed PnL whose closing fills aren't loaded (yet)
+        self._applied = set()
+        self._applied_until: Optional[int] = None
+
+    # Updates
+
+    def refresh(self, force: bool = False):
+        """Fetches new records into both stores (closed PnL first, so its closing fills are never missing)."""
+        self.pnl_store.refresh(force=force)
+        self.execution_store.refresh(force=force)
+
+    def ensure_since(self, start_ms: int):
+        self.pnl_store.ensure_since(start_ms)
+        self.execution_store.ensure_since(start_ms)
+
+    def _sync(self):
+        """Applies records added to the stores since the last query (caller holds the lock)."""
+        events = []
+        while self._pending:
+            events.append(self._pending.popleft())
+        if not events:
+            return
+        events.sort(key=lambda event: (event[0], event[1]))
+        if self._applied_until is not None and events[0][0] < self._applied_until:
+            # Older history was loaded: replay everything in time order
+            self._reset()
+            events = heapq.merge(
+                ((record.exec_time, 0, record) for record in self.execution_store.between()),
+                ((record.updated_time, 1, record) for record in self.pnl_store.between()),
+                key=lambda event: (event[0], event[1]))
+        for event_time, kind, record in events:
+            key = (kind,) + record.identity()
+            if key in self._applied:
+                continue
+            self._applied.add(key)
+            if kind == 0:
+                self._apply_fill(record)
+            else:
+                self._apply_pnl(record)
+            self._applied_until = event_time
+
+    def _apply_fill(self, fill: Execution):
+        qty = fill.exec_qty or ZERO
+        if not qty or fill.side not in ("Buy", "Sell"):
+            return
+        closing = min(fill.closed_size or ZERO, qty)
+        fee = fill.exec_fee or ZERO
+        if closing:
+            self._reduce(fill, _opposite(fill.side), closing, fee * closing / qty)
+        if qty - closing:
+            self._increase(fill, fill.side, qty - closing, fee * (qty - closing) / qty)
+
+    def _increase(self, fill: Execution, side: str, qty: Decimal, fee: Decimal):
+        key = (fill.symbol, side)
+        cycle = self._open.get(key)
+        if cycle is None:
+            cycle = self._start(key, fill.exec_time, complete=True)
+        cycle.size += qty
+        cycle.max_size = max(cycle.max_size, cycle.size)
+        cycle.entry_qty += qty
+        cycle.entry_value += qty * (fill.exec_price or ZERO)
+        cycle.fees += fee
+        cycle.entries.append(fill)
+
+    def _reduce(self, fill: Execution, side: str, qty: Decimal, fee: Decimal):
+        key = (fill.symbol, side)
+        cycle = self._open.get(key)
+        if cycle is None:
+            legs = self._legs.get(key)
+            if legs:
+                # Nothing opened on this side since its last cycle closed: that cycle was
+                # larger than the loaded fills show (opened before the history starts)
+                cycle = legs[-1]
+                index = self._closed.index(cycle)
+                del self._closed[index], self._closed_times[index]
+                cycle.closed_at = None
+                self._open[key] = cycle
+            else:
+                cycle = self._start(key, None, complete=False)
+        cycle.size = max(cycle.size - qty, ZERO)
+        cycle.exit_qty += qty
+        cycle.exit_value += qty * (fill.exec_price or ZERO)
+        cycle.fees += fee
+        cycle.exits.append(fill)
+        if fill.order_id:
+            self._by_close_order[fill.order_id] = cycle
+            for record in self._orphans.pop(fill.order_id, ()):
+                cycle.pnl_records.append(record)
+        if not cycle.size:
+            cycle.closed_at = fill.exec_time or 0
+            del self._open[key]
+            index = bisect.bisect_right(self._closed_times, cycle.closed_at)
+            self._closed.insert(index, cycle)
+            self._closed_times.insert(index, cycle.closed_at)
+
+    def _start(self, key: Tuple[str, str], opened_at: Optional[int], complete: bool) -> PositionCycle:
+        legs = self._legs.setdefault(key, [])
+        cycle = PositionCycle(key[0], key[1], len(legs) + 1, opened_at, complete)
+        legs.append(cycle)
+        self._open[key] = cycle
+        return cycle
+
+    def _apply_pnl(self, record: ClosedPnl):
+        cycle = self._by_close_order.get(record.order_id)
+        if cycle is None:
+            self._orphans.setdefault(record.order_id, []).append(record)
+        else:
+            cycle.pnl_records.append(record)
+
+    # Lookups (no REST calls; refresh() / ensure_since() first for current data)
+
+    def last_closed(self, symbol: Optional[str] = None, side: Optional[str] = None) -> Optional[PositionCycle]:
+        """Most recently closed cycle, optionally of one symbol and position side."""
+        with self._lock:
+            self._sync()
+            for cycle in reversed(self._closed):
+                if (symbol is None or cycle.symbol == symbol) and (side is None or cycle.side == side):
+                    return cycle
+            return None
+
+    def cycle(self, symbol: str, side: str, number: int) -> Optional[PositionCycle]:
+        """Cycle `number` (1 = first loaded) of a symbol's position side; negative counts from the latest."""
+        with self._lock:
+            self._sync()
+            legs = self._legs.get((symbol, side), [])
+            index = number - 1 if number > 0 else number
+            return legs[index] if number and -len(legs) <= index < len(legs) else None
+
+    def cycles(self, symbol: str, side: Optional[str] = None) -> List[PositionCycle]:
+        """Every loaded cycle of a symbol (one position side, or both), oldest first."""
+        with self._lock:
+            self._sync()
+            sides = (side,) if side else ("Buy", "Sell")
+            found = [cycle for s in sides for cycle in self._legs.get((symbol, s), [])]
+        return sorted(found, key=lambda cycle: (cycle.opened_at or 0, cycle.number))
+
+    def closed_between(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                       symbol: Optional[str] = None) -> List[PositionCycle]:
+        """Cycles closed at start_ms <= time < end_ms, oldest first (open bounds when None)."""
+        with self._lock:
+            self._sync()
+            lo = bisect.bisect_left(self._closed_times, start_ms) if start_ms is not None else 0
+            hi = bisect.bisect_left(self._closed_times, end_ms) if end_ms is not None else len(self._closed_times)
+            return [cycle for cycle in self._closed[lo:hi] if symbol is None or cycle.symbol == symbol]
+
+    def open_cycles(self) -> List[PositionCycle]:
+        with self._lock:
+            self._sync()
+            return sorted(self._open.values(), key=lambda cycle: (cycle.symbol, cycle.side))
+
+    @property
+    def unmatched_pnl_records(self) -> int:
+        """Closed-PnL records whose closing fills are outside the loaded execution history."""
+        with self._lock:
+            self._sync()
+            return sum(len(records) for records in self._orphans.values())
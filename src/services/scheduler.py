@@ -0,0 +1,138 @@
+# src/services/scheduler.py
+"""
+In-process job scheduler for the resident CLI mode (`python -m src.cli run`).
+
+Jobs run one at a time on the scheduler thread: they share one Bybit rate-limit budget
+and one set of clients, so running them back to back is both cheaper and kinder to the
+exchange than overlapping them. A job that overruns its next slot skips the missed runs
+instead of firing them in a burst. Daily times are wall-clock times in the scheduler's
+timezone (REPORT_TIMEZONE, so a report runs at the end of the day it reports on; default
+the system's local time).
+"""
+import threading
+import time
+from datetime import datetime, timedelta, tzinfo
+from typing import Callable, List, Optional
+
+from ..utils import metrics
+from ..utils.logger import log, log_context
+
+JOB_RUNS = metrics.counter("scheduler_job_runs_total", "Scheduled job runs by outcome", ("job", "result"))
+JOB_SECONDS = metrics.histogram("scheduler_job_seconds", "Scheduled job run time", ("job",),
+                                buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800))
+
+
+class Job:
+    """A named callable run every `interval` seconds, or daily at `at` ("HH:MM") in `tz` (None: local time)."""
+
+    def __init__(self, name: str, function: Callable[[], object], interval: Optional[float] = None,
+                 at: Optional[str] = None, tz: Optional[tzinfo] = None):
+        if (interval is None) == (at is None):
+            raise ValueError(f"Job {name} needs exactly one of interval or at")
+        self.name = name
+        self.function = function
+        self.interval = interval
+        self.at = _parse_time_of_day(at) if at is not None else None
+        self.tz = tz
+        self.next_run: Optional[float] = None
+        self.last_run: Optional[float] = None
+        self.last_result: Optional[str] = None
+
+    def schedule_next(self, now: float):
+        if self.interval is not None:
+            if self.next_run is None:
+                self.next_run = now + self.interval
+            while self.next_run <= now:
+                self.next_run += self.interval
+            return
+        hour, minute = self.at
+        candidate = datetime.fromtimestamp(now, self.tz).replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if candidate.timestamp() <= now:
+            candidate += timedelta(days=1)
+        self.next_run = candidate.timestamp()
+
+    def describe(self) -> str:
+        if self.interval is not None:
+            return f"every {self.interval / 60:g} min"
+        return f"daily at {self.at[0]:02d}:{self.at[1]:02d}"
+
+
+class Scheduler:
+    def __init__(self, clock: Callable[[], float] = time.time, tz: Optional[tzinfo] = None):
+        self.clock = clock
+        self.tz = tz
+        self.jobs: List[Job] = []
+        self._stop = threading.Event()
+
+    def every(self, name: str, seconds: float, function: Callable[[], object], run_at_start: bool = False) -> Job:
+        job = Job(name, function, interval=seconds)
+        job.schedule_next(self.clock())
+        if run_at_start:
+            job.next_run = self.clock()
+        self.jobs.append(job)
+        return job
+
+    def daily(self, name: str, at: str, function: Callable[[], object]) -> Job:
+        job = Job(name, function, at=at, tz=self.tz)
+        job.schedule_next(self.clock())
+        self.jobs.append(job)
+        return job
+
+    def run_job(self, job: Job):
+        started = time.perf_counter()
+        job.last_run = self.clock()
+        try:
+            with log_context(job=job.name):
+                job.function()
+        except Exception as e:
+            job.last_result = "error"
+            log.error(f"Scheduled job '{job.name}' failed: {e}", exc_info=True)
+        else:
+            job.last_result = "ok"
+        elapsed = time.perf_counter() - started
+        JOB_RUNS.inc(job=job.name, result=job.last_result)
+        JOB_SECONDS.observe(elapsed, job=job.name)
+        log.info(f"Scheduled job '{job.name}' {job.last_result} in {elapsed:.2f}s")
+
+    def run_pending(self) -> int:
+        """Runs every job that is due, oldest due first. Returns how many ran."""
+        ran = 0
+        for job in sorted(self.jobs, key=lambda j: j.next_run):
+            if self._stop.is_set() or job.next_run > self.clock():
+                continue
+            self.run_job(job)
+            job.schedule_next(self.clock())
+            ran += 1
+        return ran
+
+    def seconds_until_next(self) -> Optional[float]:
+        if not self.jobs:
+            return None
+        return max(min(job.next_run for job in self.jobs) - self.clock(), 0.0)
+
+    def run_forever(self):
+        """Blocks running due jobs until `stop()` is called."""
+        for job in self.jobs:
+            log.info(f"Scheduled '{job.name}' {job.describe()}, next at "
+                     f"{datetime.fromtimestamp(job.next_run, self.tz).strftime('%Y-%m-%d %H:%M:%S %Z')}")
+        if not self.jobs:
+            log.warning("Scheduler started with no jobs configured.")
+        while not self._stop.is_set():
+            self.run_pending()
+            wait = self.seconds_until_next()
+            # Re-check at least every minute so wall-clock jumps (sleep, NTP) are picked up
+            self._stop.wait(60.0 if wait is None else min(wait, 60.0))
+        log.info("Scheduler stopped.")
+
+    def stop(self):
+        self._stop.set()
+
+
+def _parse_time_of_day(value: str):
+    try:
+        hour, minute = (int(part) for part in value.strip().split(":"))
+    except ValueError:
+        raise ValueError(f"Invalid time of day '{value}', expected HH:MM")
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Invalid time of day '{value}', expected HH:MM")
+    return hour, minute
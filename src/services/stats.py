@@ -1,36 +1,56 @@
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 import time
 from typing import Dict, Any, Tuple
 from ..adapters.bybit import BybitAdapter
+from ..adapters.models import ZERO, ClosedPnl
 from ..utils.logger import log
+from .analytics import PnlAnalytics
+from .pnl_aggregates import PnlAggregates, combine
+from .pnl_store import ClosedPnlStore, ExecutionStore
+from .position_cycles import PositionCycleIndex
 
 class StatsService:
-    def __init__(self, exchange_adapter: BybitAdapter):
+    def __init__(self, exchange_adapter: BybitAdapter, pnl_store: ClosedPnlStore = None, tz=None,
+                 execution_store: ExecutionStore = None):
+        """
+        Args:
+            pnl_store: Local closed-PnL history the statistics are computed from
+                (default: an in-memory store over `exchange_adapter`).
+            tz: Reporting timezone for days and months (None: system local time).
+            execution_store: Local fill history position cycles are rebuilt from
+                (default: an in-memory store over `exchange_adapter`).
+        """
         self.adapter = exchange_adapter
+        self.pnl_store = pnl_store if pnl_store is not None else ClosedPnlStore(exchange_adapter)
+        # Per-day / per-month buckets, kept current by the store as records arrive
+        self.aggregates = PnlAggregates(tz)
+        self.pnl_store.subscribe(self.aggregates.add)
+        # Drawdown, profit factor, Sharpe/Sortino, streaks, per-symbol (NumPy, cached per range)
+        self.analytics = PnlAnalytics(self.pnl_store, tz=tz)
+        # Position lifecycles by (symbol, side, cycle), kept current by both stores
+        self.execution_store = execution_store if execution_store is not None else ExecutionStore(exchange_adapter)
+        self.cycles = PositionCycleIndex(self.pnl_store, self.execution_store)
 
     def get_start_of_day_timestamp(self) -> int:
-        now = datetime.now()
-        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        return int(start_of_day.timestamp() * 1000)
+        return self.aggregates.start_ms(self.aggregates.now().date())
 
     def get_start_of_month_timestamp(self) -> int:
-        now = datetime.now()
-        start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        return int(start_of_month.timestamp() * 1000)
+        return self.aggregates.start_ms(self.aggregates.now().date().replace(day=1))
 
     def calculate_pnl_stats(self, pnl_records: list) -> Dict[str, Any]:
         """
-        Calculates detailed PnL statistics from a list of records.
+        Calculates detailed PnL statistics from a list of ClosedPnl records (raw dicts are parsed).
+        Sums are exact; results are returned as floats for formatting.
         """
-        total_pnl = 0.0
+        total_pnl = ZERO
         wins = 0
         losses = 0
-        max_win = 0.0
-        max_loss = 0.0
+        max_win = ZERO
+        max_loss = ZERO
         
         for record in pnl_records:
-            pnl = float(record.get("closedPnl", 0))
+            pnl = ClosedPnl.coerce(record).closed_pnl or ZERO
             total_pnl += pnl
             
             if pnl > 0:
@@ -43,21 +63,20 @@ class StatsService:
                     max_loss = pnl
                 
         return {
-            "pnl": total_pnl,
+            "pnl": float(total_pnl),
             "wins": wins,
             "losses": losses,
-            "max_win": max_win,
-            "max_loss": max_loss
+            "max_win": float(max_win),
+            "max_loss": float(max_loss)
         }
 
     def get_daily_report_data(self) -> Dict[str, Any]:
         try:
             # User requested to REMOVE Equity and Monthly stats.
             # 1. Get Daily PnL
-            start_today = self.get_start_of_day_timestamp()
-            daily_records = self.adapter.get_closed_pnl(category="linear", start_time=start_today)
-            
-            stats = self.calculate_pnl_stats(daily_records)
+            today = self.aggregates.now().date()
+            self.pnl_store.ensure_since(self.aggregates.start_ms(today))
+            stats = self.aggregates.day(today).to_stats()
 
             return {
                 "daily_pnl": stats["pnl"],
@@ -76,31 +95,14 @@ class StatsService:
         Fetches PnL records for the last N days and groups them by date.
         """
         try:
-            now = datetime.now()
-            # Calculate start time (N days ago at 00:00)
-            start_date = (now - timedelta(days=days-1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            start_timestamp = int(start_date.timestamp() * 1000)
+            start_date = self.aggregates.now().date() - timedelta(days=days-1)
+            log.info(f"Loading PnL records since {start_date.isoformat()}")
+            self.pnl_store.ensure_since(self.aggregates.start_ms(start_date))
+            last_days = self.aggregates.last_days(days)
             
-            log.info(f"Fetching PnL records since {start_date.strftime('%Y-%m-%d %H:%M:%S')}")
-            records = self.adapter.get_closed_pnl(category="linear", start_time=start_timestamp)
-            log.info(f"Fetched {len(records)} records for multi-day stats.")
-            
-            # Group by date
-            daily_groups = {}
-            for day_offset in range(days):
-                target_date = (start_date + timedelta(days=day_offset)).strftime("%m-%d")
-                daily_groups[target_date] = 0.0
-                
-            total_period_pnl = 0.0
-            for record in records:
-                pnl = float(record.get("closedPnl", 0))
-                # Bybit v5 closedPnl record updatedTime is in ms
-                updated_time = int(record.get("updatedTime", 0))
-                date_str = datetime.fromtimestamp(updated_time / 1000).strftime("%m-%d")
-                
-                if date_str in daily_groups:
-                    daily_groups[date_str] += pnl
-                    total_period_pnl += pnl
+            # One bucket per day, report floats
+            daily_groups = {day.strftime("%m-%d"): float(bucket.pnl) for day, bucket in last_days}
+            total_period_pnl = float(combine(bucket for _, bucket in last_days).pnl)
             
             log.info(f"Multi-day stats calculated: {daily_groups}, Total: {total_period_pnl}")
             return {
@@ -113,72 +115,74 @@ class StatsService:
             log.error(f"Error calculating multi-day stats: {e}")
             return {}
 
+    def get_monthly_stats(self) -> Dict[str, Any]:
+        """Current calendar month's PnL stats (monthly_* keys, as read by the bot's report embed)."""
+        try:
+            start_month = self.get_start_of_month_timestamp()
+            self.pnl_store.ensure_since(start_month)
+            today = self.aggregates.now().date()
+            stats = self.aggregates.month(today.year, today.month).to_stats()
+            return {
+                "monthly_pnl": stats["pnl"],
+                "monthly_wins": stats["wins"],
+                "monthly_losses": stats["losses"]
+            }
+        except Exception as e:
+            log.error(f"Error fetching monthly stats: {e}")
+            return {}
+
+    def get_performance_analytics(self, days: int = 30, capital: float = None) -> Dict[str, Any]:
+        """
+        Performance analytics (see src/services/analytics.py) of the last N calendar days.
+        `capital` turns drawdown and Sharpe/Sortino into percentages of account equity.
+        """
+        start_date = self.aggregates.now().date() - timedelta(days=days-1)
+        start_ms = self.aggregates.start_ms(start_date)
+        self.pnl_store.ensure_since(start_ms)
+        return self.analytics.analyze(start_ms, capital=capital)
+
     def get_closed_pnl_by_order(self, symbol: str, order_id: str) -> float:
         """
         Fetches the closed PnL for a specific order ID.
         Returns None if not found (e.g. opening trade).
         """
         try:
-            records = self.adapter.get_closed_pnl(category="linear", limit=20)
-            for record in records:
-                if record.get("orderId") == order_id:
-                    return float(record.get("closedPnl", 0))
+            self.pnl_store.refresh(force=True)  # Called right after a fill; the record must be new
+            for record in self.pnl_store.latest(20):
+                if record.order_id == order_id:
+                    return float(record.closed_pnl or ZERO)
             return None
         except Exception as e:
             log.error(f"Error fetching PnL for order {order_id}: {e}")
             return None
 
-    def get_last_closed_position_stats(self) -> Dict[str, Any]:
+    def get_last_closed_position_stats(self, symbol: str = None) -> Dict[str, Any]:
         """
-        Fetches and aggregates the most recent closed position.
-        Uses 'Same Average Entry Price' clustering to identify records belonging to the same position cycle.
+        Aggregates the most recently closed position cycle (optionally of one symbol), rebuilt
+        from fills: every partial close since the position opened, across scale-ins.
+        `side` is the closing side, as on the closed-PnL records; the cycle's own fields
+        (positionSide, cycle, openedAt, closedAt, fees, scaleIns, partialCloses) are included.
         """
         try:
-            records = self.adapter.get_closed_pnl(category="linear", limit=50)
-            if not records:
+            self.cycles.refresh()
+            cycle = self.cycles.last_closed(symbol=symbol)
+            if cycle is None:
                 return None
-                
-            last_record = records[0]
-            target_symbol = last_record.get("symbol")
-            target_side = last_record.get("side")
-            target_avg_entry = float(last_record.get("avgEntryPrice", 0))
-            
-            relevant_records = [
-                r for r in records 
-                if r.get("symbol") == target_symbol and r.get("side") == target_side
-            ]
-            
-            total_pnl = 0.0
-            total_qty = 0.0
-            weighted_price_sum = 0.0
-            count = 0
-            
-            for rec in relevant_records:
-                current_entry_price = float(rec.get("avgEntryPrice", 0))
-                if abs(current_entry_price - target_avg_entry) < 0.0001:
-                     qty = float(rec.get("qty", 0) or rec.get("closedSize", 0))
-                     pnl = float(rec.get("closedPnl", 0))
-                     price = float(rec.get("avgExitPrice", 0))
-                     
-                     total_pnl += pnl
-                     total_qty += qty
-                     weighted_price_sum += (price * qty)
-                     count += 1
-                else:
-                    break
-            
-            avg_exit_price = (weighted_price_sum / total_qty) if total_qty > 0 else 0
-            
-            return {
-                "symbol": target_symbol,
-                "side": target_side,
-                "closedPnl": total_pnl,
-                "qty": total_qty,
-                "avgExitPrice": avg_exit_price,
-                "avgEntryPrice": target_avg_entry,
-                "record_count": count
-            }
-            
+            stats = cycle.to_dict()
+            stats["positionSide"] = stats["side"]
+            stats["side"] = cycle.pnl_records[-1].side if cycle.pnl_records else ("Sell" if cycle.side == "Buy" else "Buy")
+            return stats
+
         except Exception as e:
             log.error(f"Error fetching last closed position: {e}")
             return None
+
+    def get_position_cycles(self, days: int = 7, symbol: str = None) -> Dict[str, Any]:
+        """Position cycles closed in the last N calendar days (oldest first) and the ones still open."""
+        start_date = self.aggregates.now().date() - timedelta(days=days-1)
+        start_ms = self.aggregates.start_ms(start_date)
+        self.cycles.ensure_since(start_ms)
+        return {
+            "closed": [cycle.to_dict() for cycle in self.cycles.closed_between(start_ms, symbol=symbol)],
+            "open": [cycle.to_dict() for cycle in self.cycles.open_cycles() if symbol is None or cycle.symbol == symbol]
+        }
@@ -1,30 +1,83 @@
 # src/services/sync.py
+import threading
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
 
 from ..adapters.base import BaseExchangeAdapter
+from ..adapters.models import ZERO, Transaction
 from ..clients.notion import NotionClient
+from ..utils import metrics
 from ..utils.logger import log
+from ..utils.sync_profile import SyncRunHistory, SyncRunProfile
+
+SYNC_PHASE = metrics.histogram("sync_phase_seconds", "Sync run time per phase (watermark, fetch, aggregate, dedup, write, total)",
+                               ("phase",), buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800))
+SYNC_RUNS = metrics.counter("sync_runs_total", "Completed sync runs by outcome", ("result",))
 
 class SyncService:
     """
     Orchestrates the synchronization process between an exchange and Notion.
     """
 
-    def __init__(self, exchange_adapter: BaseExchangeAdapter, notion_client: NotionClient):
+    def __init__(self, exchange_adapter: BaseExchangeAdapter, notion_client: NotionClient,
+                 history_path: Optional[str] = None):
+        """
+        Args:
+            history_path: JSON-lines file each run's profile is appended to (None disables).
+        """
         self.exchange = exchange_adapter
         self.notion = notion_client
+        self.history = SyncRunHistory(history_path) if history_path else None
+        self.last_run: Optional[SyncRunProfile] = None
+        # The monitor's auto-sync and the scheduler share one service; runs never overlap
+        self._run_lock = threading.Lock()
 
     def run_sync(self, silent: bool = False):
         """
         Runs the main synchronization logic with support for multi-window fetching.
         :param silent: If True, suppresses external notifications (prepared for future use if SyncService triggers alerts independently)
         """
+        if not self._run_lock.acquire(blocking=False):
+            log.info("A synchronization is already running; skipping this one.")
+            return
+        try:
+            self._run(silent)
+        finally:
+            self._run_lock.release()
+
+    def _run(self, silent: bool):
         log.info(f"Starting synchronization process... (Silent Mode: {silent})")
-        
+        profile = SyncRunProfile(silent=silent)
+        try:
+            with profile.activate():
+                written = self._run_phases(profile)
+        except Exception as e:
+            profile.finish("error", error=str(e))
+            raise
+        else:
+            profile.finish("written" if written else "empty")
+        finally:
+            self._record_run(profile)
+
+    def _record_run(self, profile: SyncRunProfile):
+        self.last_run = profile
+        for phase, seconds in profile.phases.items():
+            SYNC_PHASE.observe(seconds, phase=phase)
+        SYNC_PHASE.observe(profile.total, phase="total")
+        SYNC_RUNS.inc(result=profile.result)
+        if self.history:
+            self.history.append(profile)
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in profile.phases.items())
+        log.info(f"Sync run {profile.result} in {profile.total:.2f}s ({phases}; "
+                 f"{len(profile.windows)} windows, retries {sum(profile.retries.values())})")
+
+    def _run_phases(self, profile: SyncRunProfile) -> bool:
+        """Watermark, fetch, aggregate and write steps of run_sync. Returns whether anything was written."""
         # 1. Determine the time window
-        last_sync_ms = self.notion.get_last_sync_timestamp()
+        with profile.phase("watermark"):
+            last_sync_ms = self.notion.get_last_sync_timestamp()
         
         # Default start date (e.g., for backfill)
         backfill_start_ms = int(datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
@@ -46,29 +99,57 @@ class SyncService:
         all_transactions = []
         current_start = start_time_ms
         
-        while current_start < end_time_ms:
-            # 7 days max per request
-            current_end = min(current_start + (7 * 24 * 60 * 60 * 1000) - 1, end_time_ms)
-            
-            log.info(f"Fetching chunk from {datetime.fromtimestamp(current_start/1000, tz=timezone.utc)} to {datetime.fromtimestamp(current_end/1000, tz=timezone.utc)}")
-            
-            try:
-                chunk_txs = self.exchange.fetch_transaction_log(
-                    account_type="UNIFIED", 
-                    category="linear", 
-                    start_time=int(current_start), 
-                    end_time=int(current_end)
-                )
-                all_transactions.extend(chunk_txs)
-            except Exception as e:
-                log.error(f"Error fetching chunk: {e}")
-                break
+        with profile.phase("fetch"):
+            while current_start < end_time_ms:
+                # 7 days max per request
+                current_end = min(current_start + (7 * 24 * 60 * 60 * 1000) - 1, end_time_ms)
+                
+                log.info(f"Fetching chunk from {datetime.fromtimestamp(current_start/1000, tz=timezone.utc)} to {datetime.fromtimestamp(current_end/1000, tz=timezone.utc)}")
                 
-            current_start = current_end + 1
+                window_started = time.perf_counter()
+                try:
+                    chunk_txs = self.exchange.fetch_transaction_records(
+                        account_type="UNIFIED", 
+                        category="linear", 
+                        start_time=int(current_start), 
+                        end_time=int(current_end)
+                    )
+                    all_transactions.extend(chunk_txs)
+                    profile.add_window(current_start, current_end, time.perf_counter() - window_started, len(chunk_txs))
+                except Exception as e:
+                    profile.add_window(current_start, current_end, time.perf_counter() - window_started, 0, error=str(e))
+                    log.error(f"Error fetching chunk: {e}")
+                    break
+                    
+                current_start = current_end + 1
 
         log.info(f"Total transactions retrieved: {len(all_transactions)}")
+        profile.count("transactions", len(all_transactions))
 
         # 4. Process and Aggregation
+        pnl_threshold = 0.5
+        with profile.phase("aggregate"):
+            notion_records = self.aggregate_transactions(all_transactions, pnl_threshold)
+        profile.count("records", len(notion_records))
+        
+        if not notion_records:
+            log.info("No records matching the filter were found.")
+            return False
+
+        log.info(f"Processed {len(notion_records)} records (PnL > {pnl_threshold}) to be written to Notion.")
+        
+        # 5. Write to Notion (the client times its dedup queries and page writes into this run)
+        self.notion.create_records(notion_records)
+        log.info("Synchronization process completed successfully.")
+        return True
+
+    @staticmethod
+    def aggregate_transactions(transactions: List[Transaction], pnl_threshold: float = 0.5) -> List[Dict[str, Any]]:
+        """
+        Merges transaction-log TRADE rows into one record per order and keeps those
+        whose aggregated |PnL| is at least `pnl_threshold`, sorted by timestamp.
+        Sums are exact (Decimal); the output carries floats for the Notion API.
+        """
         # Group by (symbol, side, tradeId_prefix) or just tradeId if available to merge split fills.
         # Bybit Transaction Log 'tradeId' is unique for each fill. 'orderId' is unique for the order.
         # However, a single closing order might have multiple fills.
@@ -77,83 +158,57 @@ class SyncService:
         
         aggregated_data = {}
 
-        for tx_record in all_transactions:
-            if tx_record.get("type") != "TRADE":
+        for tx in transactions:
+            tx = Transaction.coerce(tx)
+            if tx.type != "TRADE":
                 continue
                 
-            change = float(tx_record.get("change", 0.0))
-            fee = float(tx_record.get("fee", 0.0))
-            pnl = change + fee
-            
-            # Filter non-zero and above threshold at the individual level? 
-            # Or aggregate first then filter? Usually better to aggregate first to catch split fills that sum up to > threshold.
-            
-            order_id = tx_record.get("orderId")
-            symbol = tx_record.get("symbol")
-            side = tx_record.get("side")
+            fee = tx.fee or ZERO
+            pnl = (tx.change or ZERO) + fee
             
+            # Aggregate first, then filter, to catch split fills that sum up to > threshold.
             # Key for aggregation: Order ID + Symbol + Side
-            key = f"{order_id}_{symbol}_{side}"
+            key = (tx.order_id, tx.symbol, tx.side)
+            timestamp = tx.transaction_time or 0
             
-            if key not in aggregated_data:
-                aggregated_data[key] = {
-                    "symbol": symbol,
-                    "side": side,
-                    "size": 0.0,
-                    "total_value": 0.0, # for weighted avg price
-                    "fee": 0.0,
-                    "pnl": 0.0,
-                    "timestamp": int(tx_record.get("transactionTime")),
-                    "id": order_id, # Use Order ID as the unique ID for Notion
-                    "count": 0
-                }
+            agg = aggregated_data.get(key)
+            if agg is None:
+                # [size, total_value (for weighted avg price), fee, pnl, timestamp, count]
+                agg = aggregated_data[key] = [ZERO, ZERO, ZERO, ZERO, timestamp, 0]
             
-            agg = aggregated_data[key]
-            qty = float(tx_record.get("qty", 0.0))
-            price = float(tx_record.get("tradePrice", 0.0))
-            
-            agg["size"] += qty
-            agg["total_value"] += (qty * price)
-            agg["fee"] += fee
-            agg["pnl"] += pnl
+            qty = tx.qty or ZERO
+            agg[0] += qty
+            agg[1] += qty * (tx.trade_price or ZERO)
+            agg[2] += fee
+            agg[3] += pnl
             # Update timestamp to the latest one in the group
-            agg["timestamp"] = max(agg["timestamp"], int(tx_record.get("transactionTime")))
-            agg["count"] += 1
+            if timestamp > agg[4]:
+                agg[4] = timestamp
+            agg[5] += 1
 
         notion_records = []
-        pnl_threshold = 0.5 
+        threshold = Decimal(str(pnl_threshold))
 
-        for key, agg in aggregated_data.items():
-            final_pnl = agg["pnl"]
-            
+        for (order_id, symbol, side), (size, total_value, fee, pnl, timestamp, _) in aggregated_data.items():
             # Apply threshold filter on the AGGREGATED PnL
-            if abs(final_pnl) < pnl_threshold:
+            if abs(pnl) < threshold:
                 continue
                 
-            avg_price = agg["total_value"] / agg["size"] if agg["size"] > 0 else 0.0
+            avg_price = total_value / size if size > 0 else ZERO
             
             record = {
-                "symbol": agg["symbol"],
-                "side": agg["side"],
-                "size": agg["size"],
-                "price": avg_price,
-                "fee": agg["fee"],
-                "pnl": final_pnl,
-                "timestamp": agg["timestamp"],
+                "symbol": symbol,
+                "side": side,
+                "size": float(size),
+                "price": float(avg_price),
+                "fee": float(fee),
+                "pnl": float(pnl),
+                "timestamp": timestamp,
                 "subaccount": "Main Account",
-                "id": agg["id"] 
+                "id": order_id  # Use Order ID as the unique ID for Notion
             }
             notion_records.append(record)
 
         # Sort all records by timestamp
         notion_records.sort(key=lambda r: r['timestamp'])
-        
-        if not notion_records:
-            log.info("No records matching the filter were found.")
-            return
-
-        log.info(f"Processed {len(notion_records)} records (PnL > {pnl_threshold}) to be written to Notion.")
-        
-        # 5. Write to Notion
-        self.notion.create_records(notion_records)
-        log.info("Synchronization process completed successfully.")
+        return notion_records
@@ -0,0 +1,90 @@
+# src/utils/clock.py
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Optional, Sequence
+
+
+class SystemClock:
+    """Wall clock. `timer` returns an unstarted threading.Timer."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    def timer(self, interval: float, function: Callable, args: Optional[Sequence[Any]] = None):
+        return threading.Timer(interval, function, args=args)
+
+
+class VirtualTimer:
+    """threading.Timer look-alike driven by a VirtualClock."""
+
+    def __init__(self, clock: "VirtualClock", interval: float, function: Callable, args: Optional[Sequence[Any]] = None):
+        self.clock = clock
+        self.interval = interval
+        self.function = function
+        self.args = list(args or [])
+        self.cancelled = False
+        self.daemon = True
+
+    def start(self):
+        self.clock._schedule(self)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class VirtualClock:
+    """
+    Deterministic clock for replays. Time only moves via `advance_to`, which also
+    fires due timers in order on the calling thread. `sleep` moves time forward
+    without firing timers (it is only reached from inside callbacks).
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self._queue = []
+        self._seq = itertools.count()
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += max(seconds, 0)
+
+    def timer(self, interval: float, function: Callable, args: Optional[Sequence[Any]] = None) -> VirtualTimer:
+        return VirtualTimer(self, interval, function, args)
+
+    def _schedule(self, timer: VirtualTimer):
+        heapq.heappush(self._queue, (self.now + timer.interval, next(self._seq), timer))
+
+    def next_due(self) -> Optional[float]:
+        while self._queue and self._queue[0][2].cancelled:
+            heapq.heappop(self._queue)
+        return self._queue[0][0] if self._queue else None
+
+    def advance_to(self, target: float) -> int:
+        """Moves time to `target`, firing every timer due on the way. Returns how many fired."""
+        fired = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > target:
+                break
+            _, _, timer = heapq.heappop(self._queue)
+            self.now = max(self.now, due)
+            timer.function(*timer.args)
+            fired += 1
+        self.now = max(self.now, target)
+        return fired
+
+    def run_pending(self) -> int:
+        """Fires every remaining timer (advancing time as needed)."""
+        due = self.next_due()
+        fired = 0
+        while due is not None:
+            fired += self.advance_to(due)
+            due = self.next_due()
+        return fired
@@ -0,0 +1,58 @@
+# src/utils/json_codec.py
+"""
+JSON encode/decode used on the REST, WebSocket and webhook paths.
+
+Uses orjson when it is installed and the standard library otherwise. Set
+JSON_CODEC=stdlib to force the fallback (e.g. to compare both in benchmarks).
+Callers should go through the module (`json_codec.loads(...)`) so `set_backend`
+takes effect everywhere.
+"""
+import json
+import os
+from typing import Any, Callable, Union
+
+from .. import config  # noqa: F401  Loads .env first, so JSON_CODEC set there applies
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+BACKEND = "stdlib"
+loads: Callable[[Union[str, bytes, bytearray]], Any] = json.loads
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    return _stdlib_dumps(obj).encode("utf-8")
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _orjson_dumps_bytes(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+dumps: Callable[[Any], str] = _stdlib_dumps
+dumps_bytes: Callable[[Any], bytes] = _stdlib_dumps_bytes
+
+
+def set_backend(name: str) -> str:
+    """Selects "orjson" or "stdlib" (orjson falls back to stdlib if not installed). Returns the active backend."""
+    global BACKEND, loads, dumps, dumps_bytes
+    if name == "orjson" and orjson is not None:
+        BACKEND, loads, dumps, dumps_bytes = "orjson", orjson.loads, _orjson_dumps, _orjson_dumps_bytes
+    else:
+        BACKEND, loads, dumps, dumps_bytes = "stdlib", json.loads, _stdlib_dumps, _stdlib_dumps_bytes
+    return BACKEND
+
+
+set_backend(os.getenv("JSON_CODEC", "orjson"))
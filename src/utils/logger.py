@@ -1,37 +1,198 @@
 # src/utils/logger.py
+"""
+Centralized application logger.
+
+Records are put on an in-memory queue by the calling thread and written to stdout and
+'sync.log' by a background listener, so file I/O and log rotation never run on the
+WebSocket thread. Configured from the environment when imported (src.config is
+imported first, so these can also be set in .env):
+
+    LOG_FORMAT=json      one JSON object per line, including `extra` fields such as
+                         event_id / topic / symbol / latency_ms
+    LOG_QUEUE=0          write synchronously from the calling thread (debugging)
+    LOG_SAMPLE_INTERVAL  seconds between sampled per-message logs per key (default 10)
+"""
+import atexit
 import logging
+import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional, Tuple
+
+from .. import config  # noqa: F401  Loads .env first, so LOG_* set there apply
+
+# LogRecord attributes that are not `extra` fields
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_context = threading.local()
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, thread, msg, plus any `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        from . import json_codec
+
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json_codec.dumps(entry)
+
+
+class EventContextFilter(logging.Filter):
+    """Adds the fields set with `log_context(...)` on the emitting thread to each record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = getattr(_context, "fields", None)
+        if fields:
+            for key, value in fields.items():
+                if not hasattr(record, key):
+                    setattr(record, key, value)
+        return True
+
+
+class _ContextQueueHandler(QueueHandler):
+    """QueueHandler that keeps `extra` fields on the queued record (the stock one only keeps msg)."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now (on the caller's thread); everything else is copied as is
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class log_context:
+    """Tags every record logged on this thread inside the block, e.g. `with log_context(event_id=..., topic=...)`."""
+
+    __slots__ = ("fields", "previous")
+
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def __enter__(self):
+        self.previous = previous = getattr(_context, "fields", None)
+        _context.fields = {**previous, **self.fields} if previous else self.fields
+        return self
+
+    def __exit__(self, *exc):
+        _context.fields = self.previous
+        return False
+
+
+class LogSampler:
+    """
+    Rate-limits noisy per-message logs: at most one record per key every `interval`
+    seconds. The next emitted record carries the number of suppressed ones.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 10.0):
+        self.logger = logger
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._state: Dict[str, Tuple[float, int]] = {}  # key -> (last emitted at, suppressed since)
+
+    def log(self, level: int, key: str, msg: str, *args, stacklevel: int = 2, **kwargs):
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            last, suppressed = self._state.get(key, (None, 0))
+            if last is not None and now - last < self.interval:
+                self._state[key] = (last, suppressed + 1)
+                return
+            self._state[key] = (now, 0)
+        if suppressed:
+            extra = dict(kwargs.pop("extra", None) or {})
+            extra["suppressed"] = suppressed
+            kwargs["extra"] = extra
+            msg = f"{msg} (+{suppressed} similar suppressed)"
+        self.logger.log(level, msg, *args, stacklevel=stacklevel, **kwargs)
+
+    def info(self, key: str, msg: str, *args, **kwargs):
+        self.log(logging.INFO, key, msg, *args, stacklevel=3, **kwargs)
+
+    def debug(self, key: str, msg: str, *args, **kwargs):
+        self.log(logging.DEBUG, key, msg, *args, stacklevel=3, **kwargs)
+
 
 def setup_logger():
     """
     Sets up a centralized logger for the application.
     """
+    global _listener
     logger = logging.getLogger("SyncServiceLogger")
     logger.setLevel(logging.INFO)
 
     # Prevent duplicate handlers if logger is already configured
     if logger.hasHandlers():
         logger.handlers.clear()
+    stop_logging()
 
     # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
 
     # Console Handler
     stdout_handler = logging.StreamHandler(sys.stdout)
     stdout_handler.setFormatter(formatter)
-    logger.addHandler(stdout_handler)
 
     # File Handler
     # Creates a 'sync.log' file in the project root directory
     file_handler = RotatingFileHandler('sync.log', maxBytes=1024*1024*5, backupCount=2) # 5MB per file, 2 backups
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
+    if os.getenv("LOG_QUEUE", "1").lower() in ("0", "false", "no"):
+        for handler in (stdout_handler, file_handler):
+            handler.addFilter(EventContextFilter())
+            logger.addHandler(handler)
+        return logger
+
+    # Writers run on the listener thread; the calling thread only enqueues
+    queue_handler = _ContextQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(EventContextFilter())
+    logger.addHandler(queue_handler)
+    _listener = QueueListener(queue_handler.queue, stdout_handler, file_handler, respect_handler_level=True)
+    _listener.start()
     return logger
 
+
+def stop_logging():
+    """Flushes queued records and stops the background writer (registered at exit)."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(stop_logging)
+
 # Create a logger instance to be imported by other modules
 log = setup_logger()
+sampled_log = LogSampler(log, interval=float(os.getenv("LOG_SAMPLE_INTERVAL", "10")))
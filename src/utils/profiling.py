@@ -0,0 +1,299 @@
+# src/utils/profiling.py
+"""
+On-demand profiling for the long-running monitor. Nothing is installed or sampled
+until a session is requested, so there is no overhead while profiling is off.
+
+Triggers:
+    kill -USR1 <pid>    CPU profile for PROFILE_SECONDS (cProfile of the main thread,
+                        which runs the WebSocket callbacks)
+    kill -USR2 <pid>    per-thread stack dump + tracemalloc snapshot (diffed against
+                        the first snapshot, which starts tracemalloc)
+    PROFILE_CONTROL_PORT  local HTTP control endpoint (127.0.0.1 only):
+        GET /profile/cpu?seconds=30&mode=sample|cprofile
+        GET /profile/memory            (?stop=1 stops tracemalloc)
+        GET /profile/stacks
+        GET /profile/status
+
+Mode "sample" samples the stacks of all threads every PROFILE_SAMPLE_INTERVAL seconds
+and writes collapsed stacks (flamegraph.pl / speedscope input) plus a top-functions
+report. Results are written to PROFILE_DIR (data/profiles, i.e. /app/data/profiles
+in the container).
+"""
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .logger import log
+
+DEFAULT_SECONDS = 30.0
+DEFAULT_SAMPLE_INTERVAL = 0.005
+TRACEMALLOC_FRAMES = 10
+TOP_N = 50
+
+
+class ProfilerControl:
+    """Runs one CPU session at a time; memory snapshots and stack dumps can be taken at any time."""
+
+    def __init__(self, output_dir: str = "data/profiles", default_seconds: float = DEFAULT_SECONDS,
+                 sample_interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.output_dir = output_dir
+        self.default_seconds = default_seconds
+        self.sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._cpu_session: Optional[Dict[str, Any]] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._main_commands: List[str] = []  # cProfile start/stop requests for the main thread
+        self._memory_baseline: Optional[tracemalloc.Snapshot] = None
+
+    # ------------------------------------------------------------------ triggers
+
+    def install_signal_handlers(self):
+        """SIGUSR1 -> CPU profile, SIGUSR2 -> stacks + memory. Must be called from the main thread."""
+        if not hasattr(signal, "SIGUSR1"):
+            log.info("Profiling signals are not available on this platform; use PROFILE_CONTROL_PORT.")
+            return
+        signal.signal(signal.SIGUSR1, self._on_sigusr1)
+        signal.signal(signal.SIGUSR2, lambda signum, frame: self._run_in_background(self._dump_on_signal))
+
+    def _on_sigusr1(self, signum, frame):
+        # Runs on the main thread: either a queued cProfile command or an external request
+        with self._lock:
+            command = self._main_commands.pop(0) if self._main_commands else None
+        if command == "enable" and self._profile is not None:
+            self._profile.enable()
+        elif command == "disable" and self._profile is not None:
+            self._profile.disable()
+        elif command is None:
+            self._run_in_background(lambda: self.start_cpu(mode="cprofile"))
+
+    def _dump_on_signal(self):
+        self.dump_stacks()
+        self.snapshot_memory()
+
+    @staticmethod
+    def _run_in_background(target):
+        # Keep file I/O out of the signal handler
+        threading.Thread(target=target, name="profiler-control", daemon=True).start()
+
+    # ------------------------------------------------------------------ CPU
+
+    def start_cpu(self, seconds: Optional[float] = None, mode: str = "sample") -> Dict[str, Any]:
+        """Starts a CPU session that stops itself after `seconds`. Returns its status."""
+        seconds = float(seconds or self.default_seconds)
+        if mode == "cprofile" and not hasattr(signal, "SIGUSR1"):
+            mode = "sample"  # The main thread can only be reached through a signal
+        if mode not in ("sample", "cprofile"):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        with self._lock:
+            if self._cpu_session is not None:
+                return {"started": False, "reason": "a CPU session is already running", **self._cpu_session}
+            path = self._path(f"cpu-{mode}", "txt")
+            self._cpu_session = {"mode": mode, "seconds": seconds, "started_at": time.time(), "output": path}
+        log.warning(f"Profiling: {mode} CPU session for {seconds:.0f}s -> {path}")
+        target = self._sample_session if mode == "sample" else self._cprofile_session
+        threading.Thread(target=target, args=(seconds, path), name="profiler-cpu", daemon=True).start()
+        return {"started": True, **self._cpu_session}
+
+    def _cprofile_session(self, seconds: float, path: str):
+        self._profile = cProfile.Profile()
+        try:
+            self._signal_main_thread("enable")
+            time.sleep(seconds)
+            self._signal_main_thread("disable")
+            time.sleep(0.5)  # Let the main thread run the handler
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats("cumulative").print_stats(TOP_N)
+            stats.sort_stats("tottime").print_stats(TOP_N)
+            stats.dump_stats(path[:-4] + ".prof")
+            self._write(path, f"cProfile of the main thread for {seconds:.0f}s\n\n{stream.getvalue()}")
+        except Exception as e:
+            log.error(f"Profiling: cProfile session failed: {e}")
+        finally:
+            self._profile = None
+            self._finish_cpu()
+
+    def _signal_main_thread(self, command: str):
+        with self._lock:
+            self._main_commands.append(command)
+        signal.pthread_kill(threading.main_thread().ident, signal.SIGUSR1)
+
+    def _sample_session(self, seconds: float, path: str):
+        own = threading.get_ident()
+        names = {}
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        try:
+            while time.monotonic() < deadline:
+                for ident, frame in sys._current_frames().items():
+                    if ident == own:
+                        continue
+                    if ident not in names:
+                        names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    stacks[(names.get(ident, str(ident)), _collapse(frame))] += 1
+                samples += 1
+                time.sleep(self.sample_interval)
+
+            collapsed = "".join(f"{thread};{stack} {count}\n" for (thread, stack), count in stacks.most_common())
+            self._write(path[:-4] + ".collapsed", collapsed)
+            self._write(path, _sample_report(stacks, samples, seconds))
+        except Exception as e:
+            log.error(f"Profiling: sampling session failed: {e}")
+        finally:
+            self._finish_cpu()
+
+    def _finish_cpu(self):
+        with self._lock:
+            session, self._cpu_session = self._cpu_session, None
+        if session:
+            log.warning(f"Profiling: CPU session finished -> {session['output']}")
+
+    # ------------------------------------------------------------------ memory / stacks
+
+    def snapshot_memory(self, stop: bool = False) -> Dict[str, Any]:
+        """First call starts tracemalloc and records the baseline; later calls write top allocations and the diff."""
+        if stop:
+            tracemalloc.stop()
+            self._memory_baseline = None
+            log.warning("Profiling: tracemalloc stopped.")
+            return {"tracing": False}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._memory_baseline = tracemalloc.take_snapshot()
+            log.warning("Profiling: tracemalloc started; baseline recorded. Take another snapshot to diff.")
+            return {"tracing": True, "baseline": True}
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"Traced memory: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB", "",
+                 f"Top {TOP_N} allocation sites:"]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:TOP_N]]
+        if self._memory_baseline is not None:
+            lines += ["", f"Top {TOP_N} changes since the baseline:"]
+            lines += [str(stat) for stat in snapshot.compare_to(self._memory_baseline, "lineno")[:TOP_N]]
+        path = self._path("memory", "txt")
+        self._write(path, "\n".join(lines) + "\n")
+        snapshot.dump(path[:-4] + ".snapshot")
+        log.warning(f"Profiling: memory snapshot -> {path}")
+        return {"tracing": True, "output": path, "current_bytes": current, "peak_bytes": peak}
+
+    def dump_stacks(self) -> Dict[str, Any]:
+        names = {thread.ident: (thread.name, thread.daemon) for thread in threading.enumerate()}
+        parts = []
+        for ident, frame in sys._current_frames().items():
+            name, daemon = names.get(ident, (str(ident), None))
+            parts.append(f"--- Thread {name} (ident {ident}{', daemon' if daemon else ''}) ---\n")
+            parts.append("".join(traceback.format_stack(frame)))
+            parts.append("\n")
+        path = self._path("stacks", "txt")
+        self._write(path, "".join(parts))
+        log.warning(f"Profiling: {len(names)} thread stacks -> {path}")
+        return {"threads": len(names), "output": path}
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            session = dict(self._cpu_session) if self._cpu_session else None
+        return {"cpu_session": session, "tracemalloc": tracemalloc.is_tracing(), "threads": threading.active_count(),
+                "output_dir": os.path.abspath(self.output_dir)}
+
+    # ------------------------------------------------------------------ helpers
+
+    def _path(self, kind: str, extension: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, f"{kind}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{extension}")
+
+    @staticmethod
+    def _write(path: str, text: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def _collapse(frame) -> str:
+    """Root-first "file:function:line;..." stack, the collapsed-stack format."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _sample_report(stacks: Counter, samples: int, seconds: float) -> str:
+    """Per-function self and inclusive sample counts across all threads."""
+    own: Counter = Counter()
+    inclusive: Counter = Counter()
+    per_thread: Counter = Counter()
+    for (thread, stack), count in stacks.items():
+        frames = [part.rsplit(":", 1)[0] for part in stack.split(";")]
+        per_thread[thread] += count
+        own[frames[-1]] += count
+        for function in set(frames):
+            inclusive[function] += count
+
+    lines = [f"{samples} samples over {seconds:.0f}s", "", "Samples per thread:"]
+    lines += [f"{count:>8}  {thread}" for thread, count in per_thread.most_common()]
+    lines += ["", f"Top {TOP_N} by self samples (where threads were when sampled):"]
+    lines += [f"{count:>8}  {function}" for function, count in own.most_common(TOP_N)]
+    lines += ["", f"Top {TOP_N} by inclusive samples:"]
+    lines += [f"{count:>8}  {function}" for function, count in inclusive.most_common(TOP_N)]
+    return "\n".join(lines) + "\n"
+
+
+class _ControlHandler(BaseHTTPRequestHandler):
+    control: ProfilerControl = None
+
+    def do_GET(self):
+        from . import json_codec
+
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if url.path == "/profile/cpu":
+                result = self.control.start_cpu(query.get("seconds"), query.get("mode", "sample"))
+            elif url.path == "/profile/memory":
+                result = self.control.snapshot_memory(stop=query.get("stop") in ("1", "true"))
+            elif url.path == "/profile/stacks":
+                result = self.control.dump_stacks()
+            elif url.path == "/profile/status":
+                result = self.control.status()
+            else:
+                self.send_error(404)
+                return
+            status = 200
+        except ValueError as e:
+            result, status = {"error": str(e)}, 400
+        body = json_codec.dumps_bytes(result)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_control_server(control: ProfilerControl, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serves the /profile/* endpoints on a daemon thread (localhost by default)."""
+    handler = type("ProfilerControlHandler", (_ControlHandler,), {"control": control})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="profiler-http", daemon=True).start()
+    log.info(f"Profiling control endpoint listening on http://{host}:{server.server_address[1]}/profile/status")
+    return server
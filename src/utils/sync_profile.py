@@ -0,0 +1,226 @@
+# src/utils/sync_profile.py
+"""
+Structured per-run profile of SyncService.run_sync, with a local run history.
+
+While a run is active on a thread, the adapter and Notion client report into it via
+`run_phase(...)`, `note_count(...)` and `note_retry(...)` (no-ops outside a run). Each
+finished run is appended as one JSON line to the history file. Trends:
+
+    python -m src.utils.sync_profile data/sync_runs.jsonl --last 30 --factor 2
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from . import json_codec
+from .logger import log
+
+# Phases in display order; "fetch" covers all REST windows, listed individually in `windows`
+PHASES = ("watermark", "fetch", "aggregate", "dedup", "write")
+DEFAULT_MEDIAN_WINDOW = 20
+DEFAULT_SLOW_FACTOR = 2.0
+
+_local = threading.local()
+
+
+class SyncRunProfile:
+    """Wall time per phase and per REST window, row counts and retry counts of one sync run."""
+
+    def __init__(self, silent: bool = False):
+        self.started_at = time.time()
+        self.silent = silent
+        self.phases: Dict[str, float] = {}
+        self.windows: List[Dict[str, Any]] = []
+        self.counts: Dict[str, int] = {}
+        self.retries: Dict[str, int] = {}
+        self.total: Optional[float] = None
+        self.result = "running"
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+
+    def phase(self, name: str) -> "_Phase":
+        return _Phase(self, name)
+
+    def add_window(self, start_ms: int, end_ms: int, seconds: float, rows: int, error: Optional[str] = None):
+        window = {"start": start_ms, "end": end_ms, "seconds": round(seconds, 4), "rows": rows}
+        if error:
+            window["error"] = error
+        self.windows.append(window)
+
+    def count(self, name: str, value: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def retry(self, kind: str):
+        self.retries[kind] = self.retries.get(kind, 0) + 1
+
+    def finish(self, result: str, error: Optional[str] = None):
+        self.total = time.perf_counter() - self._started
+        self.result = result
+        self.error = error
+
+    def activate(self) -> "_Activation":
+        """Makes this the current run on this thread for run_phase / note_count / note_retry."""
+        return _Activation(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(timespec="seconds"),
+            "result": self.result,
+            "silent": self.silent,
+            "total": round(self.total or 0.0, 4),
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "windows": self.windows,
+            "counts": self.counts,
+            "retries": self.retries,
+        }
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class _Phase:
+    __slots__ = ("profile", "name", "started")
+
+    def __init__(self, profile: SyncRunProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        phases = self.profile.phases
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.started
+        return False
+
+
+class _Activation:
+    __slots__ = ("profile", "previous")
+
+    def __init__(self, profile: SyncRunProfile):
+        self.profile = profile
+
+    def __enter__(self):
+        self.previous = getattr(_local, "run", None)
+        _local.run = self.profile
+        return self.profile
+
+    def __exit__(self, *exc):
+        _local.run = self.previous
+        return False
+
+
+def current_run() -> Optional[SyncRunProfile]:
+    return getattr(_local, "run", None)
+
+
+def run_phase(name: str):
+    """Times a block into the current run's phase `name` (no-op outside a sync run)."""
+    run = current_run()
+    return run.phase(name) if run is not None else nullcontext()
+
+
+def note_count(name: str, value: int = 1):
+    run = current_run()
+    if run is not None:
+        run.count(name, value)
+
+
+def note_retry(kind: str):
+    run = current_run()
+    if run is not None:
+        run.retry(kind)
+
+
+class SyncRunHistory:
+    """Append-only JSON-lines store of finished runs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, profile: SyncRunProfile):
+        line = json_codec.dumps(profile.to_dict()) + "\n"
+        try:
+            with self._lock:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError as e:
+            log.warning(f"Could not write sync run history to {self.path}: {e}")
+
+    def load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        runs = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    runs.append(json_codec.loads(line))
+                except json_codec.JSONDecodeError:
+                    continue
+        return runs
+
+
+def flag_slow_runs(runs: List[Dict[str, Any]], window: int = DEFAULT_MEDIAN_WINDOW,
+                   factor: float = DEFAULT_SLOW_FACTOR) -> List[List[str]]:
+    """
+    Per run, the measures (total and phases) that took more than `factor` x the median
+    of the previous `window` successful runs. Runs without enough history are not flagged.
+    """
+    flags = []
+    for index, run in enumerate(runs):
+        previous = [r for r in runs[max(0, index - window):index] if r.get("result") != "error"]
+        slow = []
+        if len(previous) >= 3:
+            for measure in ("total",) + PHASES:
+                value = run.get("total") if measure == "total" else run.get("phases", {}).get(measure)
+                history = [r.get("total") if measure == "total" else r.get("phases", {}).get(measure) for r in previous]
+                history = [h for h in history if h]
+                # Sub-100ms phases are noise
+                if value and history and value > 0.1 and value > factor * statistics.median(history):
+                    slow.append(measure)
+        flags.append(slow)
+    return flags
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show sync run history and flag slow runs.")
+    parser.add_argument("path", nargs="?", default="data/sync_runs.jsonl", help="Run history file")
+    parser.add_argument("--last", type=int, default=20, help="Runs to show")
+    parser.add_argument("--window", type=int, default=DEFAULT_MEDIAN_WINDOW, help="Runs in the rolling median")
+    parser.add_argument("--factor", type=float, default=DEFAULT_SLOW_FACTOR, help="Slow if above factor x median")
+    args = parser.parse_args()
+
+    runs = SyncRunHistory(args.path).load()
+    if not runs:
+        print(f"No sync runs recorded in {args.path}.")
+        return
+    flags = flag_slow_runs(runs, window=args.window, factor=args.factor)
+
+    header = f"{'started (UTC)':<26} {'result':<8} {'total':>8} " + " ".join(f"{p:>9}" for p in PHASES)
+    print(header + f" {'windows':>7} {'rows':>8} {'written':>7} {'retries':>7}  slow")
+    for run, slow in list(zip(runs, flags))[-args.last:]:
+        phases = run.get("phases", {})
+        counts = run.get("counts", {})
+        print(f"{run.get('started_at', ''):<26} {run.get('result', ''):<8} {run.get('total', 0):>8.2f} "
+              + " ".join(f"{phases[p]:>9.2f}" if p in phases else f"{'-':>9}" for p in PHASES)
+              + f" {len(run.get('windows', [])):>7} {counts.get('transactions', 0):>8} {counts.get('written', 0):>7}"
+              f" {sum(run.get('retries', {}).values()):>7}  {', '.join(slow)}")
+
+    ok = [run["total"] for run in runs[-args.window:] if run.get("result") != "error" and run.get("total")]
+    if ok:
+        print(f"\nRolling median of the last {len(ok)} successful runs: {statistics.median(ok):.2f}s; "
+              f"{sum(1 for slow in flags[-args.last:] if slow)} of the shown runs flagged (> {args.factor:g}x median).")
+
+
+if __name__ == "__main__":
+    main()
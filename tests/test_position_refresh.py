@@ -0,0 +1,59 @@
+# tests/test_position_refresh.py
+import unittest
+from unittest import mock
+
+from src.monitor import ws_manager
+from src.monitor.ws_manager import BybitMonitor
+
+
+class FakeAdapter:
+    """get_positions by settle coin, like /v5/position/list."""
+
+    def __init__(self, positions_by_coin, failing=()):
+        self.positions_by_coin = positions_by_coin
+        self.failing = set(failing)
+        self.calls = []
+
+    def get_positions(self, category, settleCoin="USDT"):
+        self.calls.append((category, settleCoin))
+        if settleCoin in self.failing:
+            raise RuntimeError(f"{settleCoin} unavailable")
+        return self.positions_by_coin.get(settleCoin, [])
+
+
+def position(symbol, size):
+    return {"symbol": symbol, "side": "Buy", "size": str(size), "avgPrice": "100", "category": "linear"}
+
+
+class StaleRefreshTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(ws_manager, "settings", {"monitor_settle_coins": "linear:USDT,linear:USDC,inverse:BTC"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monitor = BybitMonitor(offline=True)
+        self.monitor.position_book.apply_snapshot([position("BTCUSDT", 1), position("ETHPERP", 2)], category="linear")
+
+    def test_refresh_keeps_usdc_positions(self):
+        self.monitor.bybit_adapter = FakeAdapter({
+            "USDT": [position("BTCUSDT", 3)],
+            "USDC": [position("ETHPERP", 2)],
+        })
+        self.monitor._refresh_linear_positions()
+
+        book = self.monitor.positions
+        self.assertEqual(sorted(book), ["BTCUSDT", "ETHPERP"])
+        self.assertEqual(str(book["BTCUSDT"].size), "3")
+        self.assertEqual(self.monitor.bybit_adapter.calls, [("linear", "USDT"), ("linear", "USDC")])
+
+    def test_failed_refresh_leaves_book_untouched(self):
+        self.monitor.bybit_adapter = FakeAdapter({"USDT": [position("BTCUSDT", 3)]}, failing=("USDC",))
+        with self.assertRaises(RuntimeError):
+            self.monitor._refresh_linear_positions()
+
+        book = self.monitor.positions
+        self.assertEqual(sorted(book), ["BTCUSDT", "ETHPERP"])
+        self.assertEqual(str(book["BTCUSDT"].size), "1")
+
+
+if __name__ == "__main__":
+    unittest.main()